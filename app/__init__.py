@@ -5,8 +5,13 @@ from flask import Flask
 from pathlib import Path
 from config import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS, SECRET_KEY, DEBUG
 
-def create_app():
-    """创建并配置 Flask 应用"""
+def create_app(start_scheduler=True):
+    """
+    创建并配置 Flask 应用
+
+    Args:
+        start_scheduler: 是否启动关键字监控调度线程（命令行工具中使用时传False）
+    """
     # 获取项目根目录
     base_dir = Path(__file__).parent.parent
     
@@ -24,6 +29,21 @@ def create_app():
     from app.routes import bp
     app.register_blueprint(bp)
     
+    # 模板中按权限显示菜单：{% if has_permission('view_report') %}
+    from app.auth import has_permission
+    app.jinja_env.globals['has_permission'] = has_permission
+    
+    # 系统配置从内存快照注入模板，渲染页面时不查询数据库
+    from app.system_config import get_system_config, DEFAULT_APP_NAME
+    
+    @app.context_processor
+    def inject_system_config():
+        config = get_system_config().snapshot()
+        return {
+            'app_name': config.get('app_name', DEFAULT_APP_NAME),
+            'logo_url': config.get('logo_url', ''),
+        }
+    
     # 初始化数据库
     from app.models import db
     db.init_app(app)
@@ -33,6 +53,17 @@ def create_app():
         db.create_all()
         from app.auth import init_default_data
         init_default_data()
+        from app.news_store import ensure_news_columns
+        ensure_news_columns()
+        from app.search_index import init_search_index
+        init_search_index()
+    
+    # 启动关键字监控调度线程（调试模式下只在重载器的子进程中启动）
+    import os
+    from config import MONITOR_ENABLED
+    if start_scheduler and MONITOR_ENABLED and (not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+        from app.monitor import get_monitor_scheduler
+        get_monitor_scheduler().start(app)
     
     return app
 
@@ -0,0 +1,174 @@
+"""
+原始页面存档 - 按内容哈希压缩存储抓取到的搜索结果页，用于重放和重新解析
+
+百度改版导致解析失败时，只要原始页面还在，修复解析逻辑后即可用 reparse_archive.py
+从存档重新解析补回数据，不需要重新抓取。
+
+存储结构：
+    archive/
+        index.db                 索引（关键字、页码、抓取时间 -> 内容哈希）
+        ab/abcdef....html.zst    页面内容（安装 zstandard 时使用 zstd，否则 gzip）
+"""
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstandard 不可用时使用 gzip 压缩
+    zstandard = None
+
+from config import CRAWLER_ARCHIVE_DIR
+
+# 压缩格式对应的文件扩展名
+_ZSTD_SUFFIX = '.html.zst'
+_GZIP_SUFFIX = '.html.gz'
+
+
+def compress(data: bytes) -> bytes:
+    """压缩页面内容（优先使用zstd）"""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+class PageArchive:
+    """
+    内容寻址的页面存档
+
+    页面内容按 SHA-256 去重存储，相同内容只保存一份；每次抓取在索引中记录一行。
+    """
+
+    def __init__(self, root: Optional[str] = CRAWLER_ARCHIVE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / 'index.db'), check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, digest TEXT NOT NULL, keyword TEXT NOT NULL, '
+            'pn INTEGER NOT NULL, rn INTEGER NOT NULL, url TEXT, fetched_at TEXT NOT NULL, '
+            'size INTEGER NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS ix_pages_keyword ON pages (keyword, fetched_at)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS ix_pages_fetched_at ON pages (fetched_at)')
+        self._db.commit()
+
+    def blob_path(self, digest: str, suffix: str = None) -> Path:
+        """内容哈希对应的文件路径（按哈希前两位分目录）"""
+        suffix = suffix or (_ZSTD_SUFFIX if zstandard is not None else _GZIP_SUFFIX)
+        return self.root / digest[:2] / f'{digest}{suffix}'
+
+    def store(self, html: str, keyword: str, pn: int, rn: int, url: Optional[str] = None) -> str:
+        """
+        存档一页HTML
+
+        Returns:
+            页面内容哈希
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+
+        if self.find_blob(digest) is None:
+            path = self.blob_path(digest)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再重命名，并发写入同一内容时不会读到半个文件
+            fd, tmp_path = tempfile.mkstemp(dir=str(path.parent))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(compress(data))
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        with self._db_lock:
+            self._db.execute(
+                'INSERT INTO pages (digest, keyword, pn, rn, url, fetched_at, size) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (digest, keyword, pn, rn, url, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), len(data))
+            )
+            self._db.commit()
+        return digest
+
+    def find_blob(self, digest: str) -> Optional[Path]:
+        """查找内容哈希对应的文件（兼容两种压缩格式），不存在时返回None"""
+        for suffix in (_ZSTD_SUFFIX, _GZIP_SUFFIX):
+            path = self.blob_path(digest, suffix)
+            if path.exists():
+                return path
+        return None
+
+    def load(self, digest: str) -> Optional[str]:
+        """读取存档的页面HTML，不存在时返回None"""
+        path = self.find_blob(digest)
+        if path is None:
+            return None
+        return read_blob(path)
+
+    def query(self, keyword: Optional[str] = None, since: Optional[str] = None,
+              until: Optional[str] = None) -> List[Dict]:
+        """
+        按关键字和抓取时间查询存档索引（按抓取时间升序）
+
+        Args:
+            keyword: 抓取关键字
+            since: 抓取时间下限（'YYYY-MM-DD' 或 'YYYY-MM-DD HH:MM:SS'）
+            until: 抓取时间上限（不含）
+        """
+        sql = 'SELECT id, digest, keyword, pn, rn, url, fetched_at, size FROM pages WHERE 1 = 1'
+        params = []
+        if keyword:
+            sql += ' AND keyword = ?'
+            params.append(keyword)
+        if since:
+            sql += ' AND fetched_at >= ?'
+            params.append(since)
+        if until:
+            sql += ' AND fetched_at < ?'
+            params.append(until)
+        sql += ' ORDER BY fetched_at, id'
+
+        with self._db_lock:
+            rows = self._db.execute(sql, params).fetchall()
+        columns = ('id', 'digest', 'keyword', 'pn', 'rn', 'url', 'fetched_at', 'size')
+        return [dict(zip(columns, row)) for row in rows]
+
+    def close(self):
+        with self._db_lock:
+            self._db.close()
+
+
+def read_blob(path: Path) -> str:
+    """读取并解压一个存档文件"""
+    data = Path(path).read_bytes()
+    if str(path).endswith(_ZSTD_SUFFIX):
+        if zstandard is None:
+            raise RuntimeError('读取zstd存档需要安装 zstandard')
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return data.decode('utf-8')
+
+
+# 进程内共享的页面存档
+_page_archive: Optional[PageArchive] = None
+_page_archive_lock = threading.Lock()
+
+
+def get_page_archive() -> Optional[PageArchive]:
+    """获取进程内共享的页面存档（首次调用时创建），未启用存档时返回None"""
+    global _page_archive
+    if CRAWLER_ARCHIVE_DIR is None:
+        return None
+    if _page_archive is None:
+        with _page_archive_lock:
+            if _page_archive is None:
+                _page_archive = PageArchive()
+    return _page_archive
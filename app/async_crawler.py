@@ -0,0 +1,307 @@
+"""
+异步数据抓取模块 - 基于 asyncio + aiohttp 的百度新闻搜索
+"""
+import asyncio
+import time
+import urllib.parse
+from typing import List, Dict, Optional, Iterable
+
+import aiohttp
+
+from app.crawler import BaiduNewsCrawler, decide_encoding
+from app.dedup import NewsDeduplicator
+from app.ratelimit import get_host_limiter, get_circuit_breaker, parse_retry_after
+from app.endpoints import get_endpoint_stats
+from config import CRAWLER_PAGE_SIZE, CRAWLER_ASYNC_CONCURRENCY, CRAWLER_PER_HOST_CONCURRENCY
+
+
+class AsyncBaiduNewsCrawler:
+    """
+    异步百度新闻搜索爬虫
+
+    返回结构与 BaiduNewsCrawler.search 相同。请求头、请求参数和HTML解析
+    复用同步爬虫的实现，网络部分改为 aiohttp：一个 ClientSession 复用连接，
+    重试退避使用 asyncio.sleep，不阻塞事件循环。
+
+    用法：
+        async with AsyncBaiduNewsCrawler() as crawler:
+            results = await crawler.crawl_many(['西昌', '成都'])
+    """
+
+    # 需要重试的状态码（与同步爬虫的 Retry 配置一致，429/503 交给主机限流器处理）
+    RETRY_STATUSES = {500, 502, 504}
+
+    def __init__(self, concurrency: int = CRAWLER_ASYNC_CONCURRENCY,
+                 per_host_concurrency: int = CRAWLER_PER_HOST_CONCURRENCY,
+                 page_size: int = CRAWLER_PAGE_SIZE,
+                 retries: int = 3, backoff_factor: float = 1, timeout: float = 30,
+                 crawler: Optional[BaiduNewsCrawler] = None):
+        # 复用同步爬虫的URL、请求头、参数构建和解析逻辑（未传入时自行创建，关闭时一并关闭）
+        self._owns_crawler = crawler is None
+        self.crawler = crawler if crawler is not None else BaiduNewsCrawler(page_size=page_size)
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.page_size = page_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        # 主机并发上限：在发出请求前排队，排队时间不计入对冲等待
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取（首次调用时创建）共享的 ClientSession"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency,
+                limit_per_host=self.per_host_concurrency
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.crawler.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def close(self):
+        """关闭会话，释放连接；自行创建的同步爬虫（会话和对冲线程池）一并关闭"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._owns_crawler:
+            self.crawler.close()
+
+    async def _acquire(self, url: str):
+        """从主机限流器取得令牌（等待时不阻塞事件循环）"""
+        limiter = get_host_limiter(urllib.parse.urlparse(url).netloc)
+        while True:
+            wait = limiter.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """获取（首次调用时创建）主机的并发信号量"""
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_concurrency)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def _get(self, url: str, keyword: str, pn: int, rn: int,
+                   sent: Optional[asyncio.Event] = None) -> Optional[tuple]:
+        """
+        发送一次请求，遇到可重试状态码或网络错误时指数退避重试
+
+        Args:
+            sent: 取得令牌和并发名额、即将发出第一次请求时设置，对冲计时从这时开始
+
+        Returns:
+            (状态码, 最终URL, 解码后的HTML, 响应时间, Retry-After)，重试耗尽且始终无响应时返回None
+        """
+        session = self._get_session()
+        semaphore = self._host_semaphore(urllib.parse.urlparse(url).netloc)
+        result = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+            await self._acquire(url)
+            async with semaphore:
+                if sent is not None:
+                    sent.set()
+                started = time.monotonic()
+                try:
+                    async with session.get(
+                        url,
+                        params=self.crawler._build_params(url, keyword, pn, rn),
+                        headers=self.crawler._build_request_headers(url)
+                    ) as response:
+                        body = await response.read()
+                        # 解决中文乱码问题：使用响应头或 meta 标签声明的编码，未声明时按utf-8解码
+                        charset = decide_encoding(response.headers.get('Content-Type'), body) or 'utf-8'
+                        result = (response.status, str(response.url), body.decode(charset, errors='replace'),
+                                  time.monotonic() - started,
+                                  parse_retry_after(response.headers.get('Retry-After')))
+                        if response.status not in self.RETRY_STATUSES:
+                            return result
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    print(f"请求异常（第{attempt + 1}次）: {str(e)}，URL: {url}")
+        return result
+
+    async def fetch_page(self, keyword: str, pn: int = 0, rn: int = 10) -> Optional[str]:
+        """
+        抓取一页搜索结果的HTML
+
+        入口排序、对冲请求、限流和熔断状态与同步爬虫共享；对冲请求中较慢的一个会被取消。
+
+        Returns:
+            解码后的HTML文本，所有URL均失败时返回None
+        """
+        candidates = iter(self.crawler._rank_urls())
+        pending = set()
+        hedged = False
+        sent = asyncio.Event()
+
+        def launch(sent: Optional[asyncio.Event] = None) -> Optional[str]:
+            for url in candidates:
+                if get_circuit_breaker(url).allow():
+                    pending.add(asyncio.ensure_future(self._fetch_from(url, keyword, pn, rn, sent)))
+                    return url
+                print(f"URL已熔断，跳过: {url}")
+            return None
+
+        current_url = launch(sent)
+        try:
+            while pending:
+                timeout = None
+                if self.crawler.hedge and not hedged and current_url is not None:
+                    # 在本地限流器和主机并发信号量上的排队不计入等待时间，请求真正发出后才开始计时
+                    await sent.wait()
+                    timeout = get_endpoint_stats(current_url).hedge_delay()
+
+                done, pending = await asyncio.wait(pending, timeout=timeout,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    if launch() is not None:
+                        print(f"请求超过 {timeout:.1f} 秒未返回，发送对冲请求")
+                    continue
+
+                for task in done:
+                    html = task.result()
+                    if html is not None:
+                        return html
+
+                if not pending:
+                    hedged = True
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return None
+
+    async def _fetch_from(self, url: str, keyword: str, pn: int, rn: int,
+                          sent: Optional[asyncio.Event] = None) -> Optional[str]:
+        """向指定入口请求一页，记录统计，失败时返回None"""
+        try:
+            result = await self._get(url, keyword, pn, rn, sent)
+        except asyncio.CancelledError:
+            # 对冲请求中较慢的一个被取消
+            get_circuit_breaker(url).release()
+            raise
+        finally:
+            # 请求未能发出时也要唤醒等待对冲计时的协程
+            if sent is not None:
+                sent.set()
+        if result is None:
+            get_circuit_breaker(url).record_failure()
+            get_endpoint_stats(url).record(False)
+            return None
+
+        status, final_url, html, latency, retry_after = result
+        if self.crawler.record_response(url, status, final_url, html, latency, retry_after):
+            await asyncio.to_thread(self.crawler.archive_page, html, keyword, pn, rn, url)
+            return html
+        return None
+
+    async def _fetch_and_parse_page(self, keyword: str, page: int) -> Optional[List[Dict]]:
+        """抓取并解析第page页（从0开始），失败时返回None"""
+        try:
+            html = await self.fetch_page(keyword, page * self.page_size, self.page_size)
+            if html is None:
+                return None
+            # 解析是CPU密集操作，放到线程中执行，避免阻塞事件循环
+            return await asyncio.to_thread(self.crawler.parse_page, html)
+        except Exception as e:
+            print(f"抓取第{page + 1}页错误: {str(e)}")
+            return None
+
+    async def search(self, keyword: str, max_results: int = 10, multi_page: bool = False,
+                     dedup: Optional[NewsDeduplicator] = None) -> List[Dict]:
+        """
+        搜索新闻
+
+        Args:
+            keyword: 搜索关键字
+            max_results: 最大返回结果数
+            multi_page: 是否多页并发抓取
+            dedup: 去重器，传入同一个实例可跨关键字、跨多次抓取去重
+
+        Returns:
+            新闻列表，每个新闻包含：title, summary, cover, url, source, publish_time
+        """
+        try:
+            if dedup is None:
+                dedup = NewsDeduplicator()
+
+            if not multi_page:
+                html = await self.fetch_page(keyword, 0, max_results)
+                if html is None:
+                    return []
+                news_list = []
+                page_items = await asyncio.to_thread(self.crawler.parse_page, html, max_results)
+                self.crawler._merge_page(news_list, page_items, max_results, dedup)
+                return news_list
+
+            pages = max(1, -(-max_results // self.page_size))
+            tasks = [asyncio.ensure_future(self._fetch_and_parse_page(keyword, page))
+                     for page in range(pages)]
+            try:
+                news_list = []
+                for task in tasks:
+                    if self.crawler._merge_page(news_list, await task, max_results, dedup):
+                        break
+                return news_list
+            finally:
+                # 已满足结果数时取消剩余页面
+                for task in tasks:
+                    task.cancel()
+
+        except Exception as e:
+            print(f"抓取错误: {str(e)}")
+            return []
+
+    async def crawl_many(self, keywords: Iterable[str], max_results: int = 10,
+                         multi_page: bool = False,
+                         dedup: Optional[NewsDeduplicator] = None) -> Dict[str, List[Dict]]:
+        """
+        并发抓取多个关键字
+
+        同时进行的关键字搜索数不超过concurrency，单个关键字失败不影响其他关键字。
+        传入dedup时同一条新闻只保留在最先完成的关键字结果中
+
+        Returns:
+            {关键字: 新闻列表}
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        keywords = list(dict.fromkeys(keywords))
+
+        async def run(keyword):
+            async with semaphore:
+                return await self.search(keyword, max_results, multi_page=multi_page, dedup=dedup)
+
+        results = await asyncio.gather(*(run(keyword) for keyword in keywords))
+        return dict(zip(keywords, results))
+
+
+async def crawl_many(keywords: Iterable[str], max_results: int = 10, multi_page: bool = False) -> Dict[str, List[Dict]]:
+    """
+    批量抓取新闻的便捷函数
+
+    Args:
+        keywords: 搜索关键字列表
+        max_results: 每个关键字的最大返回结果数
+        multi_page: 是否多页并发抓取
+
+    Returns:
+        {关键字: 新闻列表}
+    """
+    async with AsyncBaiduNewsCrawler() as crawler:
+        return await crawler.crawl_many(keywords, max_results, multi_page=multi_page)
@@ -1,9 +1,135 @@
 """
 认证相关工具函数
+
+当前用户在每个请求内只查询一次（同时加载角色），结果保存在 flask.g 上；
+权限判断使用的用户信息（角色代码、权限列表等）另有跨请求的TTL缓存，修改用户或角色时显式失效。
 """
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from flask import session, redirect, url_for, jsonify, request
-from app.models import User, Role, SystemConfig, db
+from typing import Dict, Optional, Tuple
+from flask import session, redirect, url_for, jsonify, request, g, abort
+from sqlalchemy.orm import joinedload
+from app.models import User, Role, SystemConfig, ConfigVersion, db
+from app.permissions import (get_role_permissions, invalidate_role_permissions, ADMIN_PERMISSION,
+                             VIEW_DASHBOARD_PERMISSION)
+from config import AUTH_CACHE_TTL, AUTH_CACHE_MAX_ENTRIES
+
+
+class AuthCache:
+    """
+    用户信息缓存（线程安全）
+
+    按用户ID缓存权限判断需要的字段（不缓存ORM对象，避免跨会话使用），
+    超过 max_entries 时淘汰最久未使用的条目，过期条目读取时惰性删除。
+    """
+
+    def __init__(self, ttl: float = AUTH_CACHE_TTL, max_entries: int = AUTH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # 用户ID -> (过期时间, 用户信息)
+        self._entries: 'OrderedDict[int, Tuple[float, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, info = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return info
+
+    def set(self, user_id: int, info: Dict):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, info)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def invalidate_role(self, role_id: int):
+        """删除该角色下所有用户的缓存"""
+        with self._lock:
+            for user_id in [user_id for user_id, (_, info) in self._entries.items()
+                            if info['role_id'] == role_id]:
+                del self._entries[user_id]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 进程内共享的用户信息缓存
+_auth_cache = AuthCache()
+
+
+def invalidate_user(user_id: int):
+    """用户被修改或删除后调用，使缓存的用户信息失效"""
+    _auth_cache.invalidate_user(user_id)
+
+
+def invalidate_role(role_id: int):
+    """角色被修改或删除后调用，使该角色下所有用户的缓存和角色编译后的权限失效"""
+    _auth_cache.invalidate_role(role_id)
+    invalidate_role_permissions(role_id)
+
+
+def _user_info(user: User) -> Dict:
+    """权限判断需要的用户字段"""
+    role = user.role
+    return {
+        'id': user.id,
+        'username': user.username,
+        'is_active': user.is_active,
+        'role_id': user.role_id,
+        'role_code': role.code if role else None,
+        'role_name': role.name if role else None,
+        'role_active': bool(role.is_active) if role else False,
+        'role_version': role.updated_at.isoformat() if role and role.updated_at else None,
+        'permissions': role.permissions if role else None,
+    }
+
+
+def get_current_user_info() -> Optional[Dict]:
+    """
+    获取当前登录用户的信息（id、username、is_active、角色ID/代码/名称/版本、权限列表原文）
+
+    优先使用跨请求缓存，未命中时查询数据库；未登录或用户不存在时返回None
+    """
+    if 'user_id' not in session:
+        return None
+    if '_current_user_info' not in g:
+        user_id = session['user_id']
+        info = _auth_cache.get(user_id)
+        if info is None:
+            user = get_current_user()
+            if user is not None:
+                info = _user_info(user)
+                _auth_cache.set(user_id, info)
+        g._current_user_info = info
+    return g._current_user_info
+
+
+def is_admin() -> bool:
+    """当前登录用户是否为管理员（角色拥有 admin 权限）"""
+    return has_permission(ADMIN_PERMISSION)
+
+
+def has_permission(permission: str) -> bool:
+    """当前登录用户的角色是否拥有指定权限（角色已停用时没有任何权限）"""
+    info = get_current_user_info()
+    if info is None or not info['role_active']:
+        return False
+    return get_role_permissions(info['role_id'], info['role_version'], info['permissions']).allows(permission)
+
 
 def login_required(f):
     """登录验证装饰器"""
@@ -17,28 +143,45 @@ def login_required(f):
     return decorated_function
 
 def admin_required(f):
-    """管理员权限验证装饰器"""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            if request.is_json or request.path.startswith('/api/'):
-                return jsonify({'success': False, 'message': '请先登录'}), 401
-            return redirect(url_for('main.login'))
-        
-        user = User.query.get(session['user_id'])
-        if not user or not user.role or user.role.code != 'admin':
-            if request.is_json or request.path.startswith('/api/'):
-                return jsonify({'success': False, 'message': '权限不足'}), 403
-            return redirect(url_for('main.dashboard'))
-        
-        return f(*args, **kwargs)
-    return decorated_function
+    """管理员权限验证装饰器（角色需要拥有 admin 权限，"*" 包含该权限）"""
+    return permission_required(ADMIN_PERMISSION)(f)
+
+def permission_required(permission: str):
+    """
+    权限验证装饰器
+
+    用法：
+        @bp.route('/api/reports')
+        @permission_required('view_report')
+        def api_get_reports(): ...
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if 'user_id' not in session:
+                if request.is_json or request.path.startswith('/api/'):
+                    return jsonify({'success': False, 'message': '请先登录'}), 401
+                return redirect(url_for('main.login'))
+
+            if not has_permission(permission):
+                if request.is_json or request.path.startswith('/api/'):
+                    return jsonify({'success': False, 'message': '权限不足'}), 403
+                # 没有控制台权限时不能再跳转回控制台
+                if has_permission(VIEW_DASHBOARD_PERMISSION):
+                    return redirect(url_for('main.dashboard'))
+                abort(403)
+
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
 
 def get_current_user():
-    """获取当前登录用户"""
+    """获取当前登录用户（同时加载角色，每个请求只查询一次）"""
     if 'user_id' not in session:
         return None
-    return User.query.get(session['user_id'])
+    if '_current_user' not in g:
+        g._current_user = db.session.get(User, session['user_id'], options=[joinedload(User.role)])
+    return g._current_user
 
 def init_default_data():
     """初始化默认数据"""
@@ -87,5 +230,9 @@ def init_default_data():
         )
         db.session.add(app_name)
     
+    # 系统配置版本号
+    if db.session.get(ConfigVersion, 1) is None:
+        db.session.add(ConfigVersion(id=1, version=0))
+    
     db.session.commit()
 
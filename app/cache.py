@@ -0,0 +1,200 @@
+"""
+抓取结果缓存 - 按关键字缓存百度新闻搜索结果
+"""
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple, Callable
+
+from config import CRAWLER_CACHE_TTL, CRAWLER_CACHE_MAX_ENTRIES, CRAWLER_CACHE_DB_PATH
+
+
+def normalize_keyword(keyword: str) -> str:
+    """规范化关键字：全角转半角、去除首尾空白、合并连续空白、转小写"""
+    keyword = unicodedata.normalize('NFKC', keyword or '')
+    return ' '.join(keyword.split()).lower()
+
+
+class _InFlight:
+    """正在进行中的一次抓取，同一个key的其他请求等待其结果"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        # 抓取结果是否已写入缓存（空结果不缓存）
+        self.cached = False
+
+
+class ResultCache:
+    """
+    抓取结果缓存
+
+    - 内存层：OrderedDict 实现的 LRU，超过 max_entries 时淘汰最久未使用的条目
+    - 过期：每个条目写入时记录过期时间，读取时惰性删除
+    - 防击穿：同一个key同时只有一个请求真正抓取，其余请求等待其结果
+    - SQLite层（可选）：db_path 不为空时写入磁盘，重启后仍可命中
+    """
+
+    def __init__(self, ttl: float = CRAWLER_CACHE_TTL, max_entries: int = CRAWLER_CACHE_MAX_ENTRIES,
+                 db_path: Optional[str] = CRAWLER_CACHE_DB_PATH):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[float, List[Dict]]]' = OrderedDict()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+
+        self._db = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS crawl_cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(keyword: str, max_results: int) -> str:
+        """根据规范化后的 (keyword, max_results) 生成缓存key"""
+        return f'{normalize_keyword(keyword)}\x00{int(max_results)}'
+
+    def get(self, keyword: str, max_results: int) -> Optional[List[Dict]]:
+        """读取缓存，未命中或已过期时返回None"""
+        return self._get(self.make_key(keyword, max_results))
+
+    def set(self, keyword: str, max_results: int, news_list: List[Dict]):
+        """写入缓存"""
+        self._set(self.make_key(keyword, max_results), news_list)
+
+    def get_or_fetch(self, keyword: str, max_results: int,
+                     fetch: Callable[[], List[Dict]]) -> Tuple[List[Dict], bool]:
+        """
+        读取缓存，未命中时调用fetch抓取并写入缓存
+
+        Args:
+            keyword: 搜索关键字
+            max_results: 最大返回结果数
+            fetch: 实际抓取函数
+
+        Returns:
+            (新闻列表, 是否命中缓存)
+        """
+        key = self.make_key(keyword, max_results)
+        news_list = self._get(key)
+        if news_list is not None:
+            return news_list, True
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            leader = inflight is None
+            if leader:
+                inflight = _InFlight()
+                self._inflight[key] = inflight
+
+        if not leader:
+            # 已有请求在抓取同一个key，等待其结果；结果未写入缓存（抓取失败或为空）时不算命中缓存
+            inflight.event.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.result, inflight.cached
+
+        try:
+            news_list = fetch()
+            inflight.result = news_list
+            # 抓取失败时爬虫返回空列表，不缓存空结果
+            if news_list:
+                self._set(key, news_list)
+                inflight.cached = True
+            return news_list, False
+        except Exception as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.event.set()
+
+    def invalidate(self, keyword: str, max_results: int):
+        """删除指定关键字的缓存"""
+        key = self.make_key(keyword, max_results)
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute('DELETE FROM crawl_cache WHERE key = ?', (key,))
+                self._db.commit()
+
+    def clear(self):
+        """清空全部缓存"""
+        with self._lock:
+            self._entries.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute('DELETE FROM crawl_cache')
+                self._db.commit()
+
+    def _get(self, key: str) -> Optional[List[Dict]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        if self._db is None:
+            return None
+
+        with self._db_lock:
+            row = self._db.execute(
+                'SELECT value, expires_at FROM crawl_cache WHERE key = ? AND expires_at > ?',
+                (key, now)
+            ).fetchone()
+        if row is None:
+            return None
+
+        # 磁盘命中后回填内存层
+        news_list = json.loads(row[0])
+        self._put_memory(key, row[1], news_list)
+        return news_list
+
+    def _set(self, key: str, news_list: List[Dict]):
+        expires_at = time.time() + self.ttl
+        self._put_memory(key, expires_at, news_list)
+
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO crawl_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(news_list, ensure_ascii=False), expires_at)
+                )
+                # 顺带清理已过期的条目
+                self._db.execute('DELETE FROM crawl_cache WHERE expires_at <= ?', (time.time(),))
+                self._db.commit()
+
+    def _put_memory(self, key: str, expires_at: float, news_list: List[Dict]):
+        with self._lock:
+            self._entries[key] = (expires_at, news_list)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# 进程内共享的结果缓存
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """获取进程内共享的结果缓存（首次调用时创建）"""
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache()
+    return _result_cache
@@ -0,0 +1,214 @@
+"""
+相似新闻聚类 - 基于 MinHash 签名 + 分段 LSH 索引的近重复检测
+
+同一篇通稿被多家媒体转载时标题、摘要略有差异，精确去重无法识别。
+这里把标题和摘要切成字符 n-gram，计算 MinHash 签名，并按段（band）
+建立哈希桶：新闻入库时只与落在同一个桶里的候选比较，而不是与全部
+已入库新闻逐一比较。
+
+索引只保留最近 CLUSTER_MAX_ITEMS 条新闻，超过时淘汰最早加入的新闻。
+事件簇ID是进程内的序号，只在同一进程运行期间有效（重启后重新编号），不入库。
+"""
+import random
+import threading
+import zlib
+from collections import OrderedDict, deque
+from typing import List, Dict, Optional, Set, Deque, NamedTuple
+
+from app.dedup import canonicalize_url, normalize_title
+from config import (CLUSTER_NUM_PERM, CLUSTER_BANDS, CLUSTER_THRESHOLD, CLUSTER_SHINGLE_SIZE,
+                    CLUSTER_MAX_ITEMS)
+
+# MinHash 使用的梅森素数 2^61 - 1
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def shingles(text: str, size: int = CLUSTER_SHINGLE_SIZE) -> Set[str]:
+    """把规范化后的文本切成字符 n-gram 集合（中文按字切分效果较好）"""
+    text = normalize_title(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class _Entry(NamedTuple):
+    """索引中的一条新闻"""
+    news: Dict
+    signature: tuple
+    cluster_id: int
+    url_key: str
+
+
+class NearDuplicateIndex:
+    """
+    相似新闻索引
+
+    每条新闻按 标题+摘要 计算 MinHash 签名，签名分为 bands 段，每段哈希到一个桶。
+    任一段相同的新闻成为候选，再用签名估算的 Jaccard 相似度确认，
+    相似度达到 threshold 时归入候选所在的事件簇，否则新建事件簇。
+
+    新闻按加入顺序编号，超过 max_items 条时淘汰最早的一条：它一定排在所在的桶和事件簇的最前面，
+    淘汰只需从这些队列头部移除。事件簇内的新闻全部被淘汰后事件簇随之删除。
+    """
+
+    def __init__(self, num_perm: int = CLUSTER_NUM_PERM, bands: int = CLUSTER_BANDS,
+                 threshold: float = CLUSTER_THRESHOLD, shingle_size: int = CLUSTER_SHINGLE_SIZE,
+                 max_items: int = CLUSTER_MAX_ITEMS):
+        if num_perm % bands:
+            raise ValueError('num_perm 必须能被 bands 整除')
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_items = max_items
+
+        # 固定随机种子，保证不同进程计算出的签名一致
+        rng = random.Random(20240101)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+
+        self._lock = threading.Lock()
+        # 下一条新闻的序号
+        self._next_index = 0
+        # 新闻序号 -> 新闻（按加入顺序）
+        self._entries: 'OrderedDict[int, _Entry]' = OrderedDict()
+        # 每段一个哈希桶：段内容 -> 新闻序号队列
+        self._buckets: List[Dict[tuple, Deque[int]]] = [{} for _ in range(bands)]
+        # 事件簇ID -> 新闻序号队列
+        self._clusters: Dict[int, Deque[int]] = {}
+        # 规范化URL -> 新闻序号，同一条新闻重复加入时直接返回原事件簇
+        self._by_url: Dict[str, int] = {}
+
+    def signature(self, news: Dict) -> Optional[tuple]:
+        """计算新闻的 MinHash 签名，文本为空时返回None"""
+        grams = shingles(f"{news.get('title', '')}{news.get('summary', '')}", self.shingle_size)
+        if not grams:
+            return None
+        hashes = [zlib.crc32(gram.encode('utf-8')) for gram in grams]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(sig_a: tuple, sig_b: tuple) -> float:
+        """用签名相同位置的比例估算 Jaccard 相似度"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    def add(self, news: Dict) -> int:
+        """
+        加入一条新闻
+
+        Returns:
+            新闻所属的事件簇ID
+        """
+        url_key = canonicalize_url(news.get('url', ''))
+        sig = self.signature(news)
+
+        with self._lock:
+            if url_key and url_key in self._by_url:
+                return self._entries[self._by_url[url_key]].cluster_id
+
+            index = self._next_index
+            self._next_index += 1
+            cluster_id = None
+
+            if sig is not None:
+                # 找出与新闻至少有一段相同的候选，取相似度最高且达到阈值的
+                candidates = set()
+                for band, start in enumerate(range(0, self.num_perm, self.rows)):
+                    candidates.update(self._buckets[band].get(sig[start:start + self.rows], ()))
+
+                best = self.threshold
+                for candidate in candidates:
+                    entry = self._entries[candidate]
+                    score = self.similarity(sig, entry.signature)
+                    if score >= best:
+                        best = score
+                        cluster_id = entry.cluster_id
+
+                for band, start in enumerate(range(0, self.num_perm, self.rows)):
+                    self._buckets[band].setdefault(sig[start:start + self.rows], deque()).append(index)
+
+            if cluster_id is None:
+                # 事件簇ID取簇内第一条新闻的序号
+                cluster_id = index
+                self._clusters[cluster_id] = deque()
+
+            self._entries[index] = _Entry(news, sig or (), cluster_id, url_key)
+            self._clusters[cluster_id].append(index)
+            if url_key:
+                self._by_url[url_key] = index
+
+            while len(self._entries) > self.max_items:
+                self._evict_oldest()
+
+            return cluster_id
+
+    def _evict_oldest(self):
+        """淘汰最早加入的一条新闻（调用方持有锁）"""
+        index, entry = self._entries.popitem(last=False)
+        if entry.signature:
+            for band, start in enumerate(range(0, self.num_perm, self.rows)):
+                key = entry.signature[start:start + self.rows]
+                bucket = self._buckets[band][key]
+                bucket.popleft()
+                if not bucket:
+                    del self._buckets[band][key]
+
+        members = self._clusters[entry.cluster_id]
+        members.popleft()
+        if not members:
+            del self._clusters[entry.cluster_id]
+
+        if entry.url_key and self._by_url.get(entry.url_key) == index:
+            del self._by_url[entry.url_key]
+
+    def add_many(self, news_list: List[Dict]) -> List[int]:
+        """批量加入新闻，返回每条新闻的事件簇ID"""
+        return [self.add(news) for news in news_list]
+
+    def cluster(self, cluster_id: int) -> List[Dict]:
+        """获取事件簇内的全部新闻（按加入顺序）"""
+        with self._lock:
+            return [self._entries[index].news for index in self._clusters.get(cluster_id, ())]
+
+    def clusters(self, min_size: int = 1) -> List[Dict]:
+        """
+        获取全部事件簇（按簇大小降序）
+
+        Returns:
+            事件簇列表，每个包含：cluster_id, size, representative（首条新闻）, items
+        """
+        with self._lock:
+            result = [
+                {
+                    'cluster_id': cluster_id,
+                    'size': len(members),
+                    'representative': self._entries[members[0]].news,
+                    'items': [self._entries[index].news for index in members],
+                }
+                for cluster_id, members in self._clusters.items()
+                if len(members) >= min_size
+            ]
+        result.sort(key=lambda c: c['size'], reverse=True)
+        return result
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# 进程内共享的相似新闻索引
+_story_index: Optional[NearDuplicateIndex] = None
+_story_index_lock = threading.Lock()
+
+
+def get_story_index() -> NearDuplicateIndex:
+    """获取进程内共享的相似新闻索引（首次调用时创建）"""
+    global _story_index
+    if _story_index is None:
+        with _story_index_lock:
+            if _story_index is None:
+                _story_index = NearDuplicateIndex()
+    return _story_index
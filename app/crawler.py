@@ -5,15 +5,175 @@ import requests
 from bs4 import BeautifulSoup
 import urllib.parse
 import re
-from typing import List, Dict, Optional
+import codecs
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Optional, Iterator, Tuple, Callable
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import atexit
+from datetime import datetime
+from urllib3.util.request import ACCEPT_ENCODING
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml 不可用时只使用 BeautifulSoup 解析
+    etree = None
+    lxml_html = None
+from app.dedup import NewsDeduplicator
+from app.ratelimit import get_host_limiter, get_circuit_breaker, parse_retry_after
+from app.endpoints import get_endpoint_stats, rank_endpoints
+from app.archive import get_page_archive
+from app.extract import extract_fields
+from config import (CRAWLER_PAGE_SIZE, CRAWLER_MAX_WORKERS, CRAWLER_PER_HOST_CONCURRENCY,
+                    CRAWLER_POOL_CONNECTIONS, CRAWLER_POOL_MAXSIZE, CRAWLER_UA_ROTATE_INTERVAL,
+                    CRAWLER_PARSER, CRAWLER_HEDGE_ENABLED, CRAWLER_PAGE_CACHE_MAX_ENTRIES)
+
+
+# 每个主机的并发信号量，所有爬虫实例共享，避免对同一主机并发过高
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def _get_host_semaphore(host: str, limit: int) -> threading.BoundedSemaphore:
+    """获取主机对应的并发信号量（首次访问时按limit创建）"""
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(limit)
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+
+def reset_host_semaphores():
+    """清空主机并发信号量，之后按新的并发上限重新创建（压测时每轮重新开始）"""
+    with _host_semaphores_lock:
+        _host_semaphores.clear()
+
+
+# 百度反爬验证页面的特征（跳转到 wappass 验证码页面或页面标题为"百度安全验证"）
+_CAPTCHA_MARKERS = ('wappass.baidu.com', '百度安全验证', '/static/captcha/')
+
+
+# 响应头和页面 meta 标签中的编码声明
+_CHARSET_RE = re.compile(r'charset=["\']?([\w-]+)', re.I)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+# 只在页面开头查找 meta 标签
+_META_SCAN_BYTES = 4096
+
+
+def decide_encoding(content_type: Optional[str], body: bytes) -> Optional[str]:
+    """
+    根据响应头或页面开头的 meta 标签确定编码
+
+    响应头中的 ISO-8859-1 通常是未声明编码时的默认值，不予采用。
+
+    Returns:
+        编码名称，都没有声明时返回None（由调用方做编码检测）
+    """
+    candidates = []
+    match = _CHARSET_RE.search(content_type or '')
+    if match and match.group(1).lower() not in ('iso-8859-1', 'latin-1'):
+        candidates.append(match.group(1))
+    match = _META_CHARSET_RE.search(body[:_META_SCAN_BYTES])
+    if match:
+        candidates.append(match.group(1).decode('ascii'))
+
+    for charset in candidates:
+        try:
+            return codecs.lookup(charset).name
+        except LookupError:
+            continue
+    return None
+
+
+def is_captcha_page(url: str, html: str) -> bool:
+    """判断响应是否为百度反爬验证页面"""
+    if any(marker in url for marker in _CAPTCHA_MARKERS):
+        return True
+    # 验证页面很短，只检查开头部分
+    head = html[:2048]
+    return any(marker in head for marker in _CAPTCHA_MARKERS)
+
+
+if etree is not None:
+    # 预编译的XPath（lxml解析引擎使用），类名匹配规则与BeautifulSoup解析保持一致
+    _XP_NS = {'re': 'http://exslt.org/regular-expressions'}
+    _XP_TITLE_H3 = etree.XPath('//h3[.//a[@href]]')
+    _XP_FIRST_LINK = etree.XPath('(.//a[@href])[1]')
+    _XP_RESULT_BLOCK = etree.XPath(
+        'ancestor::*[self::div or self::li][re:test(@class, "news|content|item|list|article|result")][1]',
+        namespaces=_XP_NS)
+    _XP_PARENT_BLOCK = etree.XPath('ancestor::*[self::div or self::li][1]')
+    _XP_PARENT_DIV = etree.XPath('ancestor::div[1]')
+    _XP_SUMMARY_SPAN = etree.XPath(
+        '(.//span[re:test(@class, "content|abstract|summary|desc|c-abstract|c-span9|c-color-text")])[1]',
+        namespaces=_XP_NS)
+    _XP_SUMMARY_DIV = etree.XPath(
+        '(.//div[re:test(@class, "content|abstract|summary|desc|c-abstract")])[1]', namespaces=_XP_NS)
+    # 来源/时间元素（按文档顺序）
+    _XP_META = etree.XPath(
+        './/*[self::span or self::div or self::a]'
+        '[re:test(@class, "source|author|site|from|c-author|c-color-gray|time|date")]', namespaces=_XP_NS)
+    _XP_FIRST_IMG = etree.XPath('(.//img)[1]')
+    # 文本节点（不含注释、script、style，与BeautifulSoup的get_text一致）
+    _XP_TEXT = etree.XPath('.//text()[not(ancestor::script) and not(ancestor::style)]')
+
+
+def _lxml_text(element, strip: bool = True) -> str:
+    """获取lxml元素的文本，strip=True 时等价于 BeautifulSoup 的 get_text(strip=True)"""
+    texts = _XP_TEXT(element)
+    if strip:
+        return ''.join(text.strip() for text in texts)
+    return ''.join(texts)
+
+
+# BeautifulSoup 解析使用的类名匹配规则（与上面的XPath保持一致）
+_RE_CONTAINER_CLASS = re.compile(r'news|content|item|list|article|result')
+_RE_SUMMARY_SPAN_CLASS = re.compile(r'content|abstract|summary|desc|c-abstract|c-span9|c-color-text')
+_RE_SUMMARY_DIV_CLASS = re.compile(r'content|abstract|summary|desc|c-abstract')
+_RE_META_CLASS = re.compile(r'source|author|site|from|c-author|c-color-gray|time|date')
+# 最多检查的来源/时间元素个数
+_MAX_META_ELEMENTS = 8
 
 
 class BaiduNewsCrawler:
     """百度新闻搜索爬虫"""
     
-    def __init__(self):
+    def __init__(self, page_size: int = CRAWLER_PAGE_SIZE, max_workers: int = CRAWLER_MAX_WORKERS,
+                 per_host_concurrency: int = CRAWLER_PER_HOST_CONCURRENCY,
+                 pool_connections: int = CRAWLER_POOL_CONNECTIONS, pool_maxsize: int = CRAWLER_POOL_MAXSIZE,
+                 ua_rotate_interval: float = CRAWLER_UA_ROTATE_INTERVAL,
+                 parser: str = CRAWLER_PARSER, hedge: bool = CRAWLER_HEDGE_ENABLED,
+                 archive: bool = True):
+        # HTML解析引擎：'lxml' 或 'html.parser'
+        self.parser = parser
+
+        # 是否存档原始页面（压测时关闭）
+        self.archive = archive
+
+        # 解析结果缓存：页面内容哈希 -> 解析结果，内容未变化的页面不再重复解析
+        self._parsed_pages: 'OrderedDict[Tuple[bytes, int], List[Dict]]' = OrderedDict()
+        self._parsed_pages_lock = threading.Lock()
+
+        # 对冲请求：首选入口响应慢时向下一个入口再发一个请求，取先返回的结果
+        self.hedge = hedge
+        self._hedge_executor = ThreadPoolExecutor(max_workers=max_workers * 2,
+                                                  thread_name_prefix='crawler-hedge')
+
+        # 多页抓取配置
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.per_host_concurrency = per_host_concurrency
+
+        # User-Agent 定期轮换（只影响请求头，不重建连接）
+        self.ua_rotate_interval = ua_rotate_interval
+        self._ua_lock = threading.Lock()
+        self._current_ua = None
+        self._ua_rotated_at = 0.0
+
         # 尝试使用不同的百度新闻搜索URL
         self.base_urls = [
             "https://news.baidu.com/ns",
@@ -34,6 +194,8 @@ class BaiduNewsCrawler:
         # 更简单的请求头，减少被识别为爬虫的概率
         self.headers = {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            # 压缩传输（安装了 brotli 时包含 br）
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Accept-Language': 'zh-CN,zh;q=0.9',
             'Connection': 'keep-alive',
             'Host': 'www.baidu.com',
@@ -47,354 +209,622 @@ class BaiduNewsCrawler:
         from requests.adapters import HTTPAdapter
         from requests.packages.urllib3.util.retry import Retry
         
+        # 429/503 不在这里重试，交给主机限流器降速，并由 fetch_page 切换到其他URL
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 504],
+            raise_on_status=False,
+            respect_retry_after_header=False,
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # 连接池：pool_connections 为缓存的主机连接池个数，pool_maxsize 为每个主机保持的连接数
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
         self.session.mount('https://', adapter)
         self.session.mount('http://', adapter)
         
-        # 随机选择User-Agent和请求头
-        self._update_session_headers()
-    
-    def _update_session_headers(self):
-        """更新会话的请求头和User-Agent"""
-        self.session.headers.clear()
+        # 会话只保留公共请求头，User-Agent/Host/Referer 每次请求单独生成
         self.session.headers.update(self.headers)
-        
-        # 随机选择User-Agent
-        self.session.headers['User-Agent'] = random.choice(self.user_agents)
-        
-        # 随机选择Host和Referer（根据URL选择）
-        random_url = random.choice(self.base_urls)
-        if 'news.baidu.com' in random_url:
-            self.session.headers['Host'] = 'news.baidu.com'
-            self.session.headers['Referer'] = 'https://news.baidu.com/'
-        else:
-            self.session.headers['Host'] = 'www.baidu.com'
-            self.session.headers['Referer'] = 'https://www.baidu.com/'
-        
-        return random_url
+
+    def close(self, wait: bool = False):
+        """关闭会话，释放连接池中的连接（wait为True时等待后台的对冲请求结束）"""
+        self._hedge_executor.shutdown(wait=wait)
+        self.session.close()
+
+    def _current_user_agent(self) -> str:
+        """获取当前User-Agent，超过轮换间隔后随机更换"""
+        with self._ua_lock:
+            now = time.monotonic()
+            if self._current_ua is None or now - self._ua_rotated_at >= self.ua_rotate_interval:
+                self._current_ua = random.choice(self.user_agents)
+                self._ua_rotated_at = now
+            return self._current_ua
     
-    def search(self, keyword: str, max_results: int = 10) -> List[Dict]:
+    def _rank_urls(self) -> List[str]:
+        """按最近的成功率和响应时间，从好到差排列百度新闻搜索URL"""
+        return rank_endpoints(self.base_urls)
+
+    def _build_request_headers(self, url: str) -> Dict[str, str]:
+        """
+        构建单次请求的请求头
+
+        每次请求单独生成请求头（定期轮换的User-Agent，按URL设置Host和Referer），
+        不修改共享的session.headers，多线程并发抓取时互不干扰
+        """
+        headers = dict(self.headers)
+        headers['User-Agent'] = self._current_user_agent()
+        if 'news.baidu.com' in url:
+            headers['Host'] = 'news.baidu.com'
+            headers['Referer'] = 'https://news.baidu.com/'
+        else:
+            headers['Host'] = 'www.baidu.com'
+            headers['Referer'] = 'https://www.baidu.com/'
+        return headers
+
+    def _build_params(self, url: str, keyword: str, pn: int, rn: int) -> Dict[str, str]:
+        """根据URL构建请求参数（news.baidu.com/ns 使用 word，其余使用 wd）"""
+        key = 'word' if 'news.baidu.com/ns' in url else 'wd'
+        return {
+            key: keyword,
+            'pn': str(pn),
+            'rn': str(rn),
+            'tn': 'news'
+        }
+
+    def _get(self, url: str, keyword: str, pn: int, rn: int,
+             sent: Optional[threading.Event] = None) -> requests.Response:
+        """
+        从主机限流器取得令牌后，在主机并发上限内发送一次请求
+
+        Args:
+            sent: 取得令牌和并发名额、即将发出请求时设置，对冲计时从这时开始
+        """
+        host = urllib.parse.urlparse(url).netloc
+        get_host_limiter(host).acquire()
+        with _get_host_semaphore(host, self.per_host_concurrency):
+            if sent is not None:
+                sent.set()
+            return self.session.get(
+                url,
+                params=self._build_params(url, keyword, pn, rn),
+                headers=self._build_request_headers(url),
+                timeout=30
+            )
+
+    def fetch_page(self, keyword: str, pn: int = 0, rn: int = 10) -> Optional[str]:
+        """
+        抓取一页搜索结果的HTML
+
+        Args:
+            keyword: 搜索关键字
+            pn: 结果偏移量（0, 10, 20, ...）
+            rn: 每页结果数
+
+        Returns:
+            解码后的HTML文本，所有URL均失败时返回None
+        """
+        # 按入口得分依次尝试，熔断中的URL直接跳过；请求频率由主机限流器控制
+        candidates = iter(self._rank_urls())
+        pending = set()
+        hedged = False
+        sent = threading.Event()
+
+        def launch(sent: Optional[threading.Event] = None) -> Optional[str]:
+            for url in candidates:
+                if get_circuit_breaker(url).allow():
+                    pending.add(self._hedge_executor.submit(self._fetch_from, url, keyword, pn, rn, sent))
+                    return url
+                print(f"URL已熔断，跳过: {url}")
+            return None
+
+        current_url = launch(sent)
+        while pending:
+            # 只对首选入口对冲一次，同时最多两个请求
+            timeout = None
+            if self.hedge and not hedged and current_url is not None:
+                # 在本地限流器和主机并发信号量上的排队不计入等待时间，请求真正发出后才开始计时
+                sent.wait()
+                timeout = get_endpoint_stats(current_url).hedge_delay()
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                if launch() is not None:
+                    print(f"请求超过 {timeout:.1f} 秒未返回，发送对冲请求")
+                continue
+
+            for future in done:
+                html = future.result()
+                if html is not None:
+                    # 较慢的请求在后台完成，结果只用于更新统计
+                    return html
+
+            # 失败时切换到下一个入口
+            if not pending:
+                hedged = True
+                launch()
+
+        return None
+
+    def _fetch_from(self, url: str, keyword: str, pn: int, rn: int,
+                    sent: Optional[threading.Event] = None) -> Optional[str]:
+        """向指定入口请求一页，记录统计，失败时返回None"""
+        try:
+            response = self._get(url, keyword, pn, rn, sent)
+        except requests.RequestException as e:
+            get_circuit_breaker(url).record_failure()
+            get_endpoint_stats(url).record(False)
+            print(f"请求异常: {str(e)}，URL: {url}")
+            return None
+        finally:
+            # 请求未能发出时也要唤醒等待对冲计时的线程
+            if sent is not None:
+                sent.set()
+
+        # 解决中文乱码问题：优先使用响应头或 meta 标签声明的编码，都没有时才检测整个页面
+        response.encoding = (decide_encoding(response.headers.get('Content-Type'), response.content)
+                             or response.apparent_encoding)
+
+        if self.record_response(url, response.status_code, response.url, response.text,
+                                response.elapsed.total_seconds(),
+                                parse_retry_after(response.headers.get('Retry-After'))):
+            self.archive_page(response.text, keyword, pn, rn, url)
+            return response.text
+        return None
+
+    def archive_page(self, html: str, keyword: str, pn: int, rn: int, url: str):
+        """存档原始页面，便于解析逻辑修复后重新解析（存档失败不影响抓取）"""
+        archive = get_page_archive() if self.archive else None
+        if archive is None:
+            return
+        try:
+            archive.store(html, keyword, pn, rn, url)
+        except Exception as e:
+            print(f"页面存档失败: {str(e)}")
+
+    def record_response(self, url: str, status: int, final_url: str, html: str, latency: float,
+                        retry_after: Optional[float] = None) -> bool:
+        """
+        根据响应调整主机限流速率、URL熔断状态和入口统计
+
+        Args:
+            url: 请求的搜索URL
+            status: 状态码
+            final_url: 跳转后的最终URL
+            html: 解码后的HTML
+            latency: 响应时间（秒）
+            retry_after: Retry-After 响应头（秒）
+
+        Returns:
+            响应是否可用
+        """
+        limiter = get_host_limiter(urllib.parse.urlparse(url).netloc)
+        breaker = get_circuit_breaker(url)
+        stats = get_endpoint_stats(url)
+
+        if status in (429, 503) or (status == 200 and is_captcha_page(final_url, html)):
+            print(f"请求被限流，状态码: {status}，URL: {url}")
+            limiter.record_throttle(retry_after)
+            breaker.record_failure()
+            stats.record(False)
+            return False
+
+        if status != 200:
+            print(f"请求失败，状态码: {status}，URL: {url}")
+            breaker.record_failure()
+            stats.record(False)
+            return False
+
+        limiter.record_success(latency)
+        breaker.record_success()
+        stats.record(True, latency)
+        return True
+
+    def parse_results(self, html: str, max_results: int = 10, parser: Optional[str] = None,
+                      now: Optional[datetime] = None) -> List[Dict]:
+        """
+        从搜索结果页HTML中解析新闻列表（不涉及网络请求）
+
+        Args:
+            html: 搜索结果页HTML
+            max_results: 最大返回结果数
+            parser: 解析引擎，'lxml'（XPath单次遍历）或 'html.parser'（BeautifulSoup），
+                默认使用爬虫初始化时的配置
+            now: 相对发布时间（"3小时前"）的参照时间，默认为当前时间
+
+        Returns:
+            新闻列表，每个新闻包含：title, summary, cover, url, source, publish_time
+        """
+        parser = parser or self.parser
+        if parser == 'lxml' and lxml_html is not None:
+            try:
+                news_list = self._parse_results_lxml(html, max_results, now)
+                if news_list:
+                    return news_list
+            except Exception as e:
+                print(f"lxml解析错误，改用BeautifulSoup: {str(e)}")
+
+        # BeautifulSoup 解析（兼容性更好，作为后备）
+        return self._parse_results_soup(html, max_results, now)
+
+    def parse_page(self, html: str, max_results: Optional[int] = None) -> List[Dict]:
+        """
+        解析一页搜索结果（默认最多 page_size 条）
+
+        页面内容与之前解析过的页面完全相同时（例如定时监控时结果未更新），
+        直接返回缓存的解析结果，跳过解析。
+        """
+        max_results = max_results or self.page_size
+        key = (hashlib.blake2b(html.encode('utf-8'), digest_size=16).digest(), max_results)
+        with self._parsed_pages_lock:
+            news_list = self._parsed_pages.get(key)
+            if news_list is not None:
+                self._parsed_pages.move_to_end(key)
+        if news_list is None:
+            news_list = self.parse_results(html, max_results)
+            with self._parsed_pages_lock:
+                self._parsed_pages[key] = news_list
+                while len(self._parsed_pages) > CRAWLER_PAGE_CACHE_MAX_ENTRIES:
+                    self._parsed_pages.popitem(last=False)
+        # 返回副本，调用方修改结果不影响缓存
+        return [dict(news) for news in news_list]
+
+    def _parse_results_lxml(self, html: str, max_results: int, now: Optional[datetime] = None) -> List[Dict]:
+        """
+        lxml 解析：一次XPath遍历找出所有带链接的h3，逐个结果块提取字段
+        """
+        doc = lxml_html.fromstring(html)
+
+        news_list = []
+        dedup = NewsDeduplicator()
+        for h3 in _XP_TITLE_H3(doc):
+            if len(news_list) >= max_results:
+                break
+
+            link = _XP_FIRST_LINK(h3)[0]
+            title_text = _lxml_text(link)
+            if len(title_text) < 5:
+                continue
+
+            # 结果块：最近的类名像新闻容器的div/li，否则取最近的父div/li
+            containers = _XP_RESULT_BLOCK(h3) or _XP_PARENT_BLOCK(h3)
+            container = containers[0] if containers else h3
+
+            news_item = self._parse_news_item_lxml(container, title_text, link, now)
+            if news_item:
+                if dedup.add(news_item):
+                    news_list.append(news_item)
+
+        return news_list
+
+    def _parse_results_soup(self, html: str, max_results: int, now: Optional[datetime] = None) -> List[Dict]:
+        """BeautifulSoup 解析"""
+        # 解析HTML - 优先使用html.parser（更兼容）
+        soup = BeautifulSoup(html, 'html.parser')
+
+        news_list = []
+        dedup = NewsDeduplicator()
+
+        # 尝试找到新闻列表容器
+        # 常见的百度新闻容器类
+
+        # 方法1: 查找所有可能的新闻容器
+        possible_containers = soup.find_all(['div', 'li'], class_=_RE_CONTAINER_CLASS)
+
+        for container in possible_containers:
+            # 查找容器中的标题（h3标签，通常包含新闻标题）
+            title_elem = container.find('h3')
+            if title_elem:
+                # 查找标题中的链接
+                title_link = title_elem.find('a', href=True)
+                if title_link:
+                    # 提取标题文本
+                    title_text = title_link.get_text(strip=True)
+                    # 过滤掉太短的标题
+                    if len(title_text) >= 5:
+                        # 解析新闻项
+                        news_item = self._parse_news_item_from_container(container, title_text, title_link, now)
+                        if news_item:
+                            # 检查是否重复
+                            if dedup.add(news_item):
+                                news_list.append(news_item)
+
+                            # 如果达到最大结果数，停止
+                            if len(news_list) >= max_results:
+                                break
+
+            # 如果达到最大结果数，停止
+            if len(news_list) >= max_results:
+                break
+
+        # 如果没有找到足够的新闻，尝试备用方法
+        if len(news_list) < max_results:
+            # 方法2: 直接查找所有h3标签，因为百度新闻的标题通常用h3
+            h3_tags = soup.find_all('h3')
+
+            for h3 in h3_tags:
+                if len(news_list) >= max_results:
+                    break
+
+                link = h3.find('a', href=True)
+                if link:
+                    title_text = link.get_text(strip=True)
+                    if len(title_text) >= 5:
+                        # 尝试找到h3的父容器，因为来源、摘要等信息通常在父容器中
+                        container = h3.find_parent('div') or h3.find_parent('li') or h3
+
+                        news_item = self._parse_news_item_from_container(container, title_text, link, now)
+                        if news_item:
+                            if dedup.add(news_item):
+                                news_list.append(news_item)
+
+        return news_list
+
+    def search(self, keyword: str, max_results: int = 10, multi_page: bool = False,
+               dedup: Optional[NewsDeduplicator] = None) -> List[Dict]:
         """
         搜索新闻
         
         Args:
             keyword: 搜索关键字
             max_results: 最大返回结果数
+            multi_page: 是否多页并发抓取（按 page_size 分页，pn=0,10,20,...）
+            dedup: 去重器，传入同一个实例可跨关键字、跨多次抓取去重
             
         Returns:
-            新闻列表，每个新闻包含：title, summary, cover, url, source
+            新闻列表，每个新闻包含：title, summary, cover, url, source, publish_time
         """
         try:
-            # 添加随机延迟，降低请求频率（1-3秒）
-            time.sleep(random.uniform(1, 3))
-            
-            # 随机选择一个URL
-            current_url = self._update_session_headers()
-            
-            # 构建请求参数
-            if 'news.baidu.com/ns' in current_url:
-                params = {
-                    'word': keyword,
-                    'pn': '0',
-                    'rn': str(max_results),
-                    'tn': 'news'
-                }
-            else:
-                params = {
-                    'wd': keyword,
-                    'pn': '0',
-                    'rn': str(max_results),
-                    'tn': 'news'
-                }
-            
-            # 发送请求，增加超时时间
-            response = self.session.get(current_url, params=params, timeout=30)
-            
-            # 解决中文乱码问题
-            if response.encoding == 'ISO-8859-1':
-                response.encoding = 'utf-8'
-            else:
-                response.encoding = response.apparent_encoding
-            
-            if response.status_code != 200:
-                print(f"请求失败，状态码: {response.status_code}，URL: {current_url}")
-                
-                # 如果第一个URL失败，尝试其他URL
-                for backup_url in self.base_urls:
-                    if backup_url == current_url:
-                        continue
-                    
-                    time.sleep(random.uniform(0.5, 1))
-                    
-                    # 构建备份URL的参数
-                    if 'news.baidu.com/ns' in backup_url:
-                        backup_params = {
-                            'word': keyword,
-                            'pn': '0',
-                            'rn': str(max_results),
-                            'tn': 'news'
-                        }
-                    else:
-                        backup_params = {
-                            'wd': keyword,
-                            'pn': '0',
-                            'rn': str(max_results),
-                            'tn': 'news'
-                        }
-                    
-                    backup_response = self.session.get(backup_url, params=backup_params, timeout=30)
-                    
-                    if backup_response.status_code == 200:
-                        print(f"备份URL成功: {backup_url}")
-                        response = backup_response
-                        break
-                    else:
-                        print(f"备份URL也失败了，状态码: {backup_response.status_code}，URL: {backup_url}")
-                
-                if response.status_code != 200:
-                    return []
-            
-            # 解析HTML - 优先使用html.parser（更兼容）
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
+            if dedup is None:
+                dedup = NewsDeduplicator()
+
+            if multi_page:
+                return self._search_pages(keyword, max_results, dedup)
+
+            html = self.fetch_page(keyword, 0, max_results)
+            if html is None:
+                return []
+
             news_list = []
-            
-            # 尝试找到新闻列表容器
-            # 常见的百度新闻容器类
-            news_containers = []
-            
-            # 方法1: 查找所有可能的新闻容器
-            possible_containers = soup.find_all(['div', 'li'], class_=re.compile(r'news|content|item|list|article|result'))
-            
-            for container in possible_containers:
-                # 查找容器中的标题（h3标签，通常包含新闻标题）
-                title_elem = container.find('h3')
-                if title_elem:
-                    # 查找标题中的链接
-                    title_link = title_elem.find('a', href=True)
-                    if title_link:
-                        # 提取标题文本
-                        title_text = title_link.get_text(strip=True)
-                        # 过滤掉太短的标题
-                        if len(title_text) >= 5:
-                            # 解析新闻项
-                            news_item = self._parse_news_item_from_container(container, title_text, title_link)
-                            if news_item:
-                                # 检查是否重复
-                                if not any(n.get('title') == news_item.get('title') for n in news_list):
-                                    news_list.append(news_item)
-                                
-                                # 如果达到最大结果数，停止
-                                if len(news_list) >= max_results:
-                                    break
-                
-                # 如果达到最大结果数，停止
-                if len(news_list) >= max_results:
-                    break
-            
-            # 如果没有找到足够的新闻，尝试备用方法
-            if len(news_list) < max_results:
-                # 方法2: 直接查找所有h3标签，因为百度新闻的标题通常用h3
-                h3_tags = soup.find_all('h3')
-                
-                for h3 in h3_tags:
-                    if len(news_list) >= max_results:
-                        break
-                    
-                    link = h3.find('a', href=True)
-                    if link:
-                        title_text = link.get_text(strip=True)
-                        if len(title_text) >= 5:
-                            # 尝试找到h3的父容器，因为来源、摘要等信息通常在父容器中
-                            container = h3.find_parent('div') or h3.find_parent('li') or h3
-                            
-                            news_item = self._parse_news_item_from_container(container, title_text, link)
-                            if news_item:
-                                if not any(n.get('title') == news_item.get('title') for n in news_list):
-                                    news_list.append(news_item)
-            
+            self._merge_page(news_list, self.parse_page(html, max_results), max_results, dedup)
             return news_list
             
         except Exception as e:
             print(f"抓取错误: {str(e)}")
             return []
-    
-    
-    def _parse_news_item_from_container(self, container, title_text: str, link) -> Optional[Dict]:
-        """从容器中解析单个新闻项"""
+
+    def _fetch_and_parse_page(self, keyword: str, page: int) -> Optional[List[Dict]]:
+        """抓取并解析第page页（从0开始），失败时返回None"""
         try:
-            news = {}
-            
-            # 1. 标题
-            if not title_text:
+            html = self.fetch_page(keyword, page * self.page_size, self.page_size)
+            if html is None:
                 return None
-            
-            news['title'] = title_text
-            
-            # 2. URL
-            href = link.get('href', '')
-            if href.startswith('//'):
-                href = 'https:' + href
-            elif href.startswith('/'):
-                href = 'https://www.baidu.com' + href
-            
-            # 处理百度跳转链接
-            if 'baidu.com/link' in href or '/link?url=' in href:
-                try:
-                    from urllib.parse import parse_qs, urlparse, unquote
-                    parsed = urlparse(href)
-                    query_params = parse_qs(parsed.query)
-                    if 'url' in query_params:
-                        real_url = unquote(query_params['url'][0])
-                        news['url'] = real_url
-                    else:
-                        news['url'] = href
-                except:
-                    news['url'] = href
-            else:
-                news['url'] = href
-            
-            # 3. 概要 - 查找摘要信息
-            summary = self._extract_summary(container, title_text)
-            news['summary'] = summary
-            
-            # 4. 封面图片
-            cover = self._extract_cover(container)
-            news['cover'] = cover
-            
-            # 5. 来源
-            source = self._extract_source(container)
-            news['source'] = source
-            
-            # 确保所有字段都存在
-            news.setdefault('title', '')
-            news.setdefault('summary', '')
-            news.setdefault('cover', '')
-            news.setdefault('url', '')
-            news.setdefault('source', '')
-            
-            # 只要有标题和URL就返回
-            if news.get('title') and len(news.get('title', '')) >= 5 and news.get('url'):
-                return news
-            
-            return None
-            
+            return self.parse_page(html)
         except Exception as e:
-            print(f"解析新闻项错误: {str(e)}")
+            print(f"抓取第{page + 1}页错误: {str(e)}")
             return None
-    
 
+    def _search_pages(self, keyword: str, max_results: int, dedup: NewsDeduplicator) -> List[Dict]:
+        """多页并发抓取，返回合并去重后的新闻列表"""
+        news_list = []
+        for _, page_items in self.iter_pages(keyword, max_results, dedup):
+            news_list.extend(page_items)
+        return news_list
+
+    def iter_pages(self, keyword: str, max_results: int = 10,
+                   dedup: Optional[NewsDeduplicator] = None) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        多页并发抓取，按页码顺序逐页产出结果
+
+        所有页面提交到有界线程池并发抓取，按页码顺序合并去重，
+        结果数达到max_results或遇到空页后取消尚未开始的页面。
+        第一页返回后即可产出，调用方不必等待全部页面完成。
+
+        Yields:
+            (页码（从0开始）, 本页新增的新闻列表)，抓取失败的页面产出空列表
+        """
+        if dedup is None:
+            dedup = NewsDeduplicator()
+
+        pages = max(1, -(-max_results // self.page_size))
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, pages))
+        try:
+            futures = [executor.submit(self._fetch_and_parse_page, keyword, page)
+                       for page in range(pages)]
+
+            count = 0
+            for page, future in enumerate(futures):
+                page_items = []
+                done = self._merge_page(page_items, future.result(), max_results - count, dedup)
+                count += len(page_items)
+                yield page, page_items
+                if done:
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_new(self, keyword: str, max_results: int, is_seen: Callable[[Dict], bool],
+                 before_page: Optional[Callable[[], None]] = None) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        增量抓取：按页顺序逐页抓取，遇到已抓取过的新闻即停止翻页
+
+        用于定时监控，稳定状态下只需抓取第一页。
+
+        Args:
+            keyword: 搜索关键字
+            max_results: 最多抓取的新闻条数
+            is_seen: 判断新闻是否已抓取过
+            before_page: 每页请求前调用（例如从全局限流令牌桶取令牌）
+
+        Yields:
+            (页码（从0开始）, 本页的新新闻列表)
+        """
+        dedup = NewsDeduplicator()
+        pages = max(1, -(-max_results // self.page_size))
+        count = 0
+        for page in range(pages):
+            if before_page is not None:
+                before_page()
+
+            page_items = self._fetch_and_parse_page(keyword, page)
+            if not page_items:
+                # 抓取失败或没有更多结果
+                return
+
+            # 百度新闻默认按相关度排序，页内顺序不严格按时间，因此整页检查完再决定是否停止
+            new_items = []
+            reached = False
+            for news in page_items:
+                if is_seen(news):
+                    reached = True
+                    continue
+                if dedup.add(news):
+                    new_items.append(news)
+                    count += 1
+                    if count >= max_results:
+                        reached = True
+                        break
+
+            yield page, new_items
+            if reached:
+                return
+
+    def _merge_page(self, news_list: List[Dict], page_items: Optional[List[Dict]], max_results: int,
+                    dedup: NewsDeduplicator) -> bool:
+        """
+        按排名顺序把一页结果合并进news_list（按规范化URL和标题去重）
+
+        Returns:
+            是否应停止合并后续页面（已满max_results或遇到空页）
+        """
+        if page_items is None:
+            # 该页抓取失败，继续合并后续页面
+            return False
+        if not page_items:
+            # 空页说明已经没有更多结果
+            return True
+
+        for news_item in page_items:
+            if dedup.add(news_item):
+                news_list.append(news_item)
+            if len(news_list) >= max_results:
+                return True
+
+        return False
     
-    def _parse_news_item_from_container(self, container, title_text: str, link) -> Optional[Dict]:
-        """从容器中解析单个新闻项"""
+    
+    def _parse_news_item_from_container(self, container, title_text: str, link,
+                                        now: Optional[datetime] = None) -> Optional[Dict]:
+        """从容器中解析单个新闻项（BeautifulSoup）"""
         try:
-            news = {}
-            
-            # 1. 标题
-            if not title_text:
-                return None
-            
-            news['title'] = title_text
-            
-            # 2. URL
-            href = link.get('href', '')
-            if href.startswith('//'):
-                href = 'https:' + href
-            elif href.startswith('/'):
-                href = 'https://www.baidu.com' + href
-            
-            # 处理百度跳转链接
-            if 'baidu.com/link' in href or '/link?url=' in href:
-                try:
-                    from urllib.parse import parse_qs, urlparse, unquote
-                    parsed = urlparse(href)
-                    query_params = parse_qs(parsed.query)
-                    if 'url' in query_params:
-                        real_url = unquote(query_params['url'][0])
-                        news['url'] = real_url
-                    else:
-                        news['url'] = href
-                except:
-                    news['url'] = href
-            else:
-                news['url'] = href
-            
-            # 3. 概要 - 查找摘要信息
-            summary = self._extract_summary(container, title_text)
-            news['summary'] = summary
-            
-            # 4. 封面图片
-            cover = self._extract_cover(container)
-            news['cover'] = cover
-            
-            # 5. 来源
-            source = self._extract_source(container)
-            news['source'] = source
-            
-            # 确保所有字段都存在
-            news.setdefault('title', '')
-            news.setdefault('summary', '')
-            news.setdefault('cover', '')
-            news.setdefault('url', '')
-            news.setdefault('source', '')
-            
-            # 只要有标题和URL就返回
-            if news.get('title') and len(news.get('title', '')) >= 5 and news.get('url'):
-                return news
-            
-            return None
-            
+            return self._build_news_item(
+                title_text,
+                link.get('href', ''),
+                self._extract_fields(container, title_text, now),
+                self._extract_cover(container)
+            )
         except Exception as e:
             print(f"解析新闻项错误: {str(e)}")
             return None
 
-    def _extract_summary(self, container, title_text: str) -> str:
-        """提取摘要"""
+    def _parse_news_item_lxml(self, container, title_text: str, link,
+                              now: Optional[datetime] = None) -> Optional[Dict]:
+        """从结果块中解析单个新闻项（lxml）"""
         try:
-            # 方法1: 查找h3后面的兄弟元素（摘要通常在标题后面）
-            current = container
-            # 如果container就是h3，查找它的父容器
-            if container.name == 'h3':
-                current = container.find_parent('div') or container
-            
-            # 查找摘要span或div
-            summary_elem = current.find('span', class_=re.compile(r'content|abstract|summary|desc|c-abstract|c-span9')) or \
-                          current.find('div', class_=re.compile(r'content|abstract|summary|desc|c-abstract'))
-            
-            if summary_elem:
-                summary_text = summary_elem.get_text(strip=True)
-                # 移除标题
-                summary_text = summary_text.replace(title_text, '').strip()
-                # 移除来源和时间
-                summary_text = re.sub(r'来源[：:].*', '', summary_text).strip()
-                summary_text = re.sub(r'\d{4}[-/\d{1,2}[-/\d{1,2}.*', '', summary_text).strip()
-                if len(summary_text) > 10:
-                    return summary_text[:300]
-            
-            # 方法2: 从容器文本中提取
-            container_text = current.get_text(strip=True)
-            if len(container_text) > len(title_text) + 20:
-                # 移除标题
-                summary = container_text.replace(title_text, '').strip()
-                # 移除来源和时间信息
-                summary = re.sub(r'来源[：:].*', '', summary).strip()
-                summary = re.sub(r'\d{4}[-/\d{1,2}[-/\d{1,2}.*', '', summary).strip()
-                # 移除URL
-                summary = re.sub(r'https?://[^\s]+', '', summary).strip()
-                # 移除多余的空白
-                summary = re.sub(r'\s+', ' ', summary).strip()
-                if len(summary) > 20:
-                    return summary[:300]
-            
-            return ''
+            return self._build_news_item(
+                title_text,
+                link.get('href', ''),
+                self._extract_fields_lxml(container, title_text, now),
+                self._extract_cover_lxml(container)
+            )
         except Exception as e:
-            return ''
+            print(f"解析新闻项错误: {str(e)}")
+            return None
+
+    def _build_news_item(self, title_text: str, href: str, fields: Dict[str, str], cover: str) -> Optional[Dict]:
+        """组装新闻项，只要有标题和URL就返回"""
+        # 1. 标题
+        if not title_text:
+            return None
+
+        news = {
+            'title': title_text,
+            # 2. URL
+            'url': self._normalize_url(href),
+            # 3. 概要
+            'summary': fields['summary'],
+            # 4. 封面图片
+            'cover': cover or '',
+            # 5. 来源
+            'source': fields['source'],
+            # 6. 发布时间
+            'publish_time': fields['publish_time']
+        }
+
+        if len(news['title']) >= 5 and news['url']:
+            return news
+
+        return None
+
+    def _normalize_url(self, href: str) -> str:
+        """补全相对链接，处理百度跳转链接"""
+        if href.startswith('//'):
+            href = 'https:' + href
+        elif href.startswith('/'):
+            href = 'https://www.baidu.com' + href
+
+        # 处理百度跳转链接
+        if 'baidu.com/link' in href or '/link?url=' in href:
+            try:
+                from urllib.parse import parse_qs, urlparse, unquote
+                parsed = urlparse(href)
+                query_params = parse_qs(parsed.query)
+                if 'url' in query_params:
+                    return unquote(query_params['url'][0])
+            except:
+                pass
+        return href
+
+    def _extract_fields(self, container, title_text: str, now: Optional[datetime] = None) -> Dict[str, str]:
+        """提取摘要、来源和发布时间（BeautifulSoup，结果块文本只获取一次）"""
+        current = container
+        # 如果container就是h3，在它的父容器中查找摘要
+        if container.name == 'h3':
+            current = container.find_parent('div') or container
+
+        summary_elem = current.find('span', class_=_RE_SUMMARY_SPAN_CLASS) or \
+            current.find('div', class_=_RE_SUMMARY_DIV_CLASS)
+        meta_elems = container.find_all(['span', 'div', 'a'], class_=_RE_META_CLASS, limit=_MAX_META_ELEMENTS)
+
+        return extract_fields(
+            title_text,
+            summary_elem.get_text(strip=True) if summary_elem else '',
+            list(current.strings),
+            [elem.get_text(strip=True) for elem in meta_elems],
+            now
+        )
+
+    def _extract_fields_lxml(self, container, title_text: str, now: Optional[datetime] = None) -> Dict[str, str]:
+        """提取摘要、来源和发布时间（lxml，结果块文本只获取一次）"""
+        current = container
+        if container.tag == 'h3':
+            parents = _XP_PARENT_DIV(container)
+            current = parents[0] if parents else container
+
+        summary_elems = _XP_SUMMARY_SPAN(current) or _XP_SUMMARY_DIV(current)
+        meta_elems = _XP_META(container)[:_MAX_META_ELEMENTS]
+
+        return extract_fields(
+            title_text,
+            _lxml_text(summary_elems[0]) if summary_elems else '',
+            _XP_TEXT(current),
+            [_lxml_text(elem) for elem in meta_elems],
+            now
+        )
 
     def _extract_cover(self, container) -> str:
         """提取封面图片"""
@@ -402,70 +832,76 @@ class BaiduNewsCrawler:
             # 查找图片
             img_elem = container.find('img')
             if img_elem:
-                img_src = img_elem.get('src') or img_elem.get('data-src') or img_elem.get('data-original')
-                if img_src:
-                    if img_src.startswith('//'):
-                        img_src = 'https:' + img_src
-                    elif img_src.startswith('/'):
-                        img_src = 'https://www.baidu.com' + img_src
-                    
-                    # 过滤掉百度的小图标和logo
-                    if 'baidu.com' in img_src:
-                        if any(keyword in img_src.lower() for keyword in ['icon', 'logo', 'static']):
-                            return ''
-                    
-                    return img_src
+                return self._normalize_cover(img_elem.get('src') or img_elem.get('data-src') or img_elem.get('data-original'))
             return ''
         except:
             return ''
 
-    def _extract_source(self, container) -> str:
-        """提取来源"""
+    def _extract_cover_lxml(self, container) -> str:
+        """提取封面图片（lxml）"""
         try:
-            # 方法1: 查找来源标签
-            source_elem = container.find('span', class_=re.compile(r'source|author|site|from|c-author|c-color-gray')) or \
-                         container.find('div', class_=re.compile(r'source|author|site|from|c-author')) or \
-                         container.find('a', class_=re.compile(r'source|site'))
-            
-            if source_elem:
-                source_text = source_elem.get_text(strip=True)
-                # 移除时间信息
-                source_text = re.sub(r'\s+\d{4}[-/\d{1,2}[-/\d{1,2}.*', '', source_text).strip()
-                if source_text and len(source_text) < 50:
-                    return source_text
-            
-            # 方法2: 从文本中提取
-            container_text = container.get_text()
-            # 查找"来源：xxx"模式
-            source_match = re.search(r'来源[：:]\s*([^\s\n]+)', container_text)
-            if source_match:
-                return source_match.group(1).strip()[:50]
-            
-            # 查找"xxx 2024-01-01"模式（来源+时间）
-            source_match = re.search(r'([^\s]+)\s+\d{4}[-/\d{1,2}[-/\d{1,2}', container_text)
-            if source_match:
-                source_text = source_match.group(1).strip()
-                # 过滤掉明显不是来源的词
-                if source_text and len(source_text) < 30 and '来源' not in source_text:
-                    return source_text[:50]
-            
+            img_elems = _XP_FIRST_IMG(container)
+            if img_elems:
+                img_elem = img_elems[0]
+                return self._normalize_cover(img_elem.get('src') or img_elem.get('data-src') or img_elem.get('data-original'))
             return ''
         except:
             return ''
-    
 
+    def _normalize_cover(self, img_src: Optional[str]) -> str:
+        """补全图片地址，过滤掉百度的小图标和logo"""
+        if not img_src:
+            return ''
+        if img_src.startswith('//'):
+            img_src = 'https:' + img_src
+        elif img_src.startswith('/'):
+            img_src = 'https://www.baidu.com' + img_src
+
+        # 过滤掉百度的小图标和logo
+        if 'baidu.com' in img_src:
+            if any(keyword in img_src.lower() for keyword in ['icon', 'logo', 'static']):
+                return ''
+
+        return img_src
+
+
+# 进程内共享的爬虫实例（复用 Session 与连接池，避免每次请求重新握手）
+_shared_crawler: Optional[BaiduNewsCrawler] = None
+_shared_crawler_lock = threading.Lock()
+
+
+def get_crawler() -> BaiduNewsCrawler:
+    """获取进程内共享的爬虫实例（线程安全，首次调用时创建）"""
+    global _shared_crawler
+    if _shared_crawler is None:
+        with _shared_crawler_lock:
+            if _shared_crawler is None:
+                _shared_crawler = BaiduNewsCrawler()
+    return _shared_crawler
+
+
+def shutdown_crawler():
+    """关闭共享爬虫实例的连接池（进程退出时自动调用）"""
+    global _shared_crawler
+    with _shared_crawler_lock:
+        if _shared_crawler is not None:
+            _shared_crawler.close()
+            _shared_crawler = None
+
+
+atexit.register(shutdown_crawler)
 
 
-def crawl_news(keyword: str, max_results: int = 10) -> List[Dict]:
+def crawl_news(keyword: str, max_results: int = 10, multi_page: bool = False) -> List[Dict]:
     """
     抓取新闻的便捷函数
     
     Args:
         keyword: 搜索关键字
         max_results: 最大返回结果数
+        multi_page: 是否多页并发抓取
         
     Returns:
         新闻列表
     """
-    crawler = BaiduNewsCrawler()
-    return crawler.search(keyword, max_results)
+    return get_crawler().search(keyword, max_results, multi_page=multi_page)
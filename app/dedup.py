@@ -0,0 +1,121 @@
+"""
+新闻去重 - URL规范化 + 标题规范化，基于哈希集合的O(1)判重
+"""
+import re
+import unicodedata
+from typing import Dict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, unquote
+
+# 跟踪参数（不影响页面内容，规范化时去除）
+TRACKING_PARAMS = {
+    'spm', 'wfr', 'for', 'from', 'fr', 'ref', 'src', 'source', 'share', 'share_from',
+    'share_token', 'isappinstalled', 'scene', 'clicktime', 'enterid', 'timestamp',
+}
+TRACKING_PREFIXES = ('utm_', 'rsv_')
+
+# 标题中的空白、标点和符号
+_TITLE_STRIP_RE = re.compile(r'[\W_]+')
+
+# 默认端口
+_DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def unwrap_redirect(url: str) -> str:
+    """展开百度跳转链接（/link?url=...），url参数本身是完整地址时返回真实地址"""
+    parts = urlsplit(url)
+    if parts.path.rstrip('/').endswith('/link') and 'baidu.com' in parts.netloc:
+        for key, value in parse_qsl(parts.query):
+            if key == 'url':
+                value = unquote(value)
+                if value.startswith(('http://', 'https://')):
+                    return value
+    return url
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    URL规范化
+
+    - 展开百度跳转链接
+    - scheme 统一为 https，host 转小写并去掉 www. 前缀和默认端口
+    - 去除跟踪参数，其余参数按名称排序
+    - 去除片段（#...）和路径末尾的斜杠
+    """
+    if not url:
+        return ''
+    url = url.strip()
+    if url.startswith('//'):
+        url = 'https:' + url
+    url = unwrap_redirect(url)
+
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https'):
+        return url
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    port = str(parts.port) if parts.port else ''
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{port}'
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def normalize_title(title: str) -> str:
+    """标题规范化：全角转半角、转小写、去除空白和标点"""
+    title = unicodedata.normalize('NFKC', title or '').lower()
+    return _TITLE_STRIP_RE.sub('', title)
+
+
+class NewsDeduplicator:
+    """
+    新闻去重器
+
+    规范化URL或规范化标题任一已出现过即视为重复。同一个实例可以跨页面、
+    跨关键字、跨多次抓取复用。
+    """
+
+    def __init__(self):
+        self.seen_urls = set()
+        self.seen_titles = set()
+
+    def add(self, news: Dict) -> bool:
+        """
+        记录新闻
+
+        Returns:
+            新闻是否为首次出现（重复时返回False且不记录）
+        """
+        url_key = canonicalize_url(news.get('url', ''))
+        title_key = normalize_title(news.get('title', ''))
+        if (url_key and url_key in self.seen_urls) or (title_key and title_key in self.seen_titles):
+            return False
+        if url_key:
+            self.seen_urls.add(url_key)
+        if title_key:
+            self.seen_titles.add(title_key)
+        return True
+
+    def clear(self):
+        """清空已记录的新闻"""
+        self.seen_urls.clear()
+        self.seen_titles.clear()
+
+    def __len__(self):
+        return len(self.seen_urls)
+
@@ -0,0 +1,110 @@
+"""
+搜索入口健康统计 - 按滚动窗口内的成功率和响应时间给百度搜索URL排序
+"""
+import random
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from config import (CRAWLER_ENDPOINT_WINDOW, CRAWLER_ENDPOINT_EXPLORE, CRAWLER_HEDGE_PERCENTILE,
+                    CRAWLER_HEDGE_MIN_DELAY, CRAWLER_HEDGE_DEFAULT_DELAY)
+
+# 样本数少于该值的入口优先尝试，尽快积累统计
+_MIN_SAMPLES = 5
+# 成功率下限，避免全部失败时得分为无穷大
+_MIN_SUCCESS_RATE = 0.05
+
+
+class EndpointStats:
+    """
+    单个搜索入口的滚动统计（最近 window 次请求）
+
+    得分 = 平均响应时间 / 成功率，越低越好；失败的请求只计入成功率。
+    """
+
+    def __init__(self, window: int = CRAWLER_ENDPOINT_WINDOW):
+        self._results = deque(maxlen=window)
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, success: bool, latency: Optional[float] = None):
+        """记录一次请求结果"""
+        with self._lock:
+            self._results.append(success)
+            if success and latency is not None:
+                self._latencies.append(latency)
+
+    @property
+    def samples(self) -> int:
+        return len(self._results)
+
+    def success_rate(self) -> float:
+        with self._lock:
+            if not self._results:
+                return 1.0
+            return sum(self._results) / len(self._results)
+
+    def score(self) -> float:
+        """期望耗时得分（样本不足时为0，优先尝试）"""
+        with self._lock:
+            if len(self._results) < _MIN_SAMPLES:
+                return 0.0
+            success_rate = sum(self._results) / len(self._results)
+            latency = (sum(self._latencies) / len(self._latencies)) if self._latencies else CRAWLER_HEDGE_DEFAULT_DELAY
+        return latency / max(success_rate, _MIN_SUCCESS_RATE)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """成功请求响应时间的分位数，样本不足时返回None"""
+        with self._lock:
+            if len(self._latencies) < _MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def hedge_delay(self) -> float:
+        """对冲请求的等待时间：超过该入口响应时间的 p95 仍未返回时，向下一个入口再发一个请求"""
+        value = self.percentile(CRAWLER_HEDGE_PERCENTILE)
+        if value is None:
+            return CRAWLER_HEDGE_DEFAULT_DELAY
+        return max(value, CRAWLER_HEDGE_MIN_DELAY)
+
+    def to_dict(self) -> Dict:
+        return {
+            'samples': self.samples,
+            'success_rate': round(self.success_rate(), 3),
+            'p95': self.percentile(0.95),
+            'score': round(self.score(), 3),
+        }
+
+
+# 每个搜索URL一份统计，所有爬虫实例（包括异步爬虫）共享
+_endpoint_stats: Dict[str, EndpointStats] = {}
+_endpoint_stats_lock = threading.Lock()
+
+
+def get_endpoint_stats(url: str) -> EndpointStats:
+    """获取搜索URL对应的统计（首次访问时创建）"""
+    with _endpoint_stats_lock:
+        stats = _endpoint_stats.get(url)
+        if stats is None:
+            stats = EndpointStats()
+            _endpoint_stats[url] = stats
+        return stats
+
+
+def reset_endpoint_stats():
+    """清空所有入口统计（压测时每轮重新开始）"""
+    with _endpoint_stats_lock:
+        _endpoint_stats.clear()
+
+
+def rank_endpoints(urls: List[str], explore: float = CRAWLER_ENDPOINT_EXPLORE) -> List[str]:
+    """
+    按得分从好到差排列搜索URL
+
+    以 explore 的概率把一个随机入口提到最前，让恢复正常的入口有机会重新积累统计。
+    """
+    ranked = sorted(urls, key=lambda url: get_endpoint_stats(url).score())
+    if len(ranked) > 1 and random.random() < explore:
+        ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+    return ranked
@@ -0,0 +1,182 @@
+"""
+新闻字段提取 - 摘要、来源、发布时间（BeautifulSoup 和 lxml 两种解析引擎共用）
+
+所有正则在模块加载时编译。每个结果块的文本节点只获取一次，摘要、来源和发布时间
+都从这一份文本中提取；摘要的清理（来源标注、URL、日期、多余空白）合并为一次替换。
+"""
+import re
+from datetime import datetime, timedelta, time as dt_time
+from typing import List, Dict, Optional
+
+# 发布时间：相对时间（3小时前、刚刚、昨天15:56）和绝对时间（2024-01-01 08:00、2024年1月1日、12月3日）
+_TIME_PATTERN = (
+    r'(?P<ago>\d+)\s*(?P<unit>秒|分钟|小时|天|周|个月)前'
+    r'|(?P<just>刚刚)'
+    r'|(?P<day>今天|昨天|前天)\s*(?:(?P<day_h>\d{1,2}):(?P<day_mi>\d{2}))?'
+    r'|(?P<y>\d{4})[-/.年](?P<mo>\d{1,2})[-/.月](?P<d>\d{1,2})日?(?:\s*(?P<h>\d{1,2}):(?P<mi>\d{2}))?'
+    r'|(?P<md_mo>\d{1,2})月(?P<md_d>\d{1,2})日(?:\s*(?P<md_h>\d{1,2}):(?P<md_mi>\d{2}))?'
+)
+_RE_TIME = re.compile(_TIME_PATTERN)
+_RE_TIME_ONLY = re.compile(rf'\s*(?:{_TIME_PATTERN})\s*')
+_RE_LEADING_TIME = re.compile(rf'\s*(?:{_TIME_PATTERN})')
+
+_RELATIVE_UNITS = {
+    '秒': timedelta(seconds=1),
+    '分钟': timedelta(minutes=1),
+    '小时': timedelta(hours=1),
+    '天': timedelta(days=1),
+    '周': timedelta(weeks=1),
+    '个月': timedelta(days=30),
+}
+_RELATIVE_DAYS = {'今天': 0, '昨天': 1, '前天': 2}
+
+# 来源："来源：xxx"，或 "xxx 2024-01-01"（来源后跟日期）
+_RE_SOURCE_LABEL = re.compile(r'来源[：:]\s*([^\s]+)')
+_RE_SOURCE_BEFORE_DATE = re.compile(r'([^\s]+)\s+\d{4}[-/]\d{1,2}[-/]\d{1,2}')
+_RE_TRAILING_DATE = re.compile(r'\s+\d{4}[-/]\d{1,2}[-/]\d{1,2}.*')
+
+# 摘要清理：来源标注（到行尾）、URL、日期时间（连同前面的空白）、连续空白，一次替换完成
+_RE_NOISE = re.compile(
+    r'\s*(?:来源[：:][^\n]*'
+    r'|https?://\S+'
+    r'|\d{4}[-/]\d{1,2}[-/]\d{1,2}(?:\s*\d{1,2}:\d{2}(?::\d{2})?)?)'
+    r'|(?P<space>\s+)'
+)
+
+# 摘要最大长度
+SUMMARY_MAX_LENGTH = 300
+
+
+def _replace_noise(match) -> str:
+    return ' ' if match.group('space') else ''
+
+
+def clean_text(text: str) -> str:
+    """去除来源标注、URL和日期，合并连续空白"""
+    return _RE_NOISE.sub(_replace_noise, text).strip()
+
+
+def _time_from_match(match, now: datetime) -> Optional[datetime]:
+    """把发布时间的匹配结果转换为datetime"""
+    try:
+        if match.group('just'):
+            return now.replace(microsecond=0)
+        if match.group('ago'):
+            return (now - int(match.group('ago')) * _RELATIVE_UNITS[match.group('unit')]).replace(microsecond=0)
+        if match.group('day'):
+            date = now.date() - timedelta(days=_RELATIVE_DAYS[match.group('day')])
+            return datetime.combine(date, dt_time(int(match.group('day_h') or 0), int(match.group('day_mi') or 0)))
+        if match.group('y'):
+            return datetime(int(match.group('y')), int(match.group('mo')), int(match.group('d')),
+                            int(match.group('h') or 0), int(match.group('mi') or 0))
+        if match.group('md_mo'):
+            value = datetime(now.year, int(match.group('md_mo')), int(match.group('md_d')),
+                             int(match.group('md_h') or 0), int(match.group('md_mi') or 0))
+            # 不带年份的日期晚于当前时间，说明是去年
+            if value > now + timedelta(days=1):
+                value = value.replace(year=now.year - 1)
+            return value
+    except ValueError:
+        return None
+    return None
+
+
+def parse_publish_time(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    解析文本中的发布时间
+
+    Args:
+        text: 包含时间的文本，例如 "3小时前"、"昨天15:56"、"2024-01-01 08:00"
+        now: 相对时间的参照时间（默认为当前时间，重新解析存档页面时为页面的抓取时间）
+
+    Returns:
+        发布时间，无法识别时返回None
+    """
+    match = _RE_TIME.search(text or '')
+    if match is None:
+        return None
+    return _time_from_match(match, now or datetime.now())
+
+
+def clean_source(text: str) -> str:
+    """清理来源元素的文本（去掉来源后面的日期）"""
+    text = _RE_TRAILING_DATE.sub('', text).strip()
+    if text and len(text) < 50:
+        return text
+    return ''
+
+
+def _strip_summary(text: str, title: str, source: str) -> str:
+    """去掉摘要文本中的标题、开头的发布时间和末尾的来源"""
+    text = text.replace(title, '')
+    match = _RE_LEADING_TIME.match(text)
+    if match:
+        text = text[match.end():]
+    if source and text.endswith(source):
+        text = text[:-len(source)]
+    return clean_text(text)
+
+
+def extract_fields(title: str, summary_text: str, texts: List[str], meta_texts: List[str],
+                   now: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    从一个结果块中提取摘要、来源和发布时间
+
+    Args:
+        title: 新闻标题
+        summary_text: 摘要元素的文本（没有摘要元素时为空）
+        texts: 结果块的全部文本节点（只获取一次）
+        meta_texts: 来源/时间元素的文本（按文档顺序）
+        now: 相对时间的参照时间
+
+    Returns:
+        {'summary': 摘要, 'source': 来源, 'publish_time': 发布时间（'%Y-%m-%d %H:%M:%S'，无法识别时为空）}
+    """
+    now = now or datetime.now()
+    raw_text = ''.join(texts)
+    stripped_text = ''.join(text.strip() for text in texts)
+
+    # 1. 来源/时间元素：完全是时间的作为发布时间，其余第一个有效的作为来源
+    publish_time = None
+    source = ''
+    for text in meta_texts:
+        match = _RE_TIME_ONLY.fullmatch(text)
+        if match:
+            if publish_time is None:
+                publish_time = _time_from_match(match, now)
+            continue
+        if not source:
+            source = clean_source(text)
+
+    # 2. 来源：从结果块文本中查找
+    if not source:
+        match = _RE_SOURCE_LABEL.search(raw_text)
+        if match:
+            source = match.group(1).strip()[:50]
+        else:
+            match = _RE_SOURCE_BEFORE_DATE.search(raw_text)
+            if match and len(match.group(1)) < 30 and '来源' not in match.group(1):
+                source = match.group(1).strip()
+
+    # 3. 发布时间：标题后面紧跟的时间
+    if publish_time is None:
+        match = _RE_LEADING_TIME.match(stripped_text.replace(title, '', 1))
+        if match:
+            publish_time = _time_from_match(match, now)
+
+    # 4. 摘要：优先使用摘要元素，否则从结果块文本中提取
+    summary = ''
+    if summary_text:
+        summary = _strip_summary(summary_text, title, source)
+        if len(summary) <= 10:
+            summary = ''
+    if not summary and len(stripped_text) > len(title) + 20:
+        summary = _strip_summary(stripped_text, title, source)
+        if len(summary) <= 20:
+            summary = ''
+
+    return {
+        'summary': summary[:SUMMARY_MAX_LENGTH],
+        'source': source,
+        'publish_time': publish_time.strftime('%Y-%m-%d %H:%M:%S') if publish_time else '',
+    }
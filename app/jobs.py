@@ -0,0 +1,193 @@
+"""
+后台抓取任务 - 有界队列 + 工作线程，任务状态和结果保存在数据库
+"""
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from flask import Flask
+
+from app.models import CrawlJob, db
+from config import CRAWLER_JOB_WORKERS, CRAWLER_JOB_QUEUE_SIZE, CRAWLER_STREAM_MAX_CONCURRENT
+
+
+def run_crawl(keyword: str, max_results: int, user_id: Optional[int] = None, trigger: str = 'api') -> Dict:
+    """
+    执行一次完整的抓取流程：读缓存/抓取 -> 入库 -> 相似新闻归并
+
+    需要在应用上下文中调用。
+
+    Returns:
+        {'data': 新闻列表（带story_id）, 'cache_hit': 是否命中缓存, 'story_count': 事件数}
+    """
+    # 调用爬虫（多页并发抓取，超过一页时按页并行请求），相同关键字优先读取缓存
+    from app.crawler import crawl_news
+    from app.cache import get_result_cache
+    started = time.perf_counter()
+    news_list, cache_hit = get_result_cache().get_or_fetch(
+        keyword, max_results,
+        lambda: crawl_news(keyword, max_results, multi_page=True)
+    )
+
+    # 新抓取的结果入库（命中缓存时不重复入库）
+    if not cache_hit and news_list:
+        from app.news_store import save_news
+        try:
+            save_news(keyword, news_list, max_results=max_results, trigger=trigger,
+                      user_id=user_id,
+                      duration_ms=int((time.perf_counter() - started) * 1000))
+        except Exception as e:
+            print(f"保存新闻失败: {str(e)}")
+
+    # 相似新闻归并为同一事件（转载的通稿只算一个事件）
+    from app.clustering import get_story_index
+    story_ids = get_story_index().add_many(news_list)
+    news_list = [dict(news, story_id=story_id) for news, story_id in zip(news_list, story_ids)]
+
+    return {
+        'data': news_list,
+        'cache_hit': cache_hit,
+        'story_count': len(set(story_ids))
+    }
+
+
+class JobQueueFull(Exception):
+    """任务队列已满"""
+
+
+class CrawlJobQueue:
+    """
+    后台抓取任务队列
+
+    提交时先写入任务记录再放入有界队列，队列已满时拒绝提交（由调用方返回繁忙提示）。
+    工作线程在首次提交时启动，启动时把上次未执行完的任务重新放回队列。
+    """
+
+    def __init__(self, workers: int = CRAWLER_JOB_WORKERS, queue_size: int = CRAWLER_JOB_QUEUE_SIZE):
+        self.workers = workers
+        self._queue: 'queue.Queue[int]' = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._app: Optional[Flask] = None
+
+    def start(self, app: Flask):
+        """启动工作线程（重复调用无副作用）"""
+        with self._lock:
+            if self._threads:
+                return
+            self._app = app
+
+            # 上次进程退出时正在执行的任务标记为失败，排队中的任务重新入队
+            with app.app_context():
+                CrawlJob.query.filter_by(status='running').update(
+                    {'status': 'failed', 'error': '服务重启，任务中断', 'finished_at': datetime.now()}
+                )
+                db.session.commit()
+                pending = [job_id for (job_id,) in db.session.query(CrawlJob.id)
+                           .filter_by(status='pending').order_by(CrawlJob.id)]
+            for job_id in pending:
+                try:
+                    self._queue.put_nowait(job_id)
+                except queue.Full:
+                    break
+
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f'crawl-job-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, app: Flask, keyword: str, max_results: int, user_id: Optional[int] = None) -> CrawlJob:
+        """
+        提交抓取任务
+
+        Raises:
+            JobQueueFull: 队列已满
+        """
+        self.start(app)
+        if self._queue.full():
+            raise JobQueueFull()
+
+        job = CrawlJob(keyword=keyword, max_results=max_results, user_id=user_id, status='pending')
+        db.session.add(job)
+        db.session.commit()
+
+        try:
+            self._queue.put_nowait(job.id)
+        except queue.Full:
+            job.status = 'failed'
+            job.error = '任务队列已满'
+            job.finished_at = datetime.now()
+            db.session.commit()
+            raise JobQueueFull()
+
+        return job
+
+    def pending_count(self) -> int:
+        """队列中等待执行的任务数"""
+        return self._queue.qsize()
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                with self._app.app_context():
+                    self._run_job(job_id)
+            except Exception as e:
+                print(f"抓取任务执行错误: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job_id: int):
+        job = db.session.get(CrawlJob, job_id)
+        if job is None or job.status != 'pending':
+            return
+
+        job.status = 'running'
+        job.started_at = datetime.now()
+        db.session.commit()
+
+        try:
+            result = run_crawl(job.keyword, job.max_results, user_id=job.user_id, trigger='job')
+            job.result = json.dumps(result['data'], ensure_ascii=False)
+            job.result_count = len(result['data'])
+            job.story_count = result['story_count']
+            job.cache_hit = result['cache_hit']
+            job.status = 'success'
+        except Exception as e:
+            db.session.rollback()
+            job.status = 'failed'
+            job.error = str(e)[:500]
+        job.finished_at = datetime.now()
+        db.session.commit()
+
+
+# 进程内共享的任务队列
+_job_queue: Optional[CrawlJobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> CrawlJobQueue:
+    """获取进程内共享的任务队列（首次调用时创建）"""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = CrawlJobQueue()
+    return _job_queue
+
+
+# 流式抓取名额：流式抓取在请求线程中逐页执行，不经过任务队列，单独限制同时进行的个数
+_stream_slots = threading.BoundedSemaphore(CRAWLER_STREAM_MAX_CONCURRENT)
+
+
+def try_acquire_stream_slot() -> bool:
+    """取得一个流式抓取名额（不等待），名额已满时返回False"""
+    return _stream_slots.acquire(blocking=False)
+
+
+def release_stream_slot():
+    """归还流式抓取名额"""
+    _stream_slots.release()
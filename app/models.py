@@ -4,6 +4,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+import json
 
 db = SQLAlchemy()
 
@@ -95,3 +96,142 @@ class SystemConfig(BaseModel):
             'config_type': self.config_type,
             'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else None
         }
+
+
+class ConfigVersion(db.Model):
+    """系统配置版本（只有一行，每次修改系统配置时加1，其他进程据此判断是否需要重新加载配置）"""
+    __tablename__ = 'config_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0, comment='配置版本号')
+
+
+class CrawlRun(BaseModel):
+    """抓取记录模型（每次抓取一条）"""
+    __tablename__ = 'crawl_runs'
+    
+    keyword = db.Column(db.String(200), nullable=False, index=True, comment='搜索关键字')
+    max_results = db.Column(db.Integer, comment='最大结果数')
+    result_count = db.Column(db.Integer, default=0, comment='抓取到的新闻数')
+    new_count = db.Column(db.Integer, default=0, comment='新入库的新闻数')
+    trigger = db.Column(db.String(50), default='api', comment='触发方式（api/batch/schedule等）')
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), comment='发起用户ID')
+    duration_ms = db.Column(db.Integer, comment='耗时（毫秒）')
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'keyword': self.keyword,
+            'max_results': self.max_results,
+            'result_count': self.result_count,
+            'new_count': self.new_count,
+            'trigger': self.trigger,
+            'user_id': self.user_id,
+            'duration_ms': self.duration_ms,
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None
+        }
+
+
+class NewsItem(BaseModel):
+    """新闻模型（按规范化URL唯一）"""
+    __tablename__ = 'news_items'
+    
+    canonical_url = db.Column(db.String(1000), unique=True, nullable=False, comment='规范化URL')
+    url = db.Column(db.String(1000), nullable=False, comment='原始URL')
+    title = db.Column(db.String(500), nullable=False, comment='标题')
+    summary = db.Column(db.Text, comment='摘要')
+    cover = db.Column(db.String(1000), comment='封面图片')
+    source = db.Column(db.String(100), comment='来源')
+    published_at = db.Column(db.DateTime, index=True, comment='发布时间')
+    keyword = db.Column(db.String(200), index=True, comment='首次抓取的关键字')
+    crawl_run_id = db.Column(db.Integer, db.ForeignKey('crawl_runs.id'), index=True, comment='最近一次抓取记录ID')
+    hit_count = db.Column(db.Integer, default=1, comment='被抓取到的次数')
+    first_seen_at = db.Column(db.DateTime, default=datetime.now, index=True, comment='首次抓取时间')
+    last_seen_at = db.Column(db.DateTime, default=datetime.now, comment='最近抓取时间')
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'summary': self.summary or '',
+            'cover': self.cover or '',
+            'url': self.url,
+            'source': self.source or '',
+            'publish_time': self.published_at.strftime('%Y-%m-%d %H:%M:%S') if self.published_at else '',
+            'keyword': self.keyword,
+            'hit_count': self.hit_count,
+            'first_seen_at': self.first_seen_at.strftime('%Y-%m-%d %H:%M:%S') if self.first_seen_at else None,
+            'last_seen_at': self.last_seen_at.strftime('%Y-%m-%d %H:%M:%S') if self.last_seen_at else None
+        }
+
+
+class CrawlJob(BaseModel):
+    """后台抓取任务模型"""
+    __tablename__ = 'crawl_jobs'
+    
+    keyword = db.Column(db.String(200), nullable=False, comment='搜索关键字')
+    max_results = db.Column(db.Integer, default=10, comment='最大结果数')
+    status = db.Column(db.String(20), default='pending', index=True, comment='状态（pending/running/success/failed）')
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True, comment='提交用户ID')
+    result = db.Column(db.Text, comment='抓取结果（JSON格式）')
+    result_count = db.Column(db.Integer, default=0, comment='结果数')
+    story_count = db.Column(db.Integer, default=0, comment='事件数')
+    cache_hit = db.Column(db.Boolean, default=False, comment='是否命中缓存')
+    error = db.Column(db.String(500), comment='错误信息')
+    started_at = db.Column(db.DateTime, comment='开始时间')
+    finished_at = db.Column(db.DateTime, comment='结束时间')
+    
+    def to_dict(self, with_result=False):
+        data = {
+            'id': self.id,
+            'keyword': self.keyword,
+            'max_results': self.max_results,
+            'status': self.status,
+            'result_count': self.result_count,
+            'story_count': self.story_count,
+            'cache_hit': self.cache_hit,
+            'error': self.error,
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None,
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S') if self.started_at else None,
+            'finished_at': self.finished_at.strftime('%Y-%m-%d %H:%M:%S') if self.finished_at else None
+        }
+        if with_result:
+            data['data'] = json.loads(self.result) if self.result else []
+        return data
+
+class KeywordMonitor(BaseModel):
+    """关键字监控（定时增量抓取）模型"""
+    __tablename__ = 'keyword_monitors'
+    
+    keyword = db.Column(db.String(200), unique=True, nullable=False, comment='监控关键字')
+    interval_minutes = db.Column(db.Integer, default=60, comment='抓取间隔（分钟）')
+    max_results = db.Column(db.Integer, default=50, comment='单次最多抓取条数')
+    status = db.Column(db.Integer, default=1, comment='状态：1-启用，0-停用')
+    high_water_mark = db.Column(db.Text, comment='上次抓取到的最新新闻URL（JSON格式）')
+    next_run_at = db.Column(db.DateTime, index=True, comment='下次抓取时间')
+    last_run_at = db.Column(db.DateTime, comment='上次抓取时间')
+    last_new_count = db.Column(db.Integer, default=0, comment='上次抓取新增条数')
+    last_error = db.Column(db.String(500), comment='上次抓取错误信息')
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), comment='创建用户ID')
+    
+    def get_high_water_mark(self):
+        """获取高水位URL列表"""
+        return json.loads(self.high_water_mark) if self.high_water_mark else []
+    
+    def set_high_water_mark(self, urls):
+        """设置高水位URL列表"""
+        self.high_water_mark = json.dumps(urls, ensure_ascii=False)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'keyword': self.keyword,
+            'interval_minutes': self.interval_minutes,
+            'max_results': self.max_results,
+            'status': self.status,
+            'next_run_at': self.next_run_at.strftime('%Y-%m-%d %H:%M:%S') if self.next_run_at else None,
+            'last_run_at': self.last_run_at.strftime('%Y-%m-%d %H:%M:%S') if self.last_run_at else None,
+            'last_new_count': self.last_new_count,
+            'last_error': self.last_error,
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None
+        }
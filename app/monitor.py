@@ -0,0 +1,171 @@
+"""
+关键字监控 - 定时增量抓取
+
+每个监控关键字保存一个高水位（上次抓取到的最新新闻URL），定时抓取时逐页请求，
+遇到高水位内的新闻即停止翻页，只把新增的新闻入库。稳定状态下每次只需请求第一页。
+所有监控共享一个请求预算（令牌桶），抓取间隔加随机抖动，避免集中请求。
+"""
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from flask import Flask
+from sqlalchemy import update
+
+from app.dedup import canonicalize_url
+from app.models import KeywordMonitor, db
+from app.ratelimit import TokenBucket
+from config import (MONITOR_POLL_INTERVAL, MONITOR_JITTER, MONITOR_PAGES_PER_MINUTE,
+                    MONITOR_HIGH_WATER_SIZE)
+
+
+def jittered_delay(interval_minutes: int, jitter: float = MONITOR_JITTER) -> timedelta:
+    """抓取间隔加上 ±jitter 比例的随机抖动"""
+    seconds = interval_minutes * 60
+    return timedelta(seconds=seconds * random.uniform(1 - jitter, 1 + jitter))
+
+
+def run_monitor(monitor: KeywordMonitor, budget: Optional[TokenBucket] = None) -> Dict:
+    """
+    对一个监控关键字执行一次增量抓取（需要在应用上下文中调用）
+
+    Args:
+        monitor: 监控记录
+        budget: 全局请求预算，每请求一页取一个令牌
+
+    Returns:
+        {'new_count': 新增条数, 'pages': 请求页数}
+    """
+    from app.crawler import get_crawler
+    from app.news_store import save_news
+
+    mark = monitor.get_high_water_mark()
+    seen = set(mark)
+    started = time.perf_counter()
+
+    delta = []
+    pages = 0
+    for _, items in get_crawler().iter_new(
+            monitor.keyword, monitor.max_results,
+            is_seen=lambda news: canonicalize_url(news.get('url', '')) in seen,
+            before_page=budget.acquire if budget is not None else None):
+        pages += 1
+        delta.extend(items)
+
+    if delta:
+        save_news(monitor.keyword, delta, max_results=monitor.max_results, trigger='schedule',
+                  user_id=monitor.user_id,
+                  duration_ms=int((time.perf_counter() - started) * 1000))
+
+        from app.clustering import get_story_index
+        get_story_index().add_many(delta)
+
+        # 新增的新闻排在高水位最前面
+        new_mark = []
+        for url in [canonicalize_url(news.get('url', '')) for news in delta] + mark:
+            if url and url not in new_mark:
+                new_mark.append(url)
+        monitor.set_high_water_mark(new_mark[:MONITOR_HIGH_WATER_SIZE])
+
+    return {'new_count': len(delta), 'pages': pages}
+
+
+class KeywordMonitorScheduler:
+    """
+    关键字监控调度线程
+
+    定期查询到期的监控逐个执行。执行前用条件更新（next_run_at 未被改动才更新）认领监控，
+    多个进程同时运行调度线程时同一监控只会被一个进程执行。
+    """
+
+    def __init__(self, poll_interval: int = MONITOR_POLL_INTERVAL,
+                 pages_per_minute: int = MONITOR_PAGES_PER_MINUTE):
+        self.poll_interval = poll_interval
+        self.budget = TokenBucket(pages_per_minute / 60.0, capacity=max(pages_per_minute // 4, 1))
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._app: Optional[Flask] = None
+
+    def start(self, app: Flask):
+        """启动调度线程（重复调用无副作用）"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._app = app
+            self._thread = threading.Thread(target=self._loop, name='keyword-monitor', daemon=True)
+            self._thread.start()
+
+    def wakeup(self):
+        """立即检查到期监控（例如新增监控或手动触发后）"""
+        self._wakeup.set()
+
+    def _loop(self):
+        while True:
+            try:
+                with self._app.app_context():
+                    self.run_due()
+            except Exception as e:
+                print(f"关键字监控调度错误: {str(e)}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def run_due(self) -> int:
+        """执行所有到期的监控，返回执行个数"""
+        now = datetime.now()
+        due = KeywordMonitor.query.filter(
+            KeywordMonitor.status == 1,
+            KeywordMonitor.next_run_at <= now
+        ).order_by(KeywordMonitor.next_run_at).all()
+
+        count = 0
+        for monitor in due:
+            if self._claim(monitor):
+                self._run(monitor)
+                count += 1
+        return count
+
+    def _claim(self, monitor: KeywordMonitor) -> bool:
+        """认领监控：把下次抓取时间推到下一个周期，更新成功才执行"""
+        next_run_at = datetime.now() + jittered_delay(monitor.interval_minutes)
+        result = db.session.execute(
+            update(KeywordMonitor)
+            .where(KeywordMonitor.id == monitor.id,
+                   KeywordMonitor.next_run_at == monitor.next_run_at)
+            .values(next_run_at=next_run_at)
+        )
+        db.session.commit()
+        if result.rowcount != 1:
+            return False
+        db.session.refresh(monitor)
+        return True
+
+    def _run(self, monitor: KeywordMonitor):
+        try:
+            result = run_monitor(monitor, self.budget)
+            monitor.last_new_count = result['new_count']
+            monitor.last_error = None
+            print(f"关键字监控 [{monitor.keyword}] 请求{result['pages']}页，新增{result['new_count']}条")
+        except Exception as e:
+            db.session.rollback()
+            monitor.last_error = str(e)[:500]
+            print(f"关键字监控 [{monitor.keyword}] 抓取失败: {str(e)}")
+        monitor.last_run_at = datetime.now()
+        db.session.commit()
+
+
+# 进程内共享的调度器
+_scheduler: Optional[KeywordMonitorScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_monitor_scheduler() -> KeywordMonitorScheduler:
+    """获取进程内共享的监控调度器（首次调用时创建）"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = KeywordMonitorScheduler()
+    return _scheduler
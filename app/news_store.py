@@ -0,0 +1,184 @@
+"""
+新闻存储 - 抓取结果批量入库与查询
+"""
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert
+
+from app.dedup import canonicalize_url
+from app.models import NewsItem, CrawlRun, db
+from app.search_index import index_news
+from app.stats import invalidate_dashboard_stats
+
+# 每条 INSERT 语句包含的行数（SQLite 单条语句的参数个数有限制）
+UPSERT_BATCH_SIZE = 200
+
+
+def ensure_news_columns():
+    """为旧版本创建的 news_items 表补充后来新增的列（db.create_all 不会修改已存在的表）"""
+    columns = {row[1] for row in db.session.execute(text('PRAGMA table_info(news_items)'))}
+    if 'published_at' not in columns:
+        db.session.execute(text('ALTER TABLE news_items ADD COLUMN published_at DATETIME'))
+        db.session.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_news_items_published_at ON news_items (published_at)'
+        ))
+        db.session.commit()
+
+
+def _parse_publish_time(value: Optional[str]) -> Optional[datetime]:
+    """解析爬虫返回的发布时间字符串"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+
+def save_news(keyword: str, news_list: List[Dict], max_results: Optional[int] = None,
+              trigger: str = 'api', user_id: Optional[int] = None,
+              duration_ms: Optional[int] = None, seen_at: Optional[datetime] = None,
+              touch: bool = True) -> CrawlRun:
+    """
+    保存一次抓取的结果
+
+    整页结果在一个事务内分批执行 INSERT ... ON CONFLICT(canonical_url) DO UPDATE：
+    新新闻直接插入，已存在的新闻更新摘要等字段、最近抓取时间和抓取次数，
+    并在同一事务内更新全文索引。
+
+    Args:
+        keyword: 搜索关键字
+        news_list: 爬虫返回的新闻列表
+        max_results: 本次抓取的最大结果数
+        trigger: 触发方式（api/batch/schedule等）
+        user_id: 发起用户ID
+        duration_ms: 抓取耗时（毫秒）
+        seen_at: 新闻的抓取时间（从存档重新解析时为页面的抓取时间），默认为当前时间
+        touch: 是否更新已存在新闻的抓取次数和最近抓取时间（重新解析时不更新）
+
+    Returns:
+        本次抓取记录
+    """
+    now = datetime.now()
+    seen_at = seen_at or now
+
+    run = CrawlRun(
+        keyword=keyword,
+        max_results=max_results,
+        result_count=len(news_list),
+        trigger=trigger,
+        user_id=user_id,
+        duration_ms=duration_ms
+    )
+
+    try:
+        db.session.add(run)
+        db.session.flush()
+
+        rows = {}
+        for news in news_list:
+            canonical_url = canonicalize_url(news.get('url', ''))
+            if not canonical_url or not news.get('title') or canonical_url in rows:
+                continue
+            rows[canonical_url] = {
+                'canonical_url': canonical_url,
+                'url': news['url'],
+                'title': news['title'],
+                'summary': news.get('summary', ''),
+                'cover': news.get('cover', ''),
+                'source': news.get('source', ''),
+                'published_at': _parse_publish_time(news.get('publish_time')),
+                'keyword': keyword,
+                'crawl_run_id': run.id,
+                'hit_count': 1,
+                'first_seen_at': seen_at,
+                'last_seen_at': seen_at,
+                'created_at': now,
+                'updated_at': now,
+            }
+
+        # 统计新入库的条数：先批量查出已存在的URL
+        existing = set()
+        urls = list(rows)
+        for start in range(0, len(urls), UPSERT_BATCH_SIZE):
+            batch = urls[start:start + UPSERT_BATCH_SIZE]
+            existing.update(
+                url for (url,) in db.session.query(NewsItem.canonical_url)
+                .filter(NewsItem.canonical_url.in_(batch))
+            )
+
+        values = list(rows.values())
+        for start in range(0, len(values), UPSERT_BATCH_SIZE):
+            stmt = insert(NewsItem).values(values[start:start + UPSERT_BATCH_SIZE])
+            excluded = stmt.excluded
+            updates = {
+                'title': excluded.title,
+                # 新抓取的字段为空时保留原值
+                'summary': db.func.coalesce(db.func.nullif(excluded.summary, ''), NewsItem.summary),
+                'cover': db.func.coalesce(db.func.nullif(excluded.cover, ''), NewsItem.cover),
+                'source': db.func.coalesce(db.func.nullif(excluded.source, ''), NewsItem.source),
+                'published_at': db.func.coalesce(excluded.published_at, NewsItem.published_at),
+                'updated_at': excluded.updated_at,
+            }
+            if touch:
+                updates.update({
+                    'crawl_run_id': excluded.crawl_run_id,
+                    'hit_count': NewsItem.hit_count + 1,
+                    'last_seen_at': excluded.last_seen_at,
+                })
+            stmt = stmt.on_conflict_do_update(index_elements=['canonical_url'], set_=updates)
+            db.session.execute(stmt)
+
+        # 同一事务内同步全文索引
+        news_ids = []
+        for start in range(0, len(urls), UPSERT_BATCH_SIZE):
+            batch = urls[start:start + UPSERT_BATCH_SIZE]
+            news_ids.extend(
+                news_id for (news_id,) in db.session.query(NewsItem.id)
+                .filter(NewsItem.canonical_url.in_(batch))
+            )
+        index_news(news_ids)
+
+        run.new_count = len(rows) - len(existing)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    invalidate_dashboard_stats()
+    return run
+
+
+def query_news(keyword: Optional[str] = None, page: int = 1, per_page: int = 20,
+               since: Optional[datetime] = None, until: Optional[datetime] = None,
+               crawl_run_id: Optional[int] = None) -> Tuple[List[NewsItem], int]:
+    """
+    查询已入库的新闻（按首次抓取时间倒序）
+
+    Args:
+        keyword: 抓取关键字
+        page: 页码（从1开始）
+        per_page: 每页条数
+        since: 首次抓取时间下限
+        until: 首次抓取时间上限
+        crawl_run_id: 抓取记录ID
+
+    Returns:
+        (新闻列表, 总条数)
+    """
+    query = NewsItem.query
+    if keyword:
+        query = query.filter(NewsItem.keyword == keyword)
+    if since:
+        query = query.filter(NewsItem.first_seen_at >= since)
+    if until:
+        query = query.filter(NewsItem.first_seen_at < until)
+    if crawl_run_id:
+        query = query.filter(NewsItem.crawl_run_id == crawl_run_id)
+
+    total = query.order_by(None).count()
+    items = query.order_by(NewsItem.first_seen_at.desc(), NewsItem.id.desc()) \
+        .offset((page - 1) * per_page).limit(per_page).all()
+    return items, total
@@ -0,0 +1,118 @@
+"""
+角色权限 - 解析并编译 Role.permissions（JSON格式的权限列表）
+
+权限写法：
+    "*"            全部权限
+    "view_report"  单个权限
+    "news:*"       前缀通配，匹配 news:export、news:delete 等
+
+每个角色的权限列表只解析一次，编译为精确匹配集合和前缀集合，按（角色ID, 版本）缓存；
+角色被修改后版本（updated_at）变化，下次检查时自动重新编译。
+"""
+import json
+import threading
+from typing import List, Dict, Iterable, Optional, Tuple
+
+# 管理员权限（用户、角色、系统设置、关键字监控等管理功能），"*" 包含该权限
+ADMIN_PERMISSION = 'admin'
+# 查看控制台（后台首页和首页统计）
+VIEW_DASHBOARD_PERMISSION = 'view_dashboard'
+
+
+def parse_permissions(raw) -> List[str]:
+    """
+    解析权限列表
+
+    Args:
+        raw: JSON字符串（'["view_report"]'）或字符串列表，为空时视为没有权限
+
+    Raises:
+        ValueError: 格式不正确
+    """
+    if raw is None or raw == '':
+        return []
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            raise ValueError('权限列表不是有效的JSON')
+    if not isinstance(raw, list) or not all(isinstance(item, str) for item in raw):
+        raise ValueError('权限列表必须是字符串数组')
+    return [item.strip() for item in raw if item.strip()]
+
+
+class CompiledPermissions:
+    """
+    编译后的权限列表
+
+    精确权限放入 frozenset；通配权限去掉末尾的 * 后放入前缀集合，并记录出现过的前缀长度，
+    检查时只需按这几个长度截取权限名查集合，与权限条数无关。
+    """
+
+    __slots__ = ('allow_all', 'exact', 'prefixes', 'prefix_lengths')
+
+    def __init__(self, patterns: Iterable[str]):
+        exact = set()
+        prefixes = set()
+        allow_all = False
+        for pattern in patterns:
+            if pattern == '*':
+                allow_all = True
+            elif pattern.endswith('*'):
+                prefixes.add(pattern[:-1])
+            else:
+                exact.add(pattern)
+        self.allow_all = allow_all
+        self.exact = frozenset(exact)
+        self.prefixes = frozenset(prefixes)
+        self.prefix_lengths = tuple(sorted({len(prefix) for prefix in prefixes}))
+
+    def allows(self, permission: str) -> bool:
+        """是否拥有指定权限"""
+        if self.allow_all or permission in self.exact:
+            return True
+        for length in self.prefix_lengths:
+            if length > len(permission):
+                break
+            if permission[:length] in self.prefixes:
+                return True
+        return False
+
+
+# 没有任何权限（角色不存在、已停用或权限列表格式错误时使用）
+NO_PERMISSIONS = CompiledPermissions(())
+
+# 角色ID -> (版本, 原始权限文本, 编译结果)
+_compiled: Dict[int, Tuple[Optional[str], Optional[str], CompiledPermissions]] = {}
+_compiled_lock = threading.Lock()
+
+
+def get_role_permissions(role_id: int, version: Optional[str], raw: Optional[str]) -> CompiledPermissions:
+    """
+    获取角色编译后的权限（版本和权限文本都未变化时直接返回缓存）
+
+    Args:
+        role_id: 角色ID
+        version: 角色版本（updated_at）
+        raw: Role.permissions 的原始文本
+    """
+    with _compiled_lock:
+        entry = _compiled.get(role_id)
+    if entry is not None and entry[0] == version and entry[1] == raw:
+        return entry[2]
+
+    try:
+        compiled = CompiledPermissions(parse_permissions(raw))
+    except ValueError as e:
+        print(f"角色 {role_id} 的权限列表无效: {str(e)}")
+        compiled = NO_PERMISSIONS
+
+    with _compiled_lock:
+        _compiled[role_id] = (version, raw, compiled)
+    return compiled
+
+
+def invalidate_role_permissions(role_id: int):
+    """删除角色编译后的权限缓存"""
+    with _compiled_lock:
+        _compiled.pop(role_id, None)
@@ -0,0 +1,228 @@
+"""
+限流工具 - 令牌桶、自适应限流器和熔断器
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+from config import (CRAWLER_RATE_INITIAL, CRAWLER_RATE_MIN, CRAWLER_RATE_MAX, CRAWLER_RATE_INCREASE,
+                    CRAWLER_RATE_DECREASE, CRAWLER_SLOW_RESPONSE, CRAWLER_BREAKER_FAILURES,
+                    CRAWLER_BREAKER_RECOVERY)
+
+
+class TokenBucket:
+    """
+    令牌桶（线程安全）
+
+    以 rate 个/秒的速度补充令牌，最多积累 capacity 个。acquire 在令牌不足时阻塞等待。
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        尝试取出令牌
+
+        Returns:
+            0 表示已取出；否则为还需等待的秒数（未取出）
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        取出令牌，不足时阻塞等待
+
+        Returns:
+            是否在timeout内取到令牌
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    自适应令牌桶（加性增、乘性减）
+
+    请求正常时每次把速率提高 increase，直到 max_rate；遇到限流（429、验证码页面）时
+    速率乘以 decrease_factor，并暂停发放令牌一段时间（优先使用 Retry-After）；
+    响应变慢时小幅降速。主机正常时不再有固定的等待时间。
+    """
+
+    def __init__(self, rate: float, min_rate: float, max_rate: float, increase: float = 0.1,
+                 decrease_factor: float = 0.5, slow_threshold: float = 5.0):
+        super().__init__(rate, capacity=max(rate, 1.0))
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.slow_threshold = slow_threshold
+        self._paused_until = 0.0
+
+    def _set_rate(self, rate: float):
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.capacity = max(self.rate, 1.0)
+        self._tokens = min(self._tokens, self.capacity)
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+        return super().try_acquire(tokens)
+
+    def record_success(self, latency: Optional[float] = None):
+        """请求成功：响应慢时降速，否则加性提速"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if latency is not None and latency > self.slow_threshold:
+                self._set_rate(self.rate * 0.8)
+            else:
+                self._set_rate(self.rate + self.increase)
+
+    def record_throttle(self, retry_after: Optional[float] = None):
+        """被限流：乘性降速，并暂停发放令牌"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._set_rate(self.rate * self.decrease_factor)
+            self._tokens = 0.0
+            pause = retry_after if retry_after else 1.0 / self.rate
+            self._paused_until = max(self._paused_until, now + pause)
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    连续失败 failure_threshold 次后断开（open），recovery_timeout 秒内直接拒绝请求；
+    之后进入半开（half_open）状态只放行一个探测请求，成功则恢复，失败则重新断开。
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """是否允许发送请求（半开状态下只放行一个探测请求）"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self):
+        """请求被取消（未得到结果）时释放半开状态的探测名额"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+# 每个主机一个自适应限流器、每个URL一个熔断器，所有爬虫实例（包括异步爬虫）共享
+_host_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_host_limiter(host: str) -> AdaptiveRateLimiter:
+    """获取主机对应的自适应限流器（首次访问时创建）"""
+    with _registry_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(
+                CRAWLER_RATE_INITIAL, CRAWLER_RATE_MIN, CRAWLER_RATE_MAX,
+                increase=CRAWLER_RATE_INCREASE, decrease_factor=CRAWLER_RATE_DECREASE,
+                slow_threshold=CRAWLER_SLOW_RESPONSE
+            )
+            _host_limiters[host] = limiter
+        return limiter
+
+
+def get_circuit_breaker(key: str) -> CircuitBreaker:
+    """获取URL对应的熔断器（首次访问时创建）"""
+    with _registry_lock:
+        breaker = _circuit_breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(CRAWLER_BREAKER_FAILURES, CRAWLER_BREAKER_RECOVERY)
+            _circuit_breakers[key] = breaker
+        return breaker
+
+
+def set_host_limiter(host: str, limiter: AdaptiveRateLimiter):
+    """为主机指定限流器（例如压测本地模拟服务时放开速率上限）"""
+    with _registry_lock:
+        _host_limiters[host] = limiter
+
+
+def reset_registries():
+    """清空所有主机限流器和熔断器（压测时每轮重新开始）"""
+    with _registry_lock:
+        _host_limiters.clear()
+        _circuit_breakers.clear()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头（只支持秒数格式）"""
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
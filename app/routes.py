@@ -2,9 +2,13 @@
 路由定义
 """
 from flask import Blueprint, render_template, jsonify, request, redirect, url_for, session
+import json
 from datetime import datetime
-from app.models import User, Role, SystemConfig, db
-from app.auth import login_required, admin_required, get_current_user
+from app.models import User, Role, db
+from app.auth import (login_required, admin_required, permission_required, get_current_user, is_admin,
+                      invalidate_user, invalidate_role)
+from app.permissions import parse_permissions
+from app.stats import invalidate_dashboard_stats
 
 bp = Blueprint('main', __name__)
 
@@ -66,11 +70,8 @@ def login():
     if 'user_id' in session:
         return redirect(url_for('main.dashboard'))
     
-    # 获取系统配置
-    config = SystemConfig.query.filter_by(key='app_name').first()
-    app_name = config.value if config else '政企智能舆情分析报告生成智能体应用系统'
-    
-    return render_template('login.html', app_name=app_name)
+    # 应用名称等系统配置由上下文处理器从内存快照注入模板
+    return render_template('login.html')
 
 @bp.route('/logout')
 def logout():
@@ -79,14 +80,18 @@ def logout():
     return redirect(url_for('main.login'))
 
 @bp.route('/dashboard')
-@login_required
+@permission_required('view_dashboard')
 def dashboard():
     """后台管理首页"""
     user = get_current_user()
-    config = SystemConfig.query.filter_by(key='app_name').first()
-    app_name = config.value if config else '政企智能舆情分析报告生成智能体应用系统'
-    
-    return render_template('dashboard.html', user=user, app_name=app_name)
+    return render_template('dashboard.html', user=user)
+
+@bp.route('/api/dashboard/stats', methods=['GET'])
+@permission_required('view_dashboard')
+def api_dashboard_stats():
+    """后台首页统计（用户、抓取、新闻数量，SQL聚合并短时间缓存）"""
+    from app.stats import get_dashboard_stats
+    return jsonify({'success': True, 'data': get_dashboard_stats()})
 
 # ==================== 用户管理 ====================
 
@@ -96,14 +101,92 @@ def admin_users():
     """用户管理页面"""
     return render_template('admin/users.html')
 
+def _parse_bool_arg(name):
+    """解析布尔查询参数（1/0、true/false），未传时返回None"""
+    value = request.args.get(name, '').strip().lower()
+    if value in ('1', 'true'):
+        return True
+    if value in ('0', 'false'):
+        return False
+    return None
+
+def _paginate(query, count_query, sort_columns):
+    """
+    列表接口的分页和排序
+
+    查询参数：
+        page, limit: 偏移分页（limit 最大100）
+        sort, order: 排序字段（sort_columns 中的键）和方向（asc/desc）
+        after: 按id排序时的游标（上一页最后一行的id），传入时忽略page，不随页码增大而变慢
+
+    Returns:
+        (本页记录, 总数, 下一页游标（按id排序且可能还有下一页时为本页最后一行的id，否则为None）)
+    """
+    page = max(request.args.get('page', 1, type=int), 1)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    sort = request.args.get('sort', 'id')
+    if sort not in sort_columns:
+        sort = 'id'
+    desc = request.args.get('order', 'asc').lower() == 'desc'
+    id_column = sort_columns['id']
+    
+    # 总数用 COUNT(*) 统计，不加载记录
+    total = count_query.scalar()
+    
+    column = sort_columns[sort]
+    order_by = [column.desc() if desc else column.asc()]
+    if sort != 'id':
+        # 排序字段有重复值时再按id排序，保证翻页结果稳定
+        order_by.append(id_column.desc() if desc else id_column.asc())
+    query = query.order_by(*order_by)
+    
+    after = request.args.get('after', type=int)
+    if sort == 'id' and after is not None:
+        query = query.filter(id_column < after if desc else id_column > after)
+    else:
+        query = query.offset((page - 1) * limit)
+    rows = query.limit(limit).all()
+    
+    next_cursor = rows[-1].id if sort == 'id' and len(rows) == limit else None
+    return rows, total, next_cursor
+
 @bp.route('/api/users', methods=['GET'])
 @admin_required
 def api_get_users():
-    """获取用户列表"""
-    users = User.query.all()
+    """
+    获取用户列表（分页）
+    
+    查询参数：username（模糊匹配用户名或真实姓名）、role_id、is_active，
+    以及 page/limit/sort/order/after（见 _paginate），sort 可选 id、username、created_at、last_login
+    """
+    from sqlalchemy import func, or_
+    from sqlalchemy.orm import joinedload
+    
+    filters = []
+    username = request.args.get('username', '').strip()
+    if username:
+        # autoescape：用户输入中的 % 和 _ 按字面匹配
+        filters.append(or_(User.username.contains(username, autoescape=True),
+                           User.real_name.contains(username, autoescape=True)))
+    role_id = request.args.get('role_id', type=int)
+    if role_id:
+        filters.append(User.role_id == role_id)
+    is_active = _parse_bool_arg('is_active')
+    if is_active is not None:
+        filters.append(User.is_active == is_active)
+    
+    # 角色随用户一起查询（JOIN），避免逐行加载
+    users, total, next_cursor = _paginate(
+        User.query.options(joinedload(User.role)).filter(*filters),
+        db.session.query(func.count(User.id)).filter(*filters),
+        {'id': User.id, 'username': User.username, 'created_at': User.created_at,
+         'last_login': User.last_login}
+    )
     return jsonify({
         'success': True,
-        'data': [user.to_dict() for user in users]
+        'data': [user.to_dict() for user in users],
+        'count': total,
+        'next_cursor': next_cursor
     })
 
 @bp.route('/api/users', methods=['POST'])
@@ -140,6 +223,7 @@ def api_create_user():
     try:
         db.session.add(user)
         db.session.commit()
+        invalidate_dashboard_stats()
         return jsonify({'success': True, 'message': '创建成功', 'data': user.to_dict()})
     except Exception as e:
         db.session.rollback()
@@ -175,6 +259,8 @@ def api_update_user(user_id):
     
     try:
         db.session.commit()
+        invalidate_user(user_id)
+        invalidate_dashboard_stats()
         return jsonify({'success': True, 'message': '更新成功', 'data': user.to_dict()})
     except Exception as e:
         db.session.rollback()
@@ -193,6 +279,8 @@ def api_delete_user(user_id):
     try:
         db.session.delete(user)
         db.session.commit()
+        invalidate_user(user_id)
+        invalidate_dashboard_stats()
         return jsonify({'success': True, 'message': '删除成功'})
     except Exception as e:
         db.session.rollback()
@@ -209,13 +297,42 @@ def admin_roles():
 @bp.route('/api/roles', methods=['GET'])
 @admin_required
 def api_get_roles():
-    """获取角色列表"""
-    roles = Role.query.all()
+    """
+    获取角色列表（分页）
+    
+    查询参数：name（模糊匹配角色名称或代码）、is_active，
+    以及 page/limit/sort/order/after（见 _paginate），sort 可选 id、name、code、created_at
+    """
+    from sqlalchemy import func, or_
+    
+    filters = []
+    name = request.args.get('name', '').strip()
+    if name:
+        filters.append(or_(Role.name.contains(name, autoescape=True),
+                           Role.code.contains(name, autoescape=True)))
+    is_active = _parse_bool_arg('is_active')
+    if is_active is not None:
+        filters.append(Role.is_active == is_active)
+    
+    roles, total, next_cursor = _paginate(
+        Role.query.filter(*filters),
+        db.session.query(func.count(Role.id)).filter(*filters),
+        {'id': Role.id, 'name': Role.name, 'code': Role.code, 'created_at': Role.created_at}
+    )
     return jsonify({
         'success': True,
-        'data': [role.to_dict() for role in roles]
+        'data': [role.to_dict() for role in roles],
+        'count': total,
+        'next_cursor': next_cursor
     })
 
+@bp.route('/api/roles/options', methods=['GET'])
+@admin_required
+def api_get_role_options():
+    """全部角色的ID和名称（不分页，用于下拉框）"""
+    rows = db.session.query(Role.id, Role.name).order_by(Role.name).all()
+    return jsonify({'success': True, 'data': [{'id': role_id, 'name': name} for role_id, name in rows]})
+
 @bp.route('/api/roles', methods=['POST'])
 @admin_required
 def api_create_role():
@@ -231,11 +348,16 @@ def api_create_role():
     if Role.query.filter_by(code=code).first():
         return jsonify({'success': False, 'message': '角色代码已存在'})
     
+    try:
+        permissions = json.dumps(parse_permissions(data.get('permissions', '[]')), ensure_ascii=False)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)})
+    
     role = Role(
         name=name,
         code=code,
         description=description,
-        permissions=data.get('permissions', '[]'),
+        permissions=permissions,
         is_active=True
     )
     
@@ -259,13 +381,20 @@ def api_update_role(role_id):
             return jsonify({'success': False, 'message': '角色代码已存在'})
         role.code = data['code']
     
+    if 'permissions' in data:
+        try:
+            role.permissions = json.dumps(parse_permissions(data['permissions']), ensure_ascii=False)
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)})
+    
     role.name = data.get('name', role.name)
     role.description = data.get('description', role.description)
-    role.permissions = data.get('permissions', role.permissions)
     role.is_active = data.get('is_active', role.is_active)
     
     try:
         db.session.commit()
+        invalidate_role(role_id)
+        invalidate_dashboard_stats()
         return jsonify({'success': True, 'message': '更新成功', 'data': role.to_dict()})
     except Exception as e:
         db.session.rollback()
@@ -277,13 +406,14 @@ def api_delete_role(role_id):
     """删除角色"""
     role = Role.query.get_or_404(role_id)
     
-    # 检查是否有用户使用该角色
-    if role.users:
+    # 检查是否有用户使用该角色（只查一行，不加载该角色的全部用户）
+    if db.session.query(User.id).filter(User.role_id == role.id).first() is not None:
         return jsonify({'success': False, 'message': '该角色下还有用户，无法删除'})
     
     try:
         db.session.delete(role)
         db.session.commit()
+        invalidate_role(role_id)
         return jsonify({'success': True, 'message': '删除成功'})
     except Exception as e:
         db.session.rollback()
@@ -301,32 +431,25 @@ def admin_settings():
 @admin_required
 def api_get_settings():
     """获取系统设置"""
-    settings = SystemConfig.query.all()
+    from app.system_config import get_system_config
     result = {}
-    for setting in settings:
-        result[setting.key] = {
-            'value': setting.value,
-            'description': setting.description,
-            'config_type': setting.config_type
+    for key, entry in get_system_config().snapshot().entries.items():
+        result[key] = {
+            'value': entry.value,
+            'description': entry.description,
+            'config_type': entry.config_type
         }
     return jsonify({'success': True, 'data': result})
 
 @bp.route('/api/settings', methods=['PUT'])
 @admin_required
 def api_update_settings():
-    """更新系统设置"""
+    """更新系统设置（一条语句批量写入）"""
+    from app.system_config import get_system_config
     data = request.get_json()
     
-    for key, value in data.items():
-        setting = SystemConfig.query.filter_by(key=key).first()
-        if setting:
-            setting.value = value
-        else:
-            setting = SystemConfig(key=key, value=value, config_type='text')
-            db.session.add(setting)
-    
     try:
-        db.session.commit()
+        get_system_config().update(data)
         return jsonify({'success': True, 'message': '更新成功'})
     except Exception as e:
         db.session.rollback()
@@ -348,7 +471,6 @@ def api_current_user():
 def api_upload_logo():
     """上传LOGO"""
     from werkzeug.utils import secure_filename
-    import os
     from pathlib import Path
     
     if 'file' not in request.files:
@@ -372,14 +494,9 @@ def api_upload_logo():
     file.save(str(filepath))
     
     # 保存到系统配置
+    from app.system_config import get_system_config
     logo_url = f'/static/uploads/{filename}'
-    setting = SystemConfig.query.filter_by(key='logo_url').first()
-    if setting:
-        setting.value = logo_url
-    else:
-        setting = SystemConfig(key='logo_url', value=logo_url, config_type='image')
-        db.session.add(setting)
-    db.session.commit()
+    get_system_config().update({'logo_url': logo_url}, config_type='image')
     
     return jsonify({'success': True, 'url': logo_url, 'message': '上传成功'})
 
@@ -409,15 +526,18 @@ def api_crawler_search():
         # 限制最大结果数
         max_results = min(int(max_results), 50)
         
-        # 调用爬虫
-        from app.crawler import crawl_news
-        news_list = crawl_news(keyword, max_results)
+        # 同步抓取（页面使用后台任务接口 /api/crawler/jobs）
+        from app.jobs import run_crawl
+        result = run_crawl(keyword, max_results, user_id=session.get('user_id'), trigger='api')
+        news_list = result['data']
         
         return jsonify({
             'success': True,
             'message': f'成功抓取 {len(news_list)} 条数据',
             'data': news_list,
-            'count': len(news_list)
+            'count': len(news_list),
+            'story_count': result['story_count'],
+            'cache_hit': result['cache_hit']
         })
         
     except Exception as e:
@@ -426,6 +546,326 @@ def api_crawler_search():
             'message': f'抓取失败: {str(e)}'
         })
 
+@bp.route('/api/crawler/stream', methods=['GET'])
+@login_required
+def api_crawler_stream():
+    """
+    流式抓取接口：每解析出一条新闻立即推送
+    
+    默认使用 Server-Sent Events（text/event-stream），format=ndjson 时每行一个JSON。
+    事件类型：item（新闻）、progress（每页完成）、done（结束）、error（出错）
+    同时进行的流式抓取数超过 CRAWLER_STREAM_MAX_CONCURRENT 时返回429，前端改为提交后台任务。
+    """
+    from flask import Response, stream_with_context
+    from app.cache import get_result_cache
+    from app.clustering import get_story_index
+    from app.crawler import get_crawler
+    from app.jobs import try_acquire_stream_slot, release_stream_slot
+    
+    keyword = request.args.get('keyword', '').strip()
+    if not keyword:
+        return jsonify({'success': False, 'message': '请输入搜索关键字'})
+    # 限制最大结果数
+    max_results = min(max(request.args.get('max_results', 10, type=int), 1), 50)
+    ndjson = request.args.get('format') == 'ndjson'
+    user_id = session.get('user_id')
+    
+    def encode(event, data):
+        if ndjson:
+            return json.dumps({'event': event, 'data': data}, ensure_ascii=False) + '\n'
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    
+    def generate():
+        started = datetime.now()
+        cache = get_result_cache()
+        story_index = get_story_index()
+        
+        # 命中缓存时直接推送缓存结果
+        cached = cache.get(keyword, max_results)
+        if cached is not None:
+            story_ids = set()
+            for news in cached:
+                story_id = story_index.add(news)
+                story_ids.add(story_id)
+                yield encode('item', dict(news, story_id=story_id))
+            yield encode('done', {'count': len(cached), 'story_count': len(story_ids), 'cache_hit': True})
+            return
+        
+        news_list = []
+        story_ids = set()
+        try:
+            for page, page_items in get_crawler().iter_pages(keyword, max_results):
+                for news in page_items:
+                    news_list.append(news)
+                    story_id = story_index.add(news)
+                    story_ids.add(story_id)
+                    yield encode('item', dict(news, story_id=story_id))
+                yield encode('progress', {'page': page + 1, 'count': len(news_list)})
+        except Exception as e:
+            yield encode('error', {'message': f'抓取失败: {str(e)}'})
+            return
+        
+        # 全部推送完成后写入缓存并入库
+        if news_list:
+            cache.set(keyword, max_results, news_list)
+            from app.news_store import save_news
+            try:
+                save_news(keyword, news_list, max_results=max_results, trigger='stream', user_id=user_id,
+                          duration_ms=int((datetime.now() - started).total_seconds() * 1000))
+            except Exception as e:
+                print(f"保存新闻失败: {str(e)}")
+        
+        yield encode('done', {'count': len(news_list), 'story_count': len(story_ids), 'cache_hit': False})
+    
+    if not try_acquire_stream_slot():
+        return jsonify({'success': False, 'message': '抓取任务繁忙，请稍后再试'}), 429
+    
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson' if ndjson else 'text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # 响应结束或客户端断开时归还名额
+    response.call_on_close(release_stream_slot)
+    return response
+
+@bp.route('/api/crawler/jobs', methods=['POST'])
+@login_required
+def api_submit_crawl_job():
+    """提交后台抓取任务，立即返回任务ID"""
+    from flask import current_app
+    from app.jobs import get_job_queue, JobQueueFull
+    
+    data = request.get_json() or {}
+    keyword = data.get('keyword', '').strip()
+    if not keyword:
+        return jsonify({'success': False, 'message': '请输入搜索关键字'})
+    
+    try:
+        # 限制最大结果数
+        max_results = min(int(data.get('max_results', 10)), 50)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': '结果数量格式错误'})
+    
+    try:
+        job = get_job_queue().submit(current_app._get_current_object(), keyword, max_results,
+                                     user_id=session.get('user_id'))
+    except JobQueueFull:
+        return jsonify({'success': False, 'message': '抓取任务繁忙，请稍后再试'}), 429
+    
+    return jsonify({'success': True, 'message': '任务已提交', 'data': job.to_dict()})
+
+def _get_own_job(job_id):
+    """获取任务（普通用户只能查看自己提交的任务）"""
+    from app.models import CrawlJob
+    job = CrawlJob.query.get_or_404(job_id)
+    if job.user_id != session.get('user_id') and not is_admin():
+        return None
+    return job
+
+@bp.route('/api/crawler/jobs/<int:job_id>', methods=['GET'])
+@login_required
+def api_get_crawl_job(job_id):
+    """查询抓取任务状态（任务完成后附带结果）"""
+    job = _get_own_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': '权限不足'}), 403
+    return jsonify({'success': True, 'data': job.to_dict(with_result=job.status == 'success')})
+
+@bp.route('/api/crawler/jobs/<int:job_id>/result', methods=['GET'])
+@login_required
+def api_get_crawl_job_result(job_id):
+    """获取抓取任务结果"""
+    job = _get_own_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': '权限不足'}), 403
+    if job.status != 'success':
+        return jsonify({'success': False, 'message': job.error or '任务尚未完成', 'status': job.status})
+    
+    result = job.to_dict(with_result=True)
+    return jsonify({
+        'success': True,
+        'message': f'成功抓取 {job.result_count} 条数据',
+        'data': result['data'],
+        'count': job.result_count,
+        'story_count': job.story_count,
+        'cache_hit': job.cache_hit
+    })
+
+@bp.route('/api/news', methods=['GET'])
+@permission_required('view_report')
+def api_get_news():
+    """查询已入库的新闻"""
+    from app.news_store import query_news
+    
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        since = request.args.get('since')
+        until = request.args.get('until')
+        since = datetime.strptime(since, '%Y-%m-%d') if since else None
+        until = datetime.strptime(until, '%Y-%m-%d') if until else None
+        crawl_run_id = request.args.get('crawl_run_id', type=int)
+    except ValueError:
+        return jsonify({'success': False, 'message': '参数格式错误'})
+    
+    items, total = query_news(
+        keyword=request.args.get('keyword', '').strip() or None,
+        page=page,
+        per_page=limit,
+        since=since,
+        until=until,
+        crawl_run_id=crawl_run_id
+    )
+    return jsonify({
+        'success': True,
+        'data': [item.to_dict() for item in items],
+        'count': total
+    })
+
+@bp.route('/api/news/search', methods=['GET'])
+@permission_required('view_report')
+def api_search_news():
+    """全文检索已入库的新闻"""
+    from app.search_index import search_news
+    
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'message': '请输入检索关键字'})
+    
+    page = max(request.args.get('page', 1, type=int), 1)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    
+    results, total = search_news(query, page=page, per_page=limit)
+    return jsonify({
+        'success': True,
+        'data': results,
+        'count': total
+    })
+
+@bp.route('/api/crawler/runs', methods=['GET'])
+@permission_required('view_report')
+def api_get_crawl_runs():
+    """查询抓取记录"""
+    from app.models import CrawlRun
+    
+    page = max(request.args.get('page', 1, type=int), 1)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    
+    query = CrawlRun.query
+    keyword = request.args.get('keyword', '').strip()
+    if keyword:
+        query = query.filter(CrawlRun.keyword == keyword)
+    
+    total = query.count()
+    runs = query.order_by(CrawlRun.id.desc()).offset((page - 1) * limit).limit(limit).all()
+    return jsonify({
+        'success': True,
+        'data': [run.to_dict() for run in runs],
+        'count': total
+    })
+
+@bp.route('/api/monitors', methods=['GET'])
+@admin_required
+def api_get_monitors():
+    """获取关键字监控列表"""
+    from app.models import KeywordMonitor
+    monitors = KeywordMonitor.query.order_by(KeywordMonitor.id).all()
+    return jsonify({
+        'success': True,
+        'data': [monitor.to_dict() for monitor in monitors],
+        'count': len(monitors)
+    })
+
+def _parse_monitor_fields(data, monitor):
+    """校验并设置监控的抓取间隔和最大条数，返回错误信息"""
+    try:
+        if 'interval_minutes' in data:
+            monitor.interval_minutes = max(int(data['interval_minutes']), 5)
+        if 'max_results' in data:
+            monitor.max_results = min(max(int(data['max_results']), 1), 100)
+        if 'status' in data:
+            monitor.status = 1 if int(data['status']) else 0
+    except (TypeError, ValueError):
+        return '参数格式错误'
+    return None
+
+@bp.route('/api/monitors', methods=['POST'])
+@admin_required
+def api_create_monitor():
+    """创建关键字监控"""
+    from app.models import KeywordMonitor
+    from app.monitor import get_monitor_scheduler
+    
+    data = request.get_json() or {}
+    keyword = data.get('keyword', '').strip()
+    if not keyword:
+        return jsonify({'success': False, 'message': '请输入监控关键字'})
+    
+    if KeywordMonitor.query.filter_by(keyword=keyword).first():
+        return jsonify({'success': False, 'message': '该关键字已在监控中'})
+    
+    monitor = KeywordMonitor(keyword=keyword, user_id=session.get('user_id'),
+                             next_run_at=datetime.now())
+    error = _parse_monitor_fields(data, monitor)
+    if error:
+        return jsonify({'success': False, 'message': error})
+    
+    try:
+        db.session.add(monitor)
+        db.session.commit()
+        get_monitor_scheduler().wakeup()
+        return jsonify({'success': True, 'message': '监控创建成功', 'data': monitor.to_dict()})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': f'创建失败: {str(e)}'})
+
+@bp.route('/api/monitors/<int:monitor_id>', methods=['PUT'])
+@admin_required
+def api_update_monitor(monitor_id):
+    """更新关键字监控"""
+    from app.models import KeywordMonitor
+    monitor = KeywordMonitor.query.get_or_404(monitor_id)
+    
+    error = _parse_monitor_fields(request.get_json() or {}, monitor)
+    if error:
+        return jsonify({'success': False, 'message': error})
+    
+    try:
+        db.session.commit()
+        return jsonify({'success': True, 'message': '监控更新成功', 'data': monitor.to_dict()})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': f'更新失败: {str(e)}'})
+
+@bp.route('/api/monitors/<int:monitor_id>', methods=['DELETE'])
+@admin_required
+def api_delete_monitor(monitor_id):
+    """删除关键字监控"""
+    from app.models import KeywordMonitor
+    monitor = KeywordMonitor.query.get_or_404(monitor_id)
+    
+    try:
+        db.session.delete(monitor)
+        db.session.commit()
+        return jsonify({'success': True, 'message': '监控删除成功'})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': f'删除失败: {str(e)}'})
+
+@bp.route('/api/monitors/<int:monitor_id>/run', methods=['POST'])
+@admin_required
+def api_run_monitor(monitor_id):
+    """立即执行一次关键字监控"""
+    from app.models import KeywordMonitor
+    from app.monitor import get_monitor_scheduler
+    monitor = KeywordMonitor.query.get_or_404(monitor_id)
+    
+    monitor.next_run_at = datetime.now()
+    db.session.commit()
+    get_monitor_scheduler().wakeup()
+    return jsonify({'success': True, 'message': '已加入抓取计划', 'data': monitor.to_dict()})
+
 @bp.route('/api/health')
 def health():
     """健康检查接口"""
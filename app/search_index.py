@@ -0,0 +1,183 @@
+"""
+新闻全文检索 - SQLite FTS5 索引（中文按二元组切分）
+
+SQLite 自带的分词器不支持中文分词，trigram 分词器又要求查询词至少3个字。
+这里在写入前把中文切成重叠的二元组（"西昌电力" -> "西昌 昌电 电力"），
+英文和数字按单词切分，再交给 FTS5 的 unicode61 分词器；查询时用同样的方式
+把每个查询词转换为短语查询，相当于子串匹配。
+
+单个汉字的查询词无法用二元组可靠匹配（位于一段中文末尾的字没有以它开头的二元组），
+这类查询词改用 LIKE 在新闻表上匹配。
+"""
+import html
+import re
+import unicodedata
+from typing import List, Dict, Tuple, Iterable
+
+from sqlalchemy import text
+
+from app.models import NewsItem, db
+
+# 中文连续字符 / 英文数字单词
+_TOKEN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff]+|[a-z0-9]+')
+_CJK_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff]')
+
+# 标题的权重高于摘要
+_BM25_WEIGHTS = (5.0, 1.0)
+
+# 摘要片段长度
+SNIPPET_LENGTH = 80
+
+
+def tokenize(value: str) -> List[str]:
+    """切分文本：中文切成重叠二元组（单字保留单字），英文数字按单词"""
+    tokens = []
+    for run in _TOKEN_RE.findall(unicodedata.normalize('NFKC', value or '').lower()):
+        if _CJK_RE.match(run) and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def build_match_query(query: str) -> Tuple[str, List[str]]:
+    """
+    把用户输入转换为 FTS5 查询表达式（空格分隔的多个词之间为 AND）
+
+    Returns:
+        (FTS5 查询表达式, 需要用 LIKE 匹配的单个汉字列表)
+    """
+    phrases = []
+    chars = []
+    for term in query.split():
+        tokens = tokenize(term)
+        if not tokens:
+            continue
+        if len(tokens) == 1 and len(tokens[0]) == 1 and _CJK_RE.match(tokens[0]):
+            chars.append(tokens[0])
+        else:
+            phrases.append('"' + ' '.join(tokens) + '"')
+    return ' AND '.join(phrases), chars
+
+
+def init_search_index():
+    """创建全文索引表（不存在时），并为尚未建立索引的新闻补建索引"""
+    db.session.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts "
+        "USING fts5(title, summary, tokenize='unicode61')"
+    ))
+    missing = db.session.execute(text(
+        'SELECT id FROM news_items WHERE id NOT IN (SELECT rowid FROM news_fts)'
+    )).scalars().all()
+    if missing:
+        index_news(missing)
+    db.session.commit()
+
+
+def index_news(news_ids: Iterable[int]):
+    """
+    更新指定新闻的全文索引（不提交事务，由调用方在同一事务中提交）
+    """
+    news_ids = list(news_ids)
+    for start in range(0, len(news_ids), 500):
+        batch = news_ids[start:start + 500]
+        rows = db.session.query(NewsItem.id, NewsItem.title, NewsItem.summary) \
+            .filter(NewsItem.id.in_(batch)).all()
+        db.session.execute(
+            text('DELETE FROM news_fts WHERE rowid = :id'),
+            [{'id': row.id} for row in rows]
+        )
+        db.session.execute(
+            text('INSERT INTO news_fts (rowid, title, summary) VALUES (:id, :title, :summary)'),
+            [{
+                'id': row.id,
+                'title': ' '.join(tokenize(row.title)),
+                'summary': ' '.join(tokenize(row.summary)),
+            } for row in rows]
+        )
+
+
+def highlight(value: str, terms: List[str]) -> str:
+    """HTML转义后用<em>标记查询词"""
+    value = html.escape(value or '')
+    for term in sorted(set(terms), key=len, reverse=True):
+        escaped = html.escape(term)
+        value = re.sub(re.escape(escaped), lambda m: f'<em>{m.group(0)}</em>', value, flags=re.IGNORECASE)
+    return value
+
+
+def make_snippet(value: str, terms: List[str], length: int = SNIPPET_LENGTH) -> str:
+    """截取第一个查询词附近的片段并高亮"""
+    value = value or ''
+    lowered = value.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    positions = [pos for pos in positions if pos >= 0]
+    start = max(min(positions) - length // 4, 0) if positions else 0
+    snippet = value[start:start + length]
+    return ('…' if start > 0 else '') + highlight(snippet, terms) + ('…' if start + length < len(value) else '')
+
+
+def search_news(query: str, page: int = 1, per_page: int = 20) -> Tuple[List[Dict], int]:
+    """
+    全文检索已入库的新闻（按 BM25 相关度排序，标题权重更高）
+
+    Args:
+        query: 查询词，多个词用空格分隔
+        page: 页码（从1开始）
+        per_page: 每页条数
+
+    Returns:
+        (新闻列表（带 title_highlight 和 snippet 字段）, 总条数)
+    """
+    match, chars = build_match_query(query)
+    if not match and not chars:
+        return [], 0
+
+    params = {'match': match, 'limit': per_page, 'offset': (page - 1) * per_page}
+    # 单个汉字：标题或摘要包含该字
+    like = []
+    for i, char in enumerate(chars):
+        params[f'c{i}'] = f'%{char}%'
+        like.append(f'(title LIKE :c{i} OR summary LIKE :c{i})')
+    like = ' AND '.join(like)
+
+    if match:
+        where = 'news_fts MATCH :match'
+        if like:
+            where += f' AND rowid IN (SELECT id FROM news_items WHERE {like})'
+        total = db.session.execute(text(f'SELECT count(*) FROM news_fts WHERE {where}'), params).scalar()
+        ranked = db.session.execute(
+            text(
+                f'SELECT rowid FROM news_fts WHERE {where} '
+                f'ORDER BY bm25(news_fts, {_BM25_WEIGHTS[0]}, {_BM25_WEIGHTS[1]}) '
+                'LIMIT :limit OFFSET :offset'
+            ),
+            params
+        ).scalars().all()
+    else:
+        # 只有单字查询词时没有相关度，标题包含全部查询字的排在前面，其余按入库先后倒序
+        title_like = ' AND '.join(f'title LIKE :c{i}' for i in range(len(chars)))
+        total = db.session.execute(text(f'SELECT count(*) FROM news_items WHERE {like}'), params).scalar()
+        ranked = db.session.execute(
+            text(
+                f'SELECT id FROM news_items WHERE {like} '
+                f'ORDER BY CASE WHEN {title_like} THEN 0 ELSE 1 END, id DESC '
+                'LIMIT :limit OFFSET :offset'
+            ),
+            params
+        ).scalars().all()
+
+    items = {item.id: item for item in NewsItem.query.filter(NewsItem.id.in_(ranked)).all()}
+    terms = query.split()
+
+    results = []
+    for news_id in ranked:
+        item = items.get(news_id)
+        if item is None:
+            continue
+        news = item.to_dict()
+        news['title_highlight'] = highlight(item.title, terms)
+        news['snippet'] = make_snippet(item.summary, terms)
+        results.append(news)
+
+    return results, total
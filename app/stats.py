@@ -0,0 +1,138 @@
+"""
+后台首页统计 - 用SQL聚合计算用户、抓取和新闻数量，结果短时间缓存
+
+每次计算只执行几条 GROUP BY / COUNT 查询，不加载明细记录；缓存有效期内的请求直接返回缓存，
+首页的开销与数据量无关。
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, case
+
+from app.models import db, User, Role, CrawlRun, NewsItem
+from config import DASHBOARD_STATS_TTL
+
+# 新闻按关键字统计时返回的关键字个数
+TOP_KEYWORDS = 10
+# 新闻按天统计的天数
+NEWS_DAYS = 7
+
+
+def _user_stats(now: datetime) -> Dict:
+    """用户总数、按角色和状态统计、最近登录人数"""
+    rows = db.session.query(
+        User.role_id, Role.name, User.is_active, func.count(User.id)
+    ).outerjoin(Role, Role.id == User.role_id).group_by(User.role_id, Role.name, User.is_active).all()
+
+    by_role: Dict[int, Dict] = {}
+    total = active = 0
+    for role_id, role_name, is_active, count in rows:
+        entry = by_role.setdefault(role_id, {'role_id': role_id, 'role_name': role_name, 'total': 0, 'active': 0})
+        entry['total'] += count
+        total += count
+        if is_active:
+            entry['active'] += count
+            active += count
+
+    logins_24h, logins_7d = db.session.query(
+        func.sum(case((User.last_login >= now - timedelta(days=1), 1), else_=0)),
+        func.sum(case((User.last_login >= now - timedelta(days=7), 1), else_=0)),
+    ).one()
+
+    return {
+        'total': total,
+        'active': active,
+        'inactive': total - active,
+        'by_role': sorted(by_role.values(), key=lambda entry: entry['role_id'] or 0),
+        'logins_24h': logins_24h or 0,
+        'logins_7d': logins_7d or 0,
+    }
+
+
+def _crawl_stats(now: datetime) -> Dict:
+    """抓取次数和抓取量（最近24小时、最近7天、累计）"""
+    day_ago = now - timedelta(days=1)
+    week_ago = now - timedelta(days=7)
+    row = db.session.query(
+        func.count(CrawlRun.id),
+        func.sum(case((CrawlRun.created_at >= day_ago, 1), else_=0)),
+        func.sum(case((CrawlRun.created_at >= day_ago, CrawlRun.result_count), else_=0)),
+        func.sum(case((CrawlRun.created_at >= day_ago, CrawlRun.new_count), else_=0)),
+        func.sum(case((CrawlRun.created_at >= week_ago, 1), else_=0)),
+        func.sum(case((CrawlRun.created_at >= week_ago, CrawlRun.new_count), else_=0)),
+    ).one()
+    return {
+        'runs_total': row[0] or 0,
+        'runs_24h': row[1] or 0,
+        'results_24h': row[2] or 0,
+        'new_24h': row[3] or 0,
+        'runs_7d': row[4] or 0,
+        'new_7d': row[5] or 0,
+    }
+
+
+def _news_stats(now: datetime) -> Dict:
+    """入库新闻总数、按关键字（前 TOP_KEYWORDS 个）和按天（最近 NEWS_DAYS 天）统计"""
+    total = db.session.query(func.count(NewsItem.id)).scalar() or 0
+
+    keyword_count = func.count(NewsItem.id).label('count')
+    by_keyword = db.session.query(NewsItem.keyword, keyword_count).group_by(NewsItem.keyword) \
+        .order_by(keyword_count.desc()).limit(TOP_KEYWORDS).all()
+
+    start = (now - timedelta(days=NEWS_DAYS - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    day = func.date(NewsItem.first_seen_at).label('day')
+    counts = dict(db.session.query(day, func.count(NewsItem.id))
+                  .filter(NewsItem.first_seen_at >= start).group_by(day).all())
+    by_day = []
+    for offset in range(NEWS_DAYS):
+        date = (start + timedelta(days=offset)).strftime('%Y-%m-%d')
+        by_day.append({'date': date, 'count': counts.get(date, 0)})
+
+    return {
+        'total': total,
+        'by_keyword': [{'keyword': keyword, 'count': count} for keyword, count in by_keyword],
+        'by_day': by_day,
+    }
+
+
+def compute_dashboard_stats(now: Optional[datetime] = None) -> Dict:
+    """计算首页统计（不使用缓存）"""
+    now = now or datetime.now()
+    return {
+        'users': _user_stats(now),
+        'crawl': _crawl_stats(now),
+        'news': _news_stats(now),
+        'generated_at': now.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+# 进程内缓存：(过期时间, 统计结果)
+_cached: Optional[Tuple[float, Dict]] = None
+_cache_lock = threading.Lock()
+
+
+def get_dashboard_stats() -> Dict:
+    """
+    获取首页统计（缓存 DASHBOARD_STATS_TTL 秒）
+
+    缓存过期时只有一个请求重新计算，其余请求等待后直接使用新结果。
+    """
+    global _cached
+    cached = _cached
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    with _cache_lock:
+        if _cached is not None and _cached[0] > time.monotonic():
+            return _cached[1]
+        stats = compute_dashboard_stats()
+        _cached = (time.monotonic() + DASHBOARD_STATS_TTL, stats)
+        return stats
+
+
+def invalidate_dashboard_stats():
+    """清除首页统计缓存（用户、角色变更和抓取结果入库后调用，下次访问时重新计算）"""
+    global _cached
+    with _cache_lock:
+        _cached = None
@@ -0,0 +1,166 @@
+"""
+系统配置服务 - 把 SystemConfig 表整体加载为内存中的只读快照，读取配置不再查询数据库
+
+- 读取：直接访问快照；距上次检查超过 SYSTEM_CONFIG_POLL_INTERVAL 秒时查询一次版本号
+  （config_version 表的一行），版本变化才重新加载整表
+- 写入：一条 INSERT ... ON CONFLICT 批量写入所有配置项，同一事务中版本号加1，
+  本进程立即重新加载，其他进程在下次检查版本号时重新加载
+"""
+import threading
+import time
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert
+
+from app.models import db, SystemConfig, ConfigVersion
+from config import SYSTEM_CONFIG_POLL_INTERVAL
+
+# 未配置应用名称时的默认值
+DEFAULT_APP_NAME = '政企智能舆情分析报告生成智能体应用系统'
+
+
+class ConfigEntry(NamedTuple):
+    """一个配置项"""
+    value: Optional[str]
+    description: Optional[str]
+    config_type: Optional[str]
+
+
+class ConfigSnapshot:
+    """系统配置的只读快照"""
+
+    __slots__ = ('version', 'entries')
+
+    def __init__(self, version: int, entries: Dict[str, ConfigEntry]):
+        self.version = version
+        self.entries: Mapping[str, ConfigEntry] = MappingProxyType(dict(entries))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """读取字符串配置，不存在或为空时返回default"""
+        entry = self.entries.get(key)
+        if entry is None or entry.value in (None, ''):
+            return default
+        return entry.value
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        """读取整数配置，不存在或格式错误时返回default"""
+        try:
+            return int(self.get(key))
+        except (TypeError, ValueError):
+            return default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """读取布尔配置（1/true/yes/on 为真）"""
+        value = self.get(key)
+        if value is None:
+            return default
+        return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class SystemConfigService:
+    """
+    系统配置服务（线程安全）
+
+    快照本身不可变，读取时不加锁；只有检查版本号和重新加载时持有锁。
+    需要在应用上下文中使用。
+    """
+
+    def __init__(self, poll_interval: float = SYSTEM_CONFIG_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _read_version() -> int:
+        version = db.session.query(ConfigVersion.version).filter(ConfigVersion.id == 1).scalar()
+        return version or 0
+
+    @staticmethod
+    def _load(version: int) -> ConfigSnapshot:
+        rows = db.session.query(
+            SystemConfig.key, SystemConfig.value, SystemConfig.description, SystemConfig.config_type
+        ).all()
+        return ConfigSnapshot(version, {
+            key: ConfigEntry(value, description, config_type)
+            for key, value, description, config_type in rows
+        })
+
+    def snapshot(self) -> ConfigSnapshot:
+        """获取当前配置快照（必要时检查版本号并重新加载）"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.poll_interval:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.poll_interval:
+                return self._snapshot
+            # 先读版本号再读配置：两次读取之间有写入时，快照的版本号偏旧，下次检查会再加载一次
+            version = self._read_version()
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = self._load(version)
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self.snapshot().get(key, default)
+
+    def update(self, values: Dict[str, object], config_type: str = 'text') -> ConfigSnapshot:
+        """
+        批量写入配置项（已存在的只更新值，新配置项使用config_type），并使版本号加1
+
+        Returns:
+            写入后的配置快照
+        """
+        now = datetime.now()
+        rows = [{
+            'key': key,
+            'value': None if value is None else str(value),
+            'config_type': config_type,
+            'created_at': now,
+            'updated_at': now,
+        } for key, value in values.items()]
+
+        try:
+            if rows:
+                stmt = insert(SystemConfig).values(rows)
+                db.session.execute(stmt.on_conflict_do_update(
+                    index_elements=[SystemConfig.key],
+                    set_={'value': stmt.excluded.value, 'updated_at': stmt.excluded.updated_at}
+                ))
+            db.session.execute(
+                update(ConfigVersion).where(ConfigVersion.id == 1).values(version=ConfigVersion.version + 1)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        self.invalidate()
+        return self.snapshot()
+
+    def invalidate(self):
+        """下次读取时检查版本号"""
+        with self._lock:
+            self._checked_at = 0.0
+
+
+# 进程内共享的系统配置服务
+_system_config: Optional[SystemConfigService] = None
+_system_config_lock = threading.Lock()
+
+
+def get_system_config() -> SystemConfigService:
+    """获取进程内共享的系统配置服务（首次调用时创建）"""
+    global _system_config
+    if _system_config is None:
+        with _system_config_lock:
+            if _system_config is None:
+                _system_config = SystemConfigService()
+    return _system_config
@@ -0,0 +1,168 @@
+"""
+解析性能基准测试 - 使用本地保存的搜索结果页，不访问网络
+
+用法：
+    python bench_parser.py                                  # 对比所有解析引擎
+    python bench_parser.py --parser lxml --rounds 200       # 只测lxml
+    python bench_parser.py --save-baseline bench_baseline.json
+    python bench_parser.py --baseline bench_baseline.json --threshold 0.2
+
+内存统计使用 tracemalloc，只包含Python层的分配，不包含lxml在C层申请的内存
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Dict, Callable
+
+from app.crawler import BaiduNewsCrawler, lxml_html
+
+BASE_DIR = Path(__file__).parent
+
+# 默认的HTML样本
+DEFAULT_FIXTURES = [BASE_DIR / 'baidu_result.html']
+
+# 支持的解析引擎
+PARSERS = ['lxml', 'html.parser']
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算百分位数（最近秩法）"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def parse_function(crawler: BaiduNewsCrawler, parser: str) -> Callable[[str, int], List[Dict]]:
+    """
+    获取解析引擎的实现
+
+    直接调用各引擎的解析方法：parse_results 在lxml解析不出结果时会改用BeautifulSoup，
+    经过它测得的"lxml"耗时可能其实是BeautifulSoup的
+    """
+    if parser == 'lxml':
+        if lxml_html is None:
+            raise RuntimeError('未安装lxml')
+        return crawler._parse_results_lxml
+    return crawler._parse_results_soup
+
+
+def bench_parser(crawler: BaiduNewsCrawler, parser: str, pages: List[str], rounds: int,
+                 max_results: int) -> Dict:
+    """
+    对一个解析引擎进行基准测试
+
+    Returns:
+        统计结果：每页耗时百分位（毫秒）、每页内存分配、解析出的新闻条数
+    """
+    parse = parse_function(crawler, parser)
+
+    # 预热一轮，排除首次导入和缓存的影响
+    for html in pages:
+        parse(html, max_results)
+
+    latencies = []
+    items = 0
+    for _ in range(rounds):
+        for html in pages:
+            start = time.perf_counter()
+            news_list = parse(html, max_results)
+            latencies.append((time.perf_counter() - start) * 1000)
+            items += len(news_list)
+
+    # 单独测一轮内存分配（tracemalloc 会显著拖慢执行，不计入耗时）
+    allocated = []
+    peaks = []
+    for html in pages:
+        tracemalloc.start()
+        parse(html, max_results)
+        snapshot_size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocated.append(snapshot_size)
+        peaks.append(peak)
+
+    return {
+        'parser': parser,
+        'pages': len(latencies),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p90_ms': round(percentile(latencies, 90), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'peak_kb': round(max(peaks) / 1024, 1),
+        'retained_kb': round(max(allocated) / 1024, 1),
+        'items_per_page': round(items / len(latencies), 2),
+    }
+
+
+def check_regressions(results: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    """与基线对比，返回回归描述列表（p50/p90耗时变慢超过阈值或解析条数减少）"""
+    regressions = []
+    for result in results:
+        base = baseline.get(result['parser'])
+        if not base:
+            continue
+        for metric in ('p50_ms', 'p90_ms'):
+            if result[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{result['parser']} {metric}: {base[metric]} -> {result[metric]}"
+                )
+        if result['items_per_page'] < base['items_per_page']:
+            regressions.append(
+                f"{result['parser']} items_per_page: {base['items_per_page']} -> {result['items_per_page']}"
+            )
+    return regressions
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description='百度新闻解析性能基准测试（离线）')
+    arg_parser.add_argument('fixtures', nargs='*', type=Path, default=DEFAULT_FIXTURES,
+                            help='HTML样本文件，默认使用 baidu_result.html')
+    arg_parser.add_argument('--parser', choices=PARSERS, action='append',
+                            help='要测试的解析引擎，可重复指定，默认全部')
+    arg_parser.add_argument('--rounds', type=int, default=50, help='每个样本重复解析的轮数')
+    arg_parser.add_argument('--max-results', type=int, default=50, help='每页最多解析的新闻条数')
+    arg_parser.add_argument('--baseline', type=Path, help='基线结果文件，存在回归时返回非0')
+    arg_parser.add_argument('--threshold', type=float, default=0.25, help='允许的耗时增长比例')
+    arg_parser.add_argument('--save-baseline', type=Path, help='把本次结果保存为基线')
+    args = arg_parser.parse_args()
+
+    pages = [path.read_text(encoding='utf-8') for path in args.fixtures]
+    crawler = BaiduNewsCrawler()
+
+    print("=" * 80)
+    print(f"解析性能基准测试: {len(pages)} 个样本 × {args.rounds} 轮")
+    print("=" * 80)
+    print(f"{'引擎':<12}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}{'均值(ms)':>10}"
+          f"{'峰值(KB)':>12}{'条数/页':>10}")
+
+    results = []
+    for parser in args.parser or PARSERS:
+        result = bench_parser(crawler, parser, pages, args.rounds, args.max_results)
+        results.append(result)
+        print(f"{parser:<12}{result['p50_ms']:>10}{result['p90_ms']:>10}{result['p99_ms']:>10}"
+              f"{result['mean_ms']:>10}{result['peak_kb']:>12}{result['items_per_page']:>10}")
+
+    if args.save_baseline:
+        args.save_baseline.write_text(
+            json.dumps({r['parser']: r for r in results}, ensure_ascii=False, indent=2),
+            encoding='utf-8'
+        )
+        print(f"\n基线已保存: {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = check_regressions(results, baseline, args.threshold)
+        if regressions:
+            print("\n✗ 发现性能回归:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\n✓ 未发现性能回归")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,3 +17,104 @@ SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-productio
 # 调试模式
 DEBUG = True
 
+
+# 数据抓取配置
+# HTML解析引擎：'lxml'（XPath单次遍历，速度快）或 'html.parser'（BeautifulSoup，兼容性好）
+CRAWLER_PARSER = 'lxml'
+# 多页抓取时每页结果数（百度新闻每页10条）
+CRAWLER_PAGE_SIZE = 10
+# 多页抓取线程池大小
+CRAWLER_MAX_WORKERS = 5
+# 异步爬虫同时进行的请求/关键字搜索上限
+CRAWLER_ASYNC_CONCURRENCY = 20
+# 同一主机的最大并发请求数（所有爬虫实例共享）
+CRAWLER_PER_HOST_CONCURRENCY = 3
+# 共享连接池：缓存的主机连接池个数、每个主机保持的最大连接数
+CRAWLER_POOL_CONNECTIONS = 4
+CRAWLER_POOL_MAXSIZE = 10
+# User-Agent 轮换间隔（秒）
+CRAWLER_UA_ROTATE_INTERVAL = 300
+# 解析结果缓存条数（按页面内容哈希，内容未变化的页面跳过解析）
+CRAWLER_PAGE_CACHE_MAX_ENTRIES = 256
+# 原始页面存档目录（按内容哈希压缩存储，用于重新解析），设为None则不存档
+CRAWLER_ARCHIVE_DIR = BASE_DIR / 'archive'
+
+# 自适应限流配置（每个主机一个令牌桶，单位：请求/秒）
+# 初始速率、最低速率、最高速率
+CRAWLER_RATE_INITIAL = 1.0
+CRAWLER_RATE_MIN = 0.1
+CRAWLER_RATE_MAX = 5.0
+# 每次请求成功提高的速率
+CRAWLER_RATE_INCREASE = 0.1
+# 被限流（429/验证码页面）时速率乘以该系数
+CRAWLER_RATE_DECREASE = 0.5
+# 响应时间超过该值（秒）视为主机变慢，小幅降速
+CRAWLER_SLOW_RESPONSE = 5.0
+# 熔断：连续失败次数达到阈值后，该URL暂停请求的时间（秒）
+CRAWLER_BREAKER_FAILURES = 5
+CRAWLER_BREAKER_RECOVERY = 60
+
+# 搜索入口选择配置
+# 统计最近多少次请求的成功率和响应时间
+CRAWLER_ENDPOINT_WINDOW = 50
+# 随机尝试非最优入口的概率
+CRAWLER_ENDPOINT_EXPLORE = 0.05
+# 对冲请求：首选入口超过其响应时间的该分位数仍未返回时，向下一个入口再发一个请求
+CRAWLER_HEDGE_ENABLED = True
+CRAWLER_HEDGE_PERCENTILE = 0.95
+# 对冲等待时间下限、统计样本不足时的默认等待时间（秒）
+CRAWLER_HEDGE_MIN_DELAY = 0.5
+CRAWLER_HEDGE_DEFAULT_DELAY = 3.0
+
+# 抓取结果缓存配置
+# 缓存有效期（秒）
+CRAWLER_CACHE_TTL = 600
+# 内存中最多缓存的关键字条目数（LRU淘汰）
+CRAWLER_CACHE_MAX_ENTRIES = 256
+# SQLite持久化缓存文件，设为None则只使用内存缓存
+CRAWLER_CACHE_DB_PATH = BASE_DIR / 'cache.db'
+
+# 相似新闻聚类配置（MinHash + LSH）
+# MinHash 签名长度
+CLUSTER_NUM_PERM = 64
+# LSH 分段数（每段 CLUSTER_NUM_PERM / CLUSTER_BANDS 个值）
+CLUSTER_BANDS = 16
+# 判定为同一事件的最低相似度
+CLUSTER_THRESHOLD = 0.6
+# 字符 n-gram 长度
+CLUSTER_SHINGLE_SIZE = 2
+# 索引保留的最近新闻条数，超过时淘汰最早加入的新闻
+CLUSTER_MAX_ITEMS = 20000
+
+# 登录用户缓存配置
+# 用户和角色信息的跨请求缓存有效期（秒），修改用户或角色时立即失效
+AUTH_CACHE_TTL = 60
+# 最多缓存的用户数
+AUTH_CACHE_MAX_ENTRIES = 1024
+
+# 系统配置（SystemConfig）缓存：两次检查配置版本号的最小间隔（秒），
+# 其他进程修改配置后，本进程最迟在这个时间后重新加载
+SYSTEM_CONFIG_POLL_INTERVAL = 5
+
+# 后台首页统计缓存有效期（秒）
+DASHBOARD_STATS_TTL = 30
+
+# 后台抓取任务配置
+# 工作线程数
+CRAWLER_JOB_WORKERS = 4
+# 排队任务上限，超过时拒绝提交
+CRAWLER_JOB_QUEUE_SIZE = 100
+# 同时进行的流式抓取数上限（流式抓取占用请求线程），超过时拒绝请求
+CRAWLER_STREAM_MAX_CONCURRENT = 4
+
+# 关键字监控（定时增量抓取）配置
+# 是否在应用启动时运行定时调度线程
+MONITOR_ENABLED = True
+# 调度线程检查到期监控的间隔（秒）
+MONITOR_POLL_INTERVAL = 30
+# 抓取间隔的随机抖动比例（0.1 表示 ±10%），避免多个关键字同时抓取
+MONITOR_JITTER = 0.1
+# 所有监控共享的请求预算（每分钟最多请求的页数）
+MONITOR_PAGES_PER_MINUTE = 20
+# 高水位保留的最新新闻URL条数
+MONITOR_HIGH_WATER_SIZE = 20
@@ -0,0 +1,223 @@
+"""
+批量抓取 - 从文件读取关键字列表批量抓取，结果写入JSONL或数据库
+
+- 网络请求：多个线程并发，共用爬虫的主机限流、熔断和入口选择
+- 页面解析：CPU密集，分发到进程池（每个CPU核心一个进程）
+- 断点续抓：每完成一个关键字写一行检查点，中断后重新运行会跳过已完成的关键字
+
+用法：
+    python crawl_batch.py keywords.txt --output result.jsonl
+    python crawl_batch.py keywords.txt --db --max-results 50 --concurrency 8
+    python crawl_batch.py keywords.txt --output result.jsonl --restart   # 忽略检查点重新抓取
+
+关键字文件每行一个关键字，空行和 # 开头的行会被忽略。
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Dict, Optional, Set, Tuple
+
+from app.crawler import BaiduNewsCrawler
+from app.dedup import NewsDeduplicator
+from config import CRAWLER_PARSER, CRAWLER_PAGE_SIZE
+
+# 工作进程内的爬虫实例（只用于解析）
+_worker_crawler: Optional[BaiduNewsCrawler] = None
+
+
+def _init_worker(parser: str):
+    global _worker_crawler
+    _worker_crawler = BaiduNewsCrawler(parser=parser)
+
+
+def _parse_html(html: str, max_results: int) -> List[Dict]:
+    """工作进程：解析一页搜索结果"""
+    return _worker_crawler.parse_results(html, max_results)
+
+
+def read_keywords(path: str) -> List[str]:
+    """读取关键字文件（去除空行、注释和重复的关键字，保持原顺序）"""
+    keywords = []
+    seen = set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            keyword = line.strip()
+            if not keyword or keyword.startswith('#') or keyword in seen:
+                continue
+            seen.add(keyword)
+            keywords.append(keyword)
+    return keywords
+
+
+def read_checkpoint(path: str) -> Set[str]:
+    """读取检查点文件中已完成的关键字"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)['keyword'])
+            except (ValueError, KeyError):
+                # 中断时可能留下不完整的最后一行
+                continue
+    return done
+
+
+class BatchCrawler:
+    """
+    批量抓取
+
+    每个关键字在一个线程中逐页抓取（遇到空页即停止），抓到的页面交给进程池解析。
+    """
+
+    def __init__(self, max_results: int, concurrency: int, parse_workers: int, parser: str):
+        self.max_results = max_results
+        self.page_size = CRAWLER_PAGE_SIZE
+        self.crawler = BaiduNewsCrawler(max_workers=concurrency, parser=parser)
+        self.fetch_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='batch-fetch')
+        self.parse_pool = ProcessPoolExecutor(max_workers=parse_workers, initializer=_init_worker,
+                                              initargs=(parser,))
+        self.pages = 0
+        self._pages_lock = threading.Lock()
+
+    def close(self):
+        self.fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self.parse_pool.shutdown(wait=False, cancel_futures=True)
+        self.crawler.close()
+
+    def crawl_keyword(self, keyword: str) -> Tuple[Optional[List[Dict]], int]:
+        """
+        抓取一个关键字
+
+        Returns:
+            (去重后的新闻列表，第一页就抓取失败时为None, 抓取耗时（毫秒，不含在线程池中排队的时间）)
+        """
+        started = time.perf_counter()
+        news_list = self._crawl_pages(keyword)
+        return news_list, int((time.perf_counter() - started) * 1000)
+
+    def _crawl_pages(self, keyword: str) -> Optional[List[Dict]]:
+        """逐页抓取一个关键字，第一页就抓取失败时返回None"""
+        news_list = []
+        dedup = NewsDeduplicator()
+        pages = max(1, -(-self.max_results // self.page_size))
+        for page in range(pages):
+            html = self.crawler.fetch_page(keyword, page * self.page_size, self.page_size)
+            if html is None:
+                if page == 0:
+                    return None
+                break
+            with self._pages_lock:
+                self.pages += 1
+
+            page_items = self.parse_pool.submit(_parse_html, html, self.page_size).result()
+            if self.crawler._merge_page(news_list, page_items, self.max_results, dedup):
+                break
+        return news_list
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='批量抓取关键字列表')
+    arg_parser.add_argument('keywords_file', help='关键字文件（每行一个）')
+    arg_parser.add_argument('--output', help='输出JSONL文件')
+    arg_parser.add_argument('--db', action='store_true', help='写入数据库')
+    arg_parser.add_argument('--max-results', type=int, default=30, help='每个关键字最多抓取条数')
+    arg_parser.add_argument('--concurrency', type=int, default=8, help='同时抓取的关键字数')
+    arg_parser.add_argument('--parse-workers', type=int, default=os.cpu_count() or 1, help='解析进程数')
+    arg_parser.add_argument('--parser', default=CRAWLER_PARSER, choices=['lxml', 'html.parser'], help='解析引擎')
+    arg_parser.add_argument('--checkpoint', help='检查点文件（默认为输出文件名加 .checkpoint）')
+    arg_parser.add_argument('--restart', action='store_true', help='忽略检查点，全部重新抓取')
+    args = arg_parser.parse_args()
+
+    if not args.output and not args.db:
+        arg_parser.error('请指定 --output 或 --db')
+
+    keywords = read_keywords(args.keywords_file)
+    checkpoint_path = args.checkpoint or f"{args.output or 'crawl_batch'}.checkpoint"
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    done = read_checkpoint(checkpoint_path)
+    pending = [keyword for keyword in keywords if keyword not in done]
+    print(f"关键字: {len(keywords)} 个，已完成: {len(keywords) - len(pending)} 个，待抓取: {len(pending)} 个")
+    if not pending:
+        return
+
+    app = None
+    if args.db:
+        from app import create_app
+        app = create_app(start_scheduler=False)
+
+    # 续抓时追加到原输出文件
+    output = open(args.output, 'w' if args.restart or not done else 'a', encoding='utf-8') if args.output else None
+    checkpoint = open(checkpoint_path, 'a', encoding='utf-8')
+
+    batch = BatchCrawler(args.max_results, args.concurrency, args.parse_workers, args.parser)
+    start = time.perf_counter()
+    finished = failed = items = 0
+    try:
+        futures = {batch.fetch_pool.submit(batch.crawl_keyword, keyword): keyword for keyword in pending}
+
+        # 只在主线程写文件和数据库
+        for future in as_completed(futures):
+            keyword = futures[future]
+            try:
+                news_list, duration_ms = future.result()
+            except Exception as e:
+                print(f"[{keyword}] 抓取错误: {str(e)}", file=sys.stderr)
+                news_list = None
+            if news_list is None:
+                failed += 1
+                print(f"[{keyword}] 抓取失败，下次运行时重试")
+                continue
+
+            # 先入库：入库失败时该关键字记为失败，不写输出和检查点，下次运行时重试
+            if app is not None and news_list:
+                from app.news_store import save_news
+                try:
+                    with app.app_context():
+                        save_news(keyword, news_list, max_results=args.max_results, trigger='batch',
+                                  duration_ms=duration_ms)
+                except Exception as e:
+                    failed += 1
+                    print(f"[{keyword}] 保存新闻失败: {str(e)}，下次运行时重试", file=sys.stderr)
+                    continue
+
+            if output is not None:
+                output.write(json.dumps({
+                    'keyword': keyword,
+                    'count': len(news_list),
+                    'crawled_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'data': news_list,
+                }, ensure_ascii=False) + '\n')
+                output.flush()
+
+            checkpoint.write(json.dumps({'keyword': keyword, 'count': len(news_list)}, ensure_ascii=False) + '\n')
+            checkpoint.flush()
+
+            finished += 1
+            items += len(news_list)
+            print(f"[{finished + failed}/{len(pending)}] {keyword}: {len(news_list)} 条")
+    except KeyboardInterrupt:
+        print('已中断，重新运行即可从检查点继续')
+    finally:
+        batch.close()
+        checkpoint.close()
+        if output is not None:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"完成: {finished} 个关键字，失败: {failed} 个，请求 {batch.pages} 页，抓取 {items} 条，"
+          f"耗时 {elapsed:.1f} 秒")
+    if elapsed:
+        print(f"吞吐量: {finished / elapsed:.2f} 关键字/秒，{batch.pages / elapsed:.2f} 页/秒，"
+              f"{items / elapsed:.1f} 条/秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+"""
+本地模拟百度新闻搜索服务 - 用保存的搜索结果页响应请求，用于离线压测和回归测试
+
+- 分页：按 pn/rn 返回不同的结果（标题和链接带上关键字和页码，跨页不会被去重），
+  超过 --max-pages 页后返回空结果页
+- 延迟：基础延迟按对数正态分布抖动，另有一定比例的慢请求；可按路径单独设置
+- 错误：按比例返回 500/502/504，或返回百度安全验证页面
+- 限流：每隔 --burst-interval 秒出现一次持续 --burst-duration 秒的 429（带 Retry-After）
+
+同一 (路径, 关键字, 页码, 第几次请求) 的延迟和错误由 --seed 决定，与并发顺序无关，结果可重复。
+429 限流按服务启动后的时间计算。
+
+用法：
+    python fake_baidu.py --port 8765
+    python fake_baidu.py --latency 0.2 --error-rate 0.05 --burst-interval 30 --burst-duration 3
+    python fake_baidu.py --path-latency /news=1.5            # 模拟一个入口变慢
+
+GET /__stats 返回各状态码的请求数，load_test.py 用它统计服务端的请求情况。
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs, quote
+
+BASE_DIR = Path(__file__).parent
+
+# 默认的HTML样本
+DEFAULT_FIXTURE = BASE_DIR / 'baidu_result.html'
+
+# 搜索结果标题的链接：<h3 ...><a href="...">
+_RE_TITLE_LINK = re.compile(r'(<h3[^>]*>\s*<a\s[^>]*?href=")([^"]*)("[^>]*>)', re.S)
+
+# 超过最大页数时返回的空结果页
+_EMPTY_PAGE = '<html><head><meta charset="utf-8"></head><body><div id="content_left"></div></body></html>'
+
+# 百度安全验证页面
+_CAPTCHA_PAGE = ('<html><head><meta charset="utf-8"><title>百度安全验证</title></head>'
+                 '<body><div class="timeout-title">网络不给力，请稍后重试</div></body></html>')
+
+# 渲染后页面的缓存条数（重试和对冲请求命中缓存，不重复渲染和压缩）
+_PAGE_CACHE_SIZE = 512
+
+
+class FixtureTemplate:
+    """
+    搜索结果页模板
+
+    把样本页按标题链接切开，渲染时在每个链接后追加 fake 参数、在标题前加上页码序号，
+    不同关键字和页码的结果各不相同。
+    """
+
+    def __init__(self, html: str):
+        self.parts: List[str] = []
+        self.links: List[Tuple[str, str]] = []
+        position = 0
+        for match in _RE_TITLE_LINK.finditer(html):
+            self.parts.append(html[position:match.start()] + match.group(1))
+            self.links.append((match.group(2), match.group(3)))
+            position = match.end()
+        self.parts.append(html[position:])
+
+    def render(self, keyword: str, page: int, rn: int) -> str:
+        """渲染一页结果（最多 rn 条，多余的结果不加标记）"""
+        token = quote(f'{keyword}-{page}')
+        chunks = []
+        for index, (href, tag_end) in enumerate(self.links):
+            chunks.append(self.parts[index])
+            if index < rn:
+                sep = '&amp;' if '?' in href else '?'
+                chunks.append(f'{href}{sep}fake={token}-{index}{tag_end}[{page + 1}-{index + 1}] ')
+            else:
+                chunks.append(href + tag_end)
+        chunks.append(self.parts[-1])
+        return ''.join(chunks)
+
+
+class FakeBaiduConfig:
+    """模拟服务的行为配置"""
+
+    def __init__(self, latency: float = 0.05, latency_sigma: float = 0.5, slow_rate: float = 0.0,
+                 slow_latency: float = 2.0, error_rate: float = 0.0, captcha_rate: float = 0.0,
+                 burst_interval: float = 0.0, burst_duration: float = 0.0, retry_after: int = 1,
+                 max_pages: int = 5, path_latency: Optional[Dict[str, float]] = None, seed: int = 0):
+        self.latency = latency
+        self.latency_sigma = latency_sigma
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.captcha_rate = captcha_rate
+        self.burst_interval = burst_interval
+        self.burst_duration = burst_duration
+        self.retry_after = retry_after
+        self.max_pages = max_pages
+        self.path_latency = path_latency or {}
+        self.seed = seed
+
+
+class FakeBaiduServer:
+    """
+    模拟百度新闻搜索服务（多线程HTTP服务，支持keep-alive）
+
+    用法：
+        server = FakeBaiduServer(FakeBaiduConfig(latency=0.1), port=0).start()
+        crawler.base_urls = server.base_urls()
+        ...
+        server.stop()
+    """
+
+    def __init__(self, config: FakeBaiduConfig, host: str = '127.0.0.1', port: int = 0,
+                 fixture: Path = DEFAULT_FIXTURE, verbose: bool = False):
+        self.config = config
+        self.verbose = verbose
+        self.template = FixtureTemplate(fixture.read_text(encoding='utf-8'))
+        self.started_at = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._attempts: Counter = Counter()
+        self._status_counts: Counter = Counter()
+        self._pages: 'OrderedDict[Tuple[str, int, int, bool], bytes]' = OrderedDict()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def base_urls(self) -> List[str]:
+        """与 BaiduNewsCrawler.base_urls 对应的三个入口"""
+        return [f'{self.url}/ns', f'{self.url}/s?tn=news', f'{self.url}/news']
+
+    def start(self) -> 'FakeBaiduServer':
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-baidu', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        """各状态码的请求数"""
+        with self._lock:
+            return {str(status): count for status, count in sorted(self._status_counts.items())}
+
+    def _in_burst(self) -> bool:
+        """当前是否处于429限流时段"""
+        if self.config.burst_interval <= 0 or self.config.burst_duration <= 0:
+            return False
+        return (time.monotonic() - self.started_at) % self.config.burst_interval < self.config.burst_duration
+
+    def _page_body(self, keyword: str, page: int, rn: int, gzipped: bool) -> bytes:
+        """渲染并编码一页结果（LRU缓存）"""
+        key = (keyword, page, rn, gzipped)
+        with self._lock:
+            body = self._pages.get(key)
+            if body is not None:
+                self._pages.move_to_end(key)
+                return body
+
+        if page >= self.config.max_pages:
+            html = _EMPTY_PAGE
+        else:
+            html = self.template.render(keyword, page, rn)
+        body = html.encode('utf-8')
+        if gzipped:
+            body = gzip.compress(body, compresslevel=1)
+
+        with self._lock:
+            self._pages[key] = body
+            while len(self._pages) > _PAGE_CACHE_SIZE:
+                self._pages.popitem(last=False)
+        return body
+
+    def respond(self, path: str, query: Dict[str, List[str]], accept_encoding: str) -> Tuple[int, Dict[str, str], bytes, float]:
+        """
+        决定一次搜索请求的响应
+
+        Returns:
+            (状态码, 响应头, 响应体, 延迟秒数)
+        """
+        keyword = (query.get('word') or query.get('wd') or [''])[0]
+        try:
+            pn = int((query.get('pn') or ['0'])[0])
+            rn = max(1, int((query.get('rn') or ['10'])[0]))
+        except ValueError:
+            return 400, {}, b'bad request', 0.0
+        page = pn // rn
+
+        # 同一请求的第几次尝试决定随机数，重试时可能得到不同的结果
+        key = (path, keyword, pn, rn)
+        with self._lock:
+            self._attempts[key] += 1
+            attempt = self._attempts[key]
+        seed = hashlib.blake2b(f'{self.config.seed}|{path}|{keyword}|{pn}|{rn}|{attempt}'.encode('utf-8'),
+                               digest_size=8).digest()
+        rng = random.Random(seed)
+
+        base = self.config.path_latency.get(path, self.config.latency)
+        delay = base * rng.lognormvariate(0, self.config.latency_sigma) if base > 0 else 0.0
+        if rng.random() < self.config.slow_rate:
+            delay += self.config.slow_latency
+
+        headers = {'Content-Type': 'text/html; charset=utf-8'}
+        if self._in_burst():
+            headers['Retry-After'] = str(self.config.retry_after)
+            return 429, headers, b'Too Many Requests', min(delay, base)
+        if rng.random() < self.config.error_rate:
+            return rng.choice((500, 502, 504)), headers, b'Server Error', delay
+        if rng.random() < self.config.captcha_rate:
+            return 200, headers, _CAPTCHA_PAGE.encode('utf-8'), delay
+
+        gzipped = 'gzip' in accept_encoding
+        if gzipped:
+            headers['Content-Encoding'] = 'gzip'
+        return 200, headers, self._page_body(keyword, page, rn, gzipped), delay
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == '/__stats':
+                    status, headers, body, delay = 200, {'Content-Type': 'application/json'}, \
+                        json.dumps(server.stats()).encode('utf-8'), 0.0
+                elif parts.path in ('/ns', '/s', '/news'):
+                    status, headers, body, delay = server.respond(
+                        parts.path, parse_qs(parts.query), self.headers.get('Accept-Encoding', ''))
+                    with server._lock:
+                        server._status_counts[status] += 1
+                else:
+                    status, headers, body, delay = 404, {}, b'Not Found', 0.0
+
+                if delay > 0:
+                    time.sleep(delay)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                if server.verbose:
+                    super().log_message(format, *args)
+
+        return Handler
+
+
+def _parse_path_latency(values: Optional[List[str]]) -> Dict[str, float]:
+    """解析 --path-latency /news=1.5"""
+    result = {}
+    for value in values or []:
+        path, _, latency = value.partition('=')
+        result[path] = float(latency)
+    return result
+
+
+def add_server_arguments(arg_parser: argparse.ArgumentParser):
+    """添加模拟服务的行为参数（load_test.py 共用）"""
+    group = arg_parser.add_argument_group('模拟服务')
+    group.add_argument('--fixture', type=Path, default=DEFAULT_FIXTURE, help='搜索结果页样本')
+    group.add_argument('--latency', type=float, default=0.05, help='基础延迟（秒）')
+    group.add_argument('--latency-sigma', type=float, default=0.5, help='延迟抖动（对数正态分布的sigma）')
+    group.add_argument('--slow-rate', type=float, default=0.0, help='慢请求比例')
+    group.add_argument('--slow-latency', type=float, default=2.0, help='慢请求额外延迟（秒）')
+    group.add_argument('--error-rate', type=float, default=0.0, help='返回5xx的比例')
+    group.add_argument('--captcha-rate', type=float, default=0.0, help='返回安全验证页面的比例')
+    group.add_argument('--burst-interval', type=float, default=0.0, help='429限流的周期（秒），0为不限流')
+    group.add_argument('--burst-duration', type=float, default=0.0, help='每个周期内429限流持续的秒数')
+    group.add_argument('--retry-after', type=int, default=1, help='429响应的Retry-After（秒）')
+    group.add_argument('--max-pages', type=int, default=5, help='每个关键字的结果页数')
+    group.add_argument('--path-latency', action='append', metavar='PATH=SECONDS',
+                       help='单独设置某个入口的基础延迟，例如 /news=1.5，可重复指定')
+    group.add_argument('--seed', type=int, default=0, help='随机种子')
+
+
+def config_from_args(args: argparse.Namespace) -> FakeBaiduConfig:
+    return FakeBaiduConfig(
+        latency=args.latency, latency_sigma=args.latency_sigma, slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency, error_rate=args.error_rate, captcha_rate=args.captcha_rate,
+        burst_interval=args.burst_interval, burst_duration=args.burst_duration,
+        retry_after=args.retry_after, max_pages=args.max_pages,
+        path_latency=_parse_path_latency(args.path_latency), seed=args.seed,
+    )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='本地模拟百度新闻搜索服务')
+    arg_parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    arg_parser.add_argument('--port', type=int, default=8765, help='监听端口')
+    arg_parser.add_argument('--verbose', action='store_true', help='输出每个请求的日志')
+    add_server_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    server = FakeBaiduServer(config_from_args(args), args.host, args.port, args.fixture, args.verbose)
+    print(f"模拟百度新闻搜索服务已启动: {server.url}")
+    print(f"入口: {', '.join(server.base_urls())}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+爬虫压测 - 把 BaiduNewsCrawler 的搜索入口指向本地模拟服务（fake_baidu.py），
+在不同并发数下测量端到端的抓取吞吐量和尾延迟，不访问百度
+
+用法：
+    python load_test.py                                        # 并发 1,4,8,16，各抓取 40 个关键字
+    python load_test.py --concurrency 8,32 --keywords 100 --multi-page --max-results 30
+    python load_test.py --latency 0.2 --error-rate 0.05 --burst-interval 20 --burst-duration 2
+    python load_test.py --path-latency /news=1.5 --no-hedge     # 对比对冲请求的效果
+    python load_test.py --server http://127.0.0.1:8765         # 使用已启动的模拟服务
+    python load_test.py --output load_result.json
+
+默认把模拟服务主机的限流速率固定为 --rate（仍会在429时降速），--rate 0 使用配置中的自适应限流。
+每一轮开始前清空限流器、熔断器、主机并发信号量和入口统计，各轮之间互不影响。
+不指定 --server 时模拟服务与爬虫在同一进程内运行（共用GIL），测量CPU开销时建议单独启动 fake_baidu.py。
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
+
+import requests
+
+from app.crawler import BaiduNewsCrawler, reset_host_semaphores
+from app.endpoints import reset_endpoint_stats
+from app.ratelimit import AdaptiveRateLimiter, reset_registries, set_host_limiter
+from bench_parser import percentile
+from config import (CRAWLER_PARSER, CRAWLER_HEDGE_ENABLED, CRAWLER_RATE_MIN, CRAWLER_RATE_DECREASE,
+                    CRAWLER_SLOW_RESPONSE)
+from fake_baidu import FakeBaiduServer, add_server_arguments, config_from_args
+
+
+def fetch_server_stats(server_url: str) -> Dict[str, int]:
+    """读取模拟服务各状态码的请求数"""
+    return requests.get(f'{server_url}/__stats', timeout=5).json()
+
+
+def run_level(base_urls: List[str], server_url: str, concurrency: int, keywords: List[str],
+              args: argparse.Namespace) -> Dict:
+    """
+    以指定并发数抓取一组关键字
+
+    Returns:
+        统计结果：吞吐量、每个关键字的抓取耗时百分位（秒）、服务端各状态码的请求数
+    """
+    reset_registries()
+    reset_endpoint_stats()
+    reset_host_semaphores()
+    if args.rate > 0:
+        host = urllib.parse.urlparse(server_url).netloc
+        set_host_limiter(host, AdaptiveRateLimiter(
+            args.rate, min(CRAWLER_RATE_MIN, args.rate), args.rate,
+            decrease_factor=CRAWLER_RATE_DECREASE, slow_threshold=CRAWLER_SLOW_RESPONSE
+        ))
+
+    crawler = BaiduNewsCrawler(max_workers=concurrency, per_host_concurrency=concurrency,
+                               pool_maxsize=concurrency * 2, parser=args.parser,
+                               hedge=not args.no_hedge, archive=False)
+    crawler.base_urls = base_urls
+
+    def crawl(keyword: str) -> Tuple[float, int]:
+        start = time.perf_counter()
+        news_list = crawler.search(keyword, args.max_results, multi_page=args.multi_page)
+        return time.perf_counter() - start, len(news_list)
+
+    before = fetch_server_stats(server_url)
+    # 爬虫的日志（限流、熔断、对冲）默认不输出
+    log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with log, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(crawl, keywords))
+        elapsed = time.perf_counter() - start
+        # 等待落后的对冲请求完成，计入本轮的服务端请求数
+        crawler.close(wait=True)
+    after = fetch_server_stats(server_url)
+
+    statuses = {status: after.get(status, 0) - before.get(status, 0) for status in after}
+    statuses = {status: count for status, count in statuses.items() if count}
+    latencies = [latency for latency, _ in results]
+    requests_count = sum(statuses.values())
+    return {
+        'concurrency': concurrency,
+        'keywords': len(keywords),
+        'failed': sum(1 for _, items in results if items == 0),
+        'items': sum(items for _, items in results),
+        'requests': requests_count,
+        'statuses': statuses,
+        'elapsed': round(elapsed, 2),
+        'keywords_per_sec': round(len(keywords) / elapsed, 2),
+        'requests_per_sec': round(requests_count / elapsed, 2),
+        'p50': round(percentile(latencies, 50), 3),
+        'p90': round(percentile(latencies, 90), 3),
+        'p99': round(percentile(latencies, 99), 3),
+        'max': round(max(latencies), 3),
+    }
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description='爬虫压测（使用本地模拟百度服务）')
+    arg_parser.add_argument('--concurrency', default='1,4,8,16', help='并发数列表，逗号分隔')
+    arg_parser.add_argument('--keywords', type=int, default=40, help='每轮抓取的关键字数')
+    arg_parser.add_argument('--max-results', type=int, default=10, help='每个关键字最多抓取条数')
+    arg_parser.add_argument('--multi-page', action='store_true', help='多页并发抓取')
+    arg_parser.add_argument('--parser', default=CRAWLER_PARSER, choices=['lxml', 'html.parser'], help='解析引擎')
+    arg_parser.add_argument('--rate', type=float, default=200.0,
+                            help='模拟服务主机的限流速率（请求/秒），0 使用配置中的自适应限流')
+    arg_parser.add_argument('--no-hedge', action='store_true', default=not CRAWLER_HEDGE_ENABLED,
+                            help='关闭对冲请求')
+    arg_parser.add_argument('--server', help='已启动的模拟服务地址，不指定时在本进程内启动')
+    arg_parser.add_argument('--output', help='把结果保存为JSON文件')
+    arg_parser.add_argument('--verbose', action='store_true', help='输出爬虫日志')
+    add_server_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    levels = [int(value) for value in args.concurrency.split(',') if value.strip()]
+
+    server = None
+    if args.server:
+        server_url = args.server.rstrip('/')
+        base_urls = [f'{server_url}/ns', f'{server_url}/s?tn=news', f'{server_url}/news']
+    else:
+        server = FakeBaiduServer(config_from_args(args), fixture=args.fixture).start()
+        server_url = server.url
+        base_urls = server.base_urls()
+
+    print("=" * 100)
+    print(f"爬虫压测: {server_url}，每轮 {args.keywords} 个关键字，每个最多 {args.max_results} 条"
+          f"{'（多页）' if args.multi_page else ''}")
+    print("=" * 100)
+    print(f"{'并发':>6}{'耗时(s)':>10}{'关键字/s':>10}{'请求/s':>10}{'p50(s)':>10}{'p90(s)':>10}"
+          f"{'p99(s)':>10}{'max(s)':>10}{'失败':>6}  状态码")
+
+    results = []
+    try:
+        for concurrency in levels:
+            # 每轮使用不同的关键字，服务端的页面缓存和重试计数不跨轮次
+            keywords = [f'压测{concurrency}-{index}' for index in range(args.keywords)]
+            result = run_level(base_urls, server_url, concurrency, keywords, args)
+            results.append(result)
+            statuses = ' '.join(f'{status}:{count}' for status, count in sorted(result['statuses'].items()))
+            print(f"{concurrency:>6}{result['elapsed']:>10}{result['keywords_per_sec']:>10}"
+                  f"{result['requests_per_sec']:>10}{result['p50']:>10}{result['p90']:>10}"
+                  f"{result['p99']:>10}{result['max']:>10}{result['failed']:>6}  {statuses}")
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
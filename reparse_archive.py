@@ -0,0 +1,153 @@
+"""
+从页面存档重新解析 - 解析逻辑修复后，用存档的原始页面补回历史数据，不访问网络
+
+存档页面按内容哈希去重后分发到多个进程并行解析（每个CPU核心一个进程）。
+
+用法：
+    python reparse_archive.py                                   # 重新解析全部存档并写入数据库
+    python reparse_archive.py --keyword 西昌 --since 2024-01-01
+    python reparse_archive.py --output reparsed.jsonl           # 只输出解析结果，不写数据库
+    python reparse_archive.py --workers 8 --parser html.parser
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+from app.archive import PageArchive, read_blob
+from app.crawler import BaiduNewsCrawler
+from config import CRAWLER_ARCHIVE_DIR, CRAWLER_PARSER
+
+# 工作进程内的爬虫实例（只用于解析）
+_worker_crawler: Optional[BaiduNewsCrawler] = None
+
+
+def _init_worker(parser: str):
+    global _worker_crawler
+    _worker_crawler = BaiduNewsCrawler(parser=parser)
+
+
+def _parse_blob(task: Tuple[str, str, int, str]) -> Tuple[str, int, List[Dict]]:
+    """工作进程：读取、解压并解析一个存档页面（相对发布时间以页面的抓取时间为准）"""
+    digest, path, rn, fetched_at = task
+    try:
+        now = datetime.strptime(fetched_at, '%Y-%m-%d %H:%M:%S')
+        return digest, rn, _worker_crawler.parse_results(read_blob(path), rn, now=now)
+    except Exception as e:
+        print(f"解析存档页面 {digest} 失败: {str(e)}", file=sys.stderr)
+        return digest, rn, []
+
+
+def reparse(archive: PageArchive, rows: List[Dict], workers: int, parser: str) -> Dict[Tuple[str, int], List[Dict]]:
+    """
+    并行解析存档页面（相同内容只解析一次）
+
+    Returns:
+        (内容哈希, 每页条数) -> 新闻列表
+    """
+    tasks = []
+    seen = set()
+    for row in rows:
+        key = (row['digest'], row['rn'])
+        if key in seen:
+            continue
+        seen.add(key)
+        path = archive.find_blob(row['digest'])
+        if path is None:
+            print(f"存档文件缺失: {row['digest']}", file=sys.stderr)
+            continue
+        tasks.append((row['digest'], str(path), row['rn'], row['fetched_at']))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(parser,)) as executor:
+        for digest, rn, news_list in executor.map(_parse_blob, tasks, chunksize=8):
+            results[(digest, rn)] = news_list
+    return results
+
+
+def write_jsonl(path: str, rows: List[Dict], results: Dict[Tuple[str, int], List[Dict]]):
+    """按存档索引逐页输出解析结果"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            news_list = results.get((row['digest'], row['rn']))
+            if news_list is None:
+                continue
+            f.write(json.dumps({
+                'keyword': row['keyword'],
+                'pn': row['pn'],
+                'fetched_at': row['fetched_at'],
+                'digest': row['digest'],
+                'data': news_list,
+            }, ensure_ascii=False) + '\n')
+
+
+def save_to_db(rows: List[Dict], results: Dict[Tuple[str, int], List[Dict]]) -> Tuple[int, int]:
+    """
+    按存档页面的抓取时间写入数据库：同一关键字、同一抓取时间的页面（一次多页抓取）合并为一次保存，
+    新新闻的首次抓取时间取这些页面的抓取时间，已存在的新闻只补全字段，不计入抓取次数
+
+    Returns:
+        (写入条数, 新增条数)
+    """
+    from app import create_app
+    from app.news_store import save_news
+
+    # 存档按抓取时间排序，先保存的抓取时间更早，新闻的首次抓取时间不会被后面的抓取覆盖
+    fetches: Dict[Tuple[str, str], List[Dict]] = {}
+    for row in rows:
+        news_list = results.get((row['digest'], row['rn']))
+        if not news_list:
+            continue
+        fetches.setdefault((row['keyword'], row['fetched_at']), []).extend(news_list)
+
+    saved = new = 0
+    app = create_app(start_scheduler=False)
+    with app.app_context():
+        for (keyword, fetched_at), news_list in fetches.items():
+            run = save_news(keyword, news_list, trigger='reparse', touch=False,
+                            seen_at=datetime.strptime(fetched_at, '%Y-%m-%d %H:%M:%S'))
+            saved += run.result_count
+            new += run.new_count
+    return saved, new
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='从页面存档重新解析新闻')
+    arg_parser.add_argument('--archive', default=str(CRAWLER_ARCHIVE_DIR), help='存档目录')
+    arg_parser.add_argument('--keyword', help='只处理指定关键字')
+    arg_parser.add_argument('--since', help='抓取时间下限（YYYY-MM-DD）')
+    arg_parser.add_argument('--until', help='抓取时间上限（YYYY-MM-DD，不含）')
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='解析进程数')
+    arg_parser.add_argument('--parser', default=CRAWLER_PARSER, choices=['lxml', 'html.parser'], help='解析引擎')
+    arg_parser.add_argument('--output', help='输出到JSONL文件（不写数据库）')
+    args = arg_parser.parse_args()
+
+    archive = PageArchive(args.archive)
+    rows = archive.query(args.keyword, args.since, args.until)
+    if not rows:
+        print('没有符合条件的存档页面')
+        return
+
+    start = time.perf_counter()
+    results = reparse(archive, rows, args.workers, args.parser)
+    parse_seconds = time.perf_counter() - start
+    items = sum(len(results.get((row['digest'], row['rn']), [])) for row in rows)
+
+    print(f"存档页面: {len(rows)}，去重后解析: {len(results)}，解析出新闻: {items} 条")
+    print(f"解析耗时: {parse_seconds:.2f} 秒（{args.workers} 个进程，"
+          f"{len(results) / parse_seconds if parse_seconds else 0:.1f} 页/秒）")
+
+    if args.output:
+        write_jsonl(args.output, rows, results)
+        print(f"结果已写入 {args.output}")
+    else:
+        saved, new = save_to_db(rows, results)
+        print(f"写入数据库: {saved} 条，新增: {new} 条")
+
+
+if __name__ == '__main__':
+    main()
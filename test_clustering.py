@@ -0,0 +1,71 @@
+"""测试相似新闻聚类（MinHash + LSH，不访问网络）"""
+import random
+
+import pytest
+
+from app.clustering import NearDuplicateIndex, shingles
+
+
+def random_text(seed, length=30):
+    """生成互不相似的中文文本"""
+    rng = random.Random(seed)
+    return ''.join(chr(0x4e00 + rng.randrange(5000)) for _ in range(length))
+
+
+def news(seed, suffix=''):
+    return {'title': random_text(seed) + suffix, 'summary': '', 'url': f'https://example.com/{seed}{suffix}'}
+
+
+def test_shingles():
+    assert shingles('西昌，电力') == {'西昌', '昌电', '电力'}
+    assert shingles('西') == {'西'}
+    assert shingles('') == set()
+
+
+def test_bands_must_divide_num_perm():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=64, bands=10)
+
+
+def test_near_duplicates_share_a_cluster():
+    index = NearDuplicateIndex()
+    original = index.add(news(1))
+    assert index.add(news(1, suffix='（转载）')) == original
+    assert index.add(news(2)) != original
+    # 同一URL重复加入时返回原事件簇，不重复计数
+    assert index.add(news(1)) == original
+    assert len(index) == 3
+    assert len(index.cluster(original)) == 2
+
+
+def test_signature_is_deterministic():
+    assert NearDuplicateIndex().signature(news(1)) == NearDuplicateIndex().signature(news(1))
+    assert NearDuplicateIndex().signature({'title': '', 'summary': ''}) is None
+
+
+def test_evicts_oldest_items():
+    index = NearDuplicateIndex(max_items=10)
+    first = index.add(news(0))
+    for seed in range(1, 15):
+        index.add(news(seed))
+    assert len(index) == 10
+
+    # 淘汰的新闻从桶、事件簇和URL映射中全部移除
+    assert index.cluster(first) == []
+    assert sum(len(bucket) for bucket in index._buckets[0].values()) == 10
+    assert sum(len(members) for members in index._clusters.values()) == 10
+    assert len(index._by_url) == 10
+
+    # 已淘汰的新闻再次出现时成为新的事件簇
+    assert index.add(news(0)) != first
+
+
+def test_cluster_survives_eviction_of_its_first_member():
+    index = NearDuplicateIndex(max_items=3)
+    story = index.add(news(1))
+    assert index.add(news(1, suffix='（一）')) == story
+    index.add(news(2))
+    index.add(news(3))  # 淘汰簇内第一条新闻
+    assert len(index.cluster(story)) == 1
+    # 簇内仍有新闻时，新的转载继续归入原事件簇
+    assert index.add(news(1, suffix='（二）')) == story
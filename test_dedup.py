@@ -0,0 +1,46 @@
+"""测试URL规范化和新闻去重（不访问网络）"""
+from app.dedup import canonicalize_url, normalize_title, NewsDeduplicator
+
+
+def test_canonicalize_scheme_host_and_port():
+    assert canonicalize_url('http://WWW.Example.com:80/a/') == 'https://example.com/a'
+    assert canonicalize_url('https://example.com:443/a') == 'https://example.com/a'
+    assert canonicalize_url('https://example.com:8080/a') == 'https://example.com:8080/a'
+    assert canonicalize_url('//example.com/a') == 'https://example.com/a'
+    assert canonicalize_url('https://example.com') == 'https://example.com/'
+
+
+def test_canonicalize_strips_tracking_params_and_sorts():
+    url = 'https://example.com/news?id=2&utm_source=wx&spm=a.b&b=1&rsv_dl=ns_pc&From=baidu#comments'
+    assert canonicalize_url(url) == 'https://example.com/news?b=1&id=2'
+    # 空值参数保留
+    assert canonicalize_url('https://example.com/?page=') == 'https://example.com/?page='
+
+
+def test_canonicalize_unwraps_baidu_redirect():
+    url = 'https://www.baidu.com/link?url=https%3A%2F%2Fnews.example.com%2Fa%3Fid%3D1%26utm_medium%3Dx'
+    assert canonicalize_url(url) == 'https://news.example.com/a?id=1'
+    # url参数不是完整地址时不展开
+    assert canonicalize_url('https://www.baidu.com/link?url=abc') == 'https://baidu.com/link?url=abc'
+
+
+def test_canonicalize_leaves_other_schemes_and_empty():
+    assert canonicalize_url('') == ''
+    assert canonicalize_url('javascript:void(0)') == 'javascript:void(0)'
+
+
+def test_normalize_title():
+    assert normalize_title('  西昌：ＡＢＣ 新闻！ ') == '西昌abc新闻'
+
+
+def test_deduplicator_matches_url_or_title():
+    dedup = NewsDeduplicator()
+    assert dedup.add({'title': '西昌召开会议', 'url': 'https://example.com/a?utm_source=x'})
+    # 同一URL（跟踪参数不同）
+    assert not dedup.add({'title': '另一个标题', 'url': 'http://www.example.com/a/'})
+    # 同一标题（标点和全半角不同）
+    assert not dedup.add({'title': '西昌召开会议！', 'url': 'https://other.com/b'})
+    assert dedup.add({'title': '成都召开会议', 'url': 'https://other.com/c'})
+
+    dedup.clear()
+    assert dedup.add({'title': '西昌召开会议', 'url': 'https://example.com/a'})
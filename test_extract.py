@@ -0,0 +1,62 @@
+"""测试发布时间解析和摘要清理（不访问网络）"""
+from datetime import datetime
+
+import pytest
+
+from app.extract import clean_source, clean_text, parse_publish_time
+
+NOW = datetime(2024, 3, 10, 12, 30, 45, 123456)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('30秒前', datetime(2024, 3, 10, 12, 30, 15)),
+    ('5分钟前', datetime(2024, 3, 10, 12, 25, 45)),
+    ('来源 3小时前', datetime(2024, 3, 10, 9, 30, 45)),
+    ('2天前', datetime(2024, 3, 8, 12, 30, 45)),
+    ('1周前', datetime(2024, 3, 3, 12, 30, 45)),
+    ('1个月前', datetime(2024, 2, 9, 12, 30, 45)),
+    ('刚刚', datetime(2024, 3, 10, 12, 30, 45)),
+])
+def test_relative_time(text, expected):
+    assert parse_publish_time(text, NOW) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('今天', datetime(2024, 3, 10)),
+    ('昨天15:56', datetime(2024, 3, 9, 15, 56)),
+    ('前天 08:05', datetime(2024, 3, 8, 8, 5)),
+])
+def test_relative_day(text, expected):
+    assert parse_publish_time(text, NOW) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2024-01-02', datetime(2024, 1, 2)),
+    ('2023/12/31 23:59', datetime(2023, 12, 31, 23, 59)),
+    ('2023.6.1', datetime(2023, 6, 1)),
+    ('发布于2023年6月1日 08:00', datetime(2023, 6, 1, 8, 0)),
+])
+def test_absolute_date(text, expected):
+    assert parse_publish_time(text, NOW) == expected
+
+
+def test_month_day_uses_current_or_previous_year():
+    assert parse_publish_time('3月9日 10:00', NOW) == datetime(2024, 3, 9, 10, 0)
+    # 当天稍晚的时间（时区差异）仍算今年
+    assert parse_publish_time('3月11日', NOW) == datetime(2024, 3, 11)
+    # 晚于当前时间超过一天，说明是去年
+    assert parse_publish_time('12月3日', NOW) == datetime(2023, 12, 3)
+
+
+def test_invalid_or_missing_time():
+    assert parse_publish_time('2024-02-30', NOW) is None
+    assert parse_publish_time('13月1日', NOW) is None
+    assert parse_publish_time('没有时间', NOW) is None
+    assert parse_publish_time('', NOW) is None
+    assert parse_publish_time(None, NOW) is None
+
+
+def test_clean_text_and_source():
+    assert clean_text('西昌  电力 来源：新华网\n检修 https://a.com/x 2024-01-01 08:00 完成') == '西昌 电力 检修 完成'
+    assert clean_source('新华网 2024-01-01') == '新华网'
+    assert clean_source('x' * 60) == ''
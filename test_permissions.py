@@ -0,0 +1,81 @@
+"""测试角色权限（内存数据库，不访问网络）"""
+import pytest
+
+import app as app_package
+from app import create_app
+from app.auth import _auth_cache
+from app.models import db, Role, User
+from app.permissions import CompiledPermissions, parse_permissions
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(app_package, 'SQLALCHEMY_DATABASE_URI', 'sqlite://')
+    _auth_cache.clear()
+    app = create_app(start_scheduler=False)
+    with app.app_context():
+        editor = Role(name='编辑', code='editor', permissions='["view_dashboard", "news:*"]')
+        reporter = Role(name='报表', code='reporter', permissions='["view_report"]')
+        db.session.add_all([editor, reporter])
+        db.session.flush()
+        for username, role in (('editor', editor), ('reporter', reporter)):
+            user = User(username=username, role_id=role.id, is_active=True)
+            user.set_password('secret')
+            db.session.add(user)
+        db.session.commit()
+    yield app
+    _auth_cache.clear()
+
+
+def login(app, username, password='secret'):
+    client = app.test_client()
+    result = client.post('/login', json={'username': username, 'password': password}).get_json()
+    assert result['success'], result
+    return client
+
+
+def test_compiled_permissions():
+    permissions = CompiledPermissions(parse_permissions('["view_report", "news:*"]'))
+    assert permissions.allows('view_report')
+    assert permissions.allows('news:export')
+    assert not permissions.allows('news')
+    assert not permissions.allows('view_dashboard')
+    assert not permissions.allows('admin')
+    assert CompiledPermissions(['*']).allows('admin')
+
+    with pytest.raises(ValueError):
+        parse_permissions('{"view_report": true}')
+
+
+def test_granted_permissions_are_allowed(app):
+    client = login(app, 'editor')
+    assert client.get('/dashboard').status_code == 200
+    assert client.get('/api/dashboard/stats').get_json()['success']
+
+    client = login(app, 'reporter')
+    assert client.get('/api/news').status_code == 200
+    assert client.get('/api/crawler/runs').status_code == 200
+
+
+def test_other_permissions_are_refused(app):
+    client = login(app, 'editor')
+    assert client.get('/api/news').status_code == 403
+    assert client.get('/api/users').status_code == 403
+    # 菜单中不显示没有权限的功能
+    page = client.get('/dashboard').get_data(as_text=True)
+    assert '/admin/users' not in page
+    assert '数据报表' not in page
+
+    client = login(app, 'reporter')
+    assert client.get('/api/dashboard/stats').status_code == 403
+    assert client.get('/admin/users').status_code == 403
+    assert client.get('/dashboard').status_code == 403
+
+
+def test_admin_has_all_permissions(app):
+    client = login(app, 'admin', 'admin123')
+    assert client.get('/api/users').status_code == 200
+    assert client.get('/api/news').status_code == 200
+    page = client.get('/dashboard').get_data(as_text=True)
+    assert '/admin/users' in page
+    assert '数据报表' in page
@@ -0,0 +1,54 @@
+"""测试新闻全文检索（内存数据库，不访问网络）"""
+import pytest
+from flask import Flask
+
+from app.models import db, NewsItem
+from app.search_index import build_match_query, init_search_index, index_news, search_news
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        init_search_index()
+        yield app
+
+
+def add_news(title, summary=''):
+    url = f'https://example.com/{title}/{summary}'
+    news = NewsItem(canonical_url=url, url=url, title=title, summary=summary)
+    db.session.add(news)
+    db.session.flush()
+    index_news([news.id])
+    db.session.commit()
+    return news.id
+
+
+def test_build_match_query():
+    assert build_match_query('西昌电力') == ('"西昌 昌电 电力"', [])
+    assert build_match_query('西昌 川') == ('"西昌"', ['川'])
+
+
+def test_phrase_query(app):
+    hit = add_news('西昌电力公司检修线路')
+    add_news('成都电力公司')
+    results, total = search_news('西昌电力')
+    assert total == 1
+    assert results[0]['id'] == hit
+
+
+def test_single_char_at_end_of_run(app):
+    # “川”位于中文串末尾，索引中没有以它开头的二元组
+    hit = add_news('凉山州西昌', '地处四川')
+    miss = add_news('凉山州西昌', '成都')
+    results, total = search_news('川')
+    assert total == 1
+    assert [news['id'] for news in results] == [hit]
+
+    results, total = search_news('西昌 川')
+    assert total == 1
+    assert results[0]['id'] == hit
+    assert miss not in [news['id'] for news in results]